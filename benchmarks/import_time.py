@@ -0,0 +1,67 @@
+"""
+Import time of `pydacharts.models`, measured in fresh interpreters.
+
+    uv run python -m benchmarks.import_time [--runs 15] [--budget-ms 200]
+
+The time reported is the median over `--runs` of the time taken to import
+`pydacharts.models` after `pydantic` has already been imported, so it measures
+this package rather than its dependencies. Exits with status 1 when the median
+is over the budget.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+# Regression budget, in milliseconds, for importing pydacharts.models
+BUDGET_MS = 200.0
+
+PROBE = """
+import time
+import pydantic
+start = time.perf_counter()
+import {module}
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def measure(module: str = "pydacharts.models", runs: int = 15) -> list[float]:
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module)],
+            capture_output=True,
+            check=True,
+            text=True,
+            env={"PYTHONPATH": str(SRC)},
+        ).stdout
+        timings.append(float(output))
+    return timings
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="pydacharts.models")
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    args = parser.parse_args(argv)
+
+    timings = measure(args.module, args.runs)
+    median = statistics.median(timings)
+    print(
+        f"import {args.module}: median {median:.1f} ms, "
+        f"min {min(timings):.1f} ms, max {max(timings):.1f} ms "
+        f"(budget {args.budget_ms:.0f} ms)"
+    )
+    if median > args.budget_ms:
+        print("Import time is over budget", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+"""
+Construction, validation and serialization benchmarks at scale.
+
+    uv run python -m benchmarks.scale                 # run and compare with the stored baselines
+    uv run python -m benchmarks.scale --quick         # the small cases only
+    uv run python -m benchmarks.scale --save          # store the results as the new baselines
+    uv run python -m benchmarks.scale -k pyramid      # only cases with "pyramid" in their name
+
+Each case builds a `Config` with `datasets` datasets of `points` values each
+and the given options preset, then measures:
+
+ - construct: building the Config / Data / Dataset tree (validated)
+ - dump: `model_dump_json(exclude_none=True)`
+ - validate: `Config.model_validate_json` of that payload
+ - peak: peak memory allocated while constructing and dumping (tracemalloc)
+ - bytes: size of the payload
+
+With numpy installed the dataset size cases also run with numpy array data.
+Times are the best of several repeats. A case regresses when a time or the
+peak memory is more than `--tolerance` times its baseline (and, for times,
+more than 0.2ms slower), or the payload size
+changed at all; the exit status is 1 if any case regressed.
+"""
+
+import argparse
+import importlib.util
+import json
+import random
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from pydacharts.arrays import require_numpy
+from pydacharts.chart_utils import (
+    BarChartOptions,
+    DoughnutChartOptions,
+    PyramidChartOptions,
+)
+from pydacharts.models import ChartType, Config, Data, Dataset, Options
+
+BASELINES = Path(__file__).parent / "baselines.json"
+
+PRESETS: dict[str, tuple[ChartType, Callable[[], Options] | None]] = {
+    "plain": (ChartType.line, None),
+    "bar": (ChartType.bar, BarChartOptions),
+    "pyramid": (ChartType.bar, PyramidChartOptions),
+    "doughnut": (ChartType.doughnut, DoughnutChartOptions),
+}
+
+# Time differences smaller than this are noise, whatever the ratio
+MIN_DELTA_SECONDS = 0.0002
+
+# Stop repeating a measurement once this much time was spent on it
+MIN_TOTAL_SECONDS = 0.3
+MAX_REPEATS = 7
+
+
+@dataclass(frozen=True)
+class Case:
+    preset: str
+    datasets: int
+    points: int
+    # Pass the data as numpy arrays rather than lists
+    numpy: bool = False
+
+    @property
+    def name(self) -> str:
+        suffix = "-numpy" if self.numpy else ""
+        return f"{self.preset}-{self.datasets}x{self.points}{suffix}"
+
+
+@dataclass
+class Result:
+    construct: float
+    dump: float
+    validate: float
+    peak: int
+    bytes: int
+
+
+def cases(quick: bool = False) -> list[Case]:
+    grid = []
+    # Dataset size
+    for points in (
+        (100, 1_000, 10_000) if quick else (100, 1_000, 10_000, 100_000, 1_000_000)
+    ):
+        grid.append(Case("plain", 1, points))
+        if importlib.util.find_spec("numpy") is not None:
+            grid.append(Case("plain", 1, points, numpy=True))
+    # Dataset count
+    for datasets in (1, 10) if quick else (1, 10, 50, 200):
+        grid.append(Case("plain", datasets, 1_000))
+    # Option depth
+    for preset in ("bar", "pyramid", "doughnut"):
+        grid.append(Case(preset, 5, 100))
+        if not quick:
+            grid.append(Case(preset, 5, 10_000))
+    return list(dict.fromkeys(grid))
+
+
+def _best(func: Callable[[], Any]) -> float:
+    timings: list[float] = []
+    while len(timings) < MAX_REPEATS and sum(timings) < MIN_TOTAL_SECONDS:
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(case: Case) -> Result:
+    rng = random.Random(case.name)
+    labels = [f"Label {i}" for i in range(case.points)]
+    values = [
+        [round(rng.uniform(-1000, 1000), 3) for _ in range(case.points)]
+        for _ in range(case.datasets)
+    ]
+    if case.numpy:
+        np = require_numpy()
+        values = [np.array(data) for data in values]
+    chart_type, preset = PRESETS[case.preset]
+
+    def construct() -> Config:
+        return Config(
+            type=chart_type,
+            data=Data(
+                labels=labels,
+                datasets=[
+                    Dataset(label=f"Dataset {i}", data=data)
+                    for i, data in enumerate(values)
+                ],
+            ),
+            options=preset() if preset else None,
+        )
+
+    config = construct()
+    payload = config.model_dump_json(exclude_none=True)
+
+    tracemalloc.start()
+    construct().model_dump_json(exclude_none=True)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return Result(
+        construct=_best(construct),
+        dump=_best(lambda: config.model_dump_json(exclude_none=True)),
+        validate=_best(lambda: Config.model_validate_json(payload)),
+        peak=peak,
+        bytes=len(payload.encode()),
+    )
+
+
+def regressions(
+    result: Result, baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    found = []
+    for metric in ("construct", "dump", "validate", "peak"):
+        if metric not in baseline:
+            continue
+        value = getattr(result, metric)
+        if metric != "peak" and value - baseline[metric] < MIN_DELTA_SECONDS:
+            continue
+        if value > baseline[metric] * tolerance:
+            found.append(
+                f"{metric} {getattr(result, metric) / baseline[metric]:.2f}x baseline"
+            )
+    if "bytes" in baseline and result.bytes != baseline["bytes"]:
+        found.append(f"bytes {baseline['bytes']} -> {result.bytes}")
+    return found
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--quick", action="store_true", help="small cases only")
+    parser.add_argument("-k", dest="keyword", help="only run cases matching this")
+    parser.add_argument("--baselines", type=Path, default=BASELINES)
+    parser.add_argument(
+        "--save", action="store_true", help="store results as baselines"
+    )
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    args = parser.parse_args(argv)
+
+    baselines: dict[str, dict[str, Any]] = {}
+    if args.baselines.exists():
+        baselines = json.loads(args.baselines.read_text())
+
+    print(
+        f"{'case':<24}{'construct':>12}{'dump':>12}{'validate':>12}{'peak':>12}{'bytes':>14}"
+    )
+    failed = False
+    results: dict[str, dict[str, Any]] = {}
+    for case in cases(args.quick):
+        if args.keyword and args.keyword not in case.name:
+            continue
+        result = run(case)
+        results[case.name] = asdict(result)
+        line = (
+            f"{case.name:<24}"
+            f"{result.construct * 1000:>10.2f}ms"
+            f"{result.dump * 1000:>10.2f}ms"
+            f"{result.validate * 1000:>10.2f}ms"
+            f"{result.peak / 2**20:>10.2f}MB"
+            f"{result.bytes:>14,}"
+        )
+        if not args.save and case.name in baselines:
+            found = regressions(result, baselines[case.name], args.tolerance)
+            if found:
+                failed = True
+                line += "  REGRESSION: " + ", ".join(found)
+        print(line, flush=True)
+
+    if args.save:
+        args.baselines.write_text(
+            json.dumps(baselines | results, indent=2, sort_keys=True) + "\n"
+        )
+        print(f"Saved baselines to {args.baselines}")
+        return 0
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
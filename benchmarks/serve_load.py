@@ -0,0 +1,123 @@
+"""
+Latency of small charts in the serve app while large ones are being built.
+
+    uv run python -m benchmarks.serve_load
+    uv run python -m benchmarks.serve_load --seconds 10 --large 4
+
+Requests go to the app in process (an ASGI transport, so no server and no
+network): clients ask for `/chart` (a small bar chart) every 5ms, once
+alone, then while other clients keep asking for `/chart/large` (500,000
+points). The large charts are built and serialized in worker processes by the
+app's `Offloader`, then on the event loop as a comparison (threshold set
+above their size). p99 of the small chart stays near its idle value in the
+first case; in the second every large chart stalls the loop for its whole
+build and serialization.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+SERVE = Path(__file__).parent.parent / "serve"
+
+# Seconds between small chart requests
+INTERVAL = 0.005
+
+
+async def _request(client: httpx.AsyncClient, due: float) -> float:
+    response = await client.get("/chart")
+    response.raise_for_status()
+    return time.perf_counter() - due
+
+
+async def _small(client: httpx.AsyncClient, seconds: float) -> list[float]:
+    # A request is due every INTERVAL, sent without waiting for the previous
+    # ones (as from many browsers). Latency counts from when it was due, so
+    # time spent waiting for a stalled loop counts too
+    requests = []
+    begin = time.perf_counter()
+    for i in range(int(seconds / INTERVAL)):
+        due = begin + i * INTERVAL
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        requests.append(asyncio.create_task(_request(client, due)))
+    return await asyncio.gather(*requests)
+
+
+async def _large(client: httpx.AsyncClient, stop: asyncio.Event) -> int:
+    count = 0
+    while not stop.is_set():
+        # Not decompressed, which would stall the loop in the client's place
+        async with client.stream("GET", "/chart/large") as response:
+            response.raise_for_status()
+            async for _ in response.aiter_raw():
+                pass
+        count += 1
+        # Nothing in the transport waits on a socket: give the other clients a turn
+        await asyncio.sleep(0)
+    return count
+
+
+async def scenario(app: object, seconds: float, large: int) -> tuple[list[float], int]:
+    transport = httpx.ASGITransport(app=app)  # type: ignore[arg-type]
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        # The first request of a builder learns its size (in a worker), the
+        # second builds the models' serializers on the loop
+        for _ in range(2):
+            await client.get("/chart")
+        stop = asyncio.Event()
+        heavy = [asyncio.create_task(_large(client, stop)) for _ in range(large)]
+        latencies = await _small(client, seconds)
+        stop.set()
+        built = sum(await asyncio.gather(*heavy))
+    return latencies, built
+
+
+def _percentile(values: list[float], q: int) -> float:
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--seconds", type=float, default=5.0, help="per scenario")
+    parser.add_argument(
+        "--large", type=int, default=2, help="clients asking for large charts"
+    )
+    args = parser.parse_args(argv)
+
+    # The app serves its static files and templates from its own directory
+    os.chdir(SERVE)
+    from serve import app
+
+    offloader = app.offloader
+    scenarios = [
+        ("small only", offloader.threshold, 0),
+        ("+ large, offloaded", offloader.threshold, args.large),
+        ("+ large, on the loop", sys.maxsize, args.large),
+    ]
+    print(f"{'scenario':<24}{'requests':>10}{'large':>8}{'p50':>10}{'p99':>10}")
+    try:
+        for name, threshold, large in scenarios:
+            offloader.threshold = threshold
+            latencies, built = asyncio.run(scenario(app.app, args.seconds, large))
+            print(
+                f"{name:<24}{len(latencies):>10}{built:>8}"
+                f"{_percentile(latencies, 50) * 1e3:>8.1f}ms"
+                f"{_percentile(latencies, 99) * 1e3:>8.1f}ms"
+            )
+    finally:
+        offloader.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+Validation of stored Chart.js configs.
+
+    uv run python -m benchmarks.validation              # time each config in benchmarks/corpus
+    uv run python -m benchmarks.validation --repeat 200 # and a dashboard of 200 copies of the corpus
+
+Each config in the corpus (plain Chart.js JSON, as found in the wild: line,
+bar, stacked and horizontal bars, doughnut, pie, scatter, radar, mixed) is
+loaded with `Config.model_validate_json`, timing the best of several runs. The
+models picked for the nodes pydantic has to choose between (the data and
+datasets for the chart type, cartesian or plain ticks, the padding forms,
+datalabels lists) are listed next to each time, so that a wrong pick shows up
+along with the cost.
+"""
+
+import argparse
+import sys
+import time
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel
+
+from pydacharts.models import Config
+
+CORPUS = Path(__file__).parent / "corpus"
+
+# Stop repeating a measurement once this much time was spent on it
+MIN_TOTAL_SECONDS = 0.2
+MAX_REPEATS = 50
+
+
+def corpus(directory: Path = CORPUS) -> dict[str, bytes]:
+    return {path.stem: path.read_bytes() for path in sorted(directory.glob("*.json"))}
+
+
+def _best(func: Callable[[], Any]) -> float:
+    timings: list[float] = []
+    while len(timings) < MAX_REPEATS and sum(timings) < MIN_TOTAL_SECONDS:
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+# Models chosen between by validation: by chart type, or structurally
+PICKED = frozenset(
+    {"Data", "LineData", "PieData", "Dataset", "LineDataSet", "PieDataSet"}
+    | {"Ticks", "CartesianTicks", "PaddingObject", "PaddingXY", "DataLabelsPlugin"}
+)
+
+
+def picks(model: BaseModel) -> list[str]:
+    """
+    Where the models in `PICKED` ended up in a validated config
+    """
+    found: list[str] = []
+
+    def visit(value: Any, path: str) -> None:
+        if isinstance(value, list):
+            for i, item in enumerate(value):
+                visit(item, f"{path}.{i}")
+        elif isinstance(value, BaseModel):
+            if type(value).__name__ in PICKED:
+                found.append(f"{path}: {type(value).__name__}")
+            for field in type(value).model_fields:
+                visit(getattr(value, field), f"{path}.{field}".lstrip("."))
+
+    visit(model, "")
+    return found
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--corpus", type=Path, default=CORPUS)
+    parser.add_argument(
+        "--repeat", type=int, default=100, help="configs in the dashboard case"
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="list the models picked"
+    )
+    args = parser.parse_args(argv)
+
+    payloads = corpus(args.corpus)
+    # Build the validators before timing anything
+    for payload in payloads.values():
+        Config.model_validate_json(payload)
+
+    print(f"{'config':<24}{'bytes':>10}{'validate':>12}")
+    for name, payload in payloads.items():
+        seconds = _best(partial(Config.model_validate_json, payload))
+        print(f"{name:<24}{len(payload):>10,}{seconds * 1e6:>10.1f}us")
+        if args.verbose:
+            for pick in picks(Config.model_validate_json(payload)):
+                print(f"    {pick}")
+
+    dashboard = list(payloads.values()) * args.repeat
+    seconds = _best(lambda: [Config.model_validate_json(p) for p in dashboard])
+    print(
+        f"{'dashboard x' + str(args.repeat):<24}"
+        f"{sum(map(len, dashboard)):>10,}{seconds * 1e3:>10.2f}ms"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
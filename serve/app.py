@@ -1,25 +1,151 @@
-from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from pydantic_core import to_json
 
+from pydacharts.binary import dump_binary
+from pydacharts.cache import Payload
 from pydacharts.models import Config
+from pydacharts.streaming import iter_json
+
+from .live import demo_feed, tick
+from .offload import PRODUCTION, Offloader
+from .providers import Providers
+from .serve_data import config, large_config
+
+# The chart pushed to the clients of /live
+feed = demo_feed()
+
+# Builds and serializes the large charts in worker processes, at most one
+# /chart/large at a time so that the other endpoints keep a worker
+offloader = Offloader(workers=2, limits={"large": 1})
+
+# Concurrent requests for the same chart share one build
+providers: Providers[Payload] = Providers(timeout=30)
+
+
+@providers.provider("index")
+async def index_payload() -> Payload:
+    indent = None if PRODUCTION else 2
+    return await offloader.payload("index", config, exclude_none=True, indent=indent)
+
 
-from .serve_data import config
+@providers.provider("chart")
+async def chart_payload() -> Payload:
+    return await offloader.payload("chart", config, exclude_none=True)
 
-app = FastAPI()
+
+@providers.provider("large", timeout=60)
+async def large_payload() -> Payload:
+    return await offloader.payload("large", large_config, exclude_none=True)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    ticker = asyncio.create_task(tick(feed))
+    yield
+    ticker.cancel()
+    offloader.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
 
 
+@app.exception_handler(TimeoutError)
+async def timed_out(request: Request, exc: TimeoutError) -> Response:
+    return Response(status_code=503, headers={"Retry-After": "5"})
+
+
+# Clients may reuse a cached copy but have to revalidate it with the ETag first
+CACHE_CONTROL = "no-cache"
+
+
+def not_modified(request: Request, payload: Payload, etag: str) -> Response | None:
+    if payload.not_modified(request.headers.get("if-none-match")):
+        return Response(
+            status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        )
+    return None
+
+
+def json_response(request: Request, payload: Payload) -> Response:
+    body, encoding = payload.select(request.headers.get("accept-encoding"))
+    etag = payload.etag_for(encoding)
+    if (response := not_modified(request, payload, etag)) is not None:
+        return response
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @app.get("/", response_class=HTMLResponse)
 async def read_item(request: Request):
-    config_json = config().model_dump_json(exclude_none=True, indent=2)
+    payload = await providers.get("index")
+    if (response := not_modified(request, payload, payload.etag)) is not None:
+        return response
     return templates.TemplateResponse(
-        request=request, name="chart_datalabels.html", context={"config": config_json}
+        request=request,
+        name="chart_datalabels.html",
+        context={"config": payload.body.decode()},
+        headers={"ETag": payload.etag, "Cache-Control": CACHE_CONTROL},
     )
 
 
 @app.get("/chart", response_model=Config, response_model_exclude_none=True)
 async def read_chart(request: Request):
-    return config()
+    return json_response(request, await providers.get("chart"))
+
+
+@app.get("/chart/large")
+async def read_large_chart(request: Request):
+    """
+    A chart of 500,000 points, built away from the event loop
+    """
+    return json_response(request, await providers.get("large"))
+
+
+@app.get("/chart.json")
+async def stream_chart(request: Request):
+    """
+    Same payload as `/chart`, streamed while it is being serialized
+    """
+    return StreamingResponse(iter_json(config()), media_type="application/json")
+
+
+@app.get("/chart.bin")
+async def binary_chart():
+    """
+    The chart with its data as typed arrays, for `static/typed-arrays.js`
+    """
+    return Response(
+        content=dump_binary(config()), media_type="application/octet-stream"
+    )
+
+
+@app.get("/live", response_class=HTMLResponse)
+async def live_page(request: Request):
+    return templates.TemplateResponse(request=request, name="live.html")
+
+
+@app.websocket("/live/ws")
+async def live_updates(websocket: WebSocket):
+    """
+    The chart once, as {"type": "config", "config": ...}, then its updates as
+    {"type": "patch", "ops": [...]}, merged while the client is slow to read
+    """
+    await websocket.accept()
+    body, cursor = feed.snapshot()
+    await websocket.send_text(f'{{"type":"config","config":{body}}}')
+    try:
+        async for ops in feed.updates(cursor):
+            await websocket.send_text(to_json({"type": "patch", "ops": ops}).decode())
+    except WebSocketDisconnect:
+        pass
@@ -0,0 +1,77 @@
+import asyncio
+import random
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
+
+from pydacharts.live import Cursor, LiveData
+from pydacharts.models import ChartType, Config, LineDataSet, Options
+from pydacharts.patch import Operation
+
+"""
+A live line chart shared by the websocket connections of the serve app.
+
+New connections get the whole chart once, then patches. Each connection only
+keeps a cursor into the `LiveData` window, and asks for the delta from it when
+it is ready to send again: a slow client gets the points it missed merged into
+one message, and nothing queues up for it however far behind it falls.
+"""
+
+# Seconds between points of the demo feed
+TICK_SECONDS = 1.0
+
+
+class LiveFeed:
+    def __init__(self, live: LiveData, options: Options | None = None):
+        self.live = live
+        self.options = options
+        # One per waiting connection, set when points are published
+        self._waiters: set[asyncio.Event] = set()
+
+    def snapshot(self) -> tuple[str, Cursor]:
+        """
+        The chart's JSON, and the cursor to send the updates after it from
+        """
+        config = Config(
+            type=ChartType.line, data=self.live.data(), options=self.options
+        )
+        return config.model_dump_json(exclude_none=True), self.live.cursor()
+
+    def publish(self, label: str, values: Sequence[float]) -> None:
+        self.live.append(label, values)
+        for waiter in self._waiters:
+            waiter.set()
+
+    async def updates(self, cursor: Cursor) -> AsyncIterator[list[Operation]]:
+        """
+        Patches from `cursor` on: everything published while the previous
+        patch was being sent comes out as a single patch
+        """
+        waiter = asyncio.Event()
+        self._waiters.add(waiter)
+        try:
+            while True:
+                waiter.clear()
+                if self.live.cursor() == cursor:
+                    await waiter.wait()
+                    continue
+                ops = self.live.delta(since=cursor)
+                cursor = self.live.cursor()
+                yield ops
+        finally:
+            self._waiters.discard(waiter)
+
+
+def demo_feed() -> LiveFeed:
+    live = LiveData(120, [LineDataSet(label="CPU"), LineDataSet(label="Memory")])
+    return LiveFeed(live, Options(animation=False))
+
+
+async def tick(feed: LiveFeed, seconds: float = TICK_SECONDS) -> None:
+    """
+    Publish a random walk to the feed, forever
+    """
+    values = [50.0] * len(feed.live.datasets)
+    while True:
+        values = [min(100.0, max(0.0, v + random.uniform(-5, 5))) for v in values]
+        feed.publish(datetime.now().strftime("%H:%M:%S"), values)
+        await asyncio.sleep(seconds)
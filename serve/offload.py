@@ -0,0 +1,118 @@
+import asyncio
+import os
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any
+
+from pydantic import BaseModel
+
+from pydacharts.cache import Payload, PayloadCache
+from pydacharts.models import Data
+
+"""
+Chart building and serialization off the event loop.
+
+Building and serializing a large chart holds the GIL for hundreds of
+milliseconds (pydantic serializes without releasing it), so running it on the
+event loop, or in a thread, stalls every other request of the worker. Charts
+are instead built by a builder (a picklable callable returning the chart),
+and `Offloader.payload` runs builder and serialization together:
+
+ - in a worker process, for builders whose last chart had more than
+   `threshold` data points, and the first time a builder is seen;
+ - on the event loop for the others, where the cost of a round trip to a
+   worker would outweigh the work.
+
+Only the serialized bytes come back from the workers. Each endpoint has a
+limit on the charts it builds at once (by default, the number of workers),
+so one endpoint can't keep the pool busy for all the others.
+"""
+
+# Charts with more data points than this are built and serialized in a worker
+OFFLOAD_POINTS = 20_000
+
+# Production mode (PYDACHARTS_PRODUCTION=1) leaves out pretty printing
+PRODUCTION = os.environ.get("PYDACHARTS_PRODUCTION", "") not in ("", "0")
+
+Builder = Callable[[], BaseModel]
+
+# Serialized configs, keyed by a hash of their content: one per process
+payloads = PayloadCache(maxsize=256)
+
+
+def points(chart: BaseModel) -> int:
+    """
+    The number of data points in a chart's datasets
+    """
+    data = getattr(chart, "data", None)
+    if not isinstance(data, Data):
+        return 0
+    return sum(len(d.data) for d in data.datasets if d.data is not None)
+
+
+def render(builder: Builder, dump_kwargs: dict[str, Any]) -> tuple[Payload, int]:
+    """
+    Build a chart and serialize it, with its number of data points
+    """
+    chart = builder()
+    return payloads.get(chart, **dump_kwargs), points(chart)
+
+
+class Offloader:
+    def __init__(
+        self,
+        workers: int = 2,
+        threshold: int = OFFLOAD_POINTS,
+        limits: dict[str, int] | None = None,
+        processes: bool = True,
+    ):
+        self.workers = workers
+        self.threshold = threshold
+        self.limits = limits or {}
+        # Threads only help builders which release the GIL, but don't need pickling
+        self.processes = processes
+        self.offloaded = 0
+        self.inline = 0
+        self._pool: Executor | None = None
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        # The number of points of each builder's last chart
+        self._sizes: dict[Builder, int] = {}
+
+    def pool(self) -> Executor:
+        if self._pool is None:
+            if self.processes:
+                self._pool = ProcessPoolExecutor(self.workers)
+            else:
+                self._pool = ThreadPoolExecutor(self.workers)
+        return self._pool
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _semaphore(self, endpoint: str) -> asyncio.Semaphore:
+        if endpoint not in self._semaphores:
+            limit = self.limits.get(endpoint, self.workers)
+            self._semaphores[endpoint] = asyncio.Semaphore(limit)
+        return self._semaphores[endpoint]
+
+    async def payload(
+        self, endpoint: str, builder: Builder, **dump_kwargs: Any
+    ) -> Payload:
+        """
+        The serialized chart of `builder`, built where its size calls for
+        """
+        async with self._semaphore(endpoint):
+            last = self._sizes.get(builder)
+            if last is not None and last <= self.threshold:
+                self.inline += 1
+                payload, size = render(builder, dump_kwargs)
+            else:
+                self.offloaded += 1
+                loop = asyncio.get_running_loop()
+                payload, size = await loop.run_in_executor(
+                    self.pool(), render, builder, dump_kwargs
+                )
+            self._sizes[builder] = size
+            return payload
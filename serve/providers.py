@@ -0,0 +1,125 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, Generic, TypeVar
+
+"""
+Async chart providers, with concurrent identical requests coalesced.
+
+A provider is an async function building something for the serve app (a
+chart, or its serialized payload) from keyword parameters:
+
+    providers = Providers(timeout=30)
+
+    @providers.provider("sales")
+    async def sales(region: str) -> Payload:
+        ...
+
+    payload = await providers.get("sales", region="emea")
+
+While a `get` for a provider and parameters is running, other `get`s with the
+same provider and parameters wait for its result rather than starting their
+own: when 300 clients open a dashboard at once, the query behind it runs
+once. Results aren't kept once they are returned (caching them is up to the
+provider).
+
+A waiter cancelled (a client gone, a timeout of its own with
+`asyncio.timeout`) leaves the computation running for the others; it is
+cancelled with the last one. A computation taking longer than the provider's
+timeout raises `TimeoutError` in all of its waiters.
+"""
+
+T = TypeVar("T")
+
+Factory = Callable[..., Awaitable[T]]
+Key = tuple[str, tuple[tuple[str, Hashable], ...]]
+
+
+class _Flight(Generic[T]):
+    """
+    A running computation, with the number of `get`s waiting for it
+    """
+
+    def __init__(self, task: "asyncio.Task[T]"):
+        self.task = task
+        self.waiters = 0
+
+
+class Providers(Generic[T]):
+    def __init__(self, timeout: float | None = None):
+        # Default timeout of the providers, in seconds
+        self.timeout = timeout
+        self.computed = 0
+        self.coalesced = 0
+        self._factories: dict[str, tuple[Factory[T], float | None]] = {}
+        self._flights: dict[Key, _Flight[T]] = {}
+
+    def register(
+        self, name: str, factory: Factory[T], *, timeout: float | None = None
+    ) -> None:
+        """
+        Add a provider; `timeout` defaults to the registry's
+        """
+        if name in self._factories:
+            raise ValueError(f"Provider {name!r} is already registered")
+        self._factories[name] = (factory, self.timeout if timeout is None else timeout)
+
+    def provider(
+        self, name: str, *, timeout: float | None = None
+    ) -> Callable[[Factory[T]], Factory[T]]:
+        """
+        Decorator form of `register`
+        """
+
+        def decorator(factory: Factory[T]) -> Factory[T]:
+            self.register(name, factory, timeout=timeout)
+            return factory
+
+        return decorator
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._factories
+
+    def running(self) -> int:
+        """
+        The number of computations in progress
+        """
+        return len(self._flights)
+
+    async def get(self, name: str, /, **params: Hashable) -> T:
+        """
+        The result of provider `name` for `params`, shared with the concurrent
+        calls with the same parameters
+        """
+        if name not in self._factories:
+            raise KeyError(f"No provider {name!r}")
+        key: Key = (name, tuple(sorted(params.items())))
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.create_task(self._compute(key, params)))
+            self._flights[key] = flight
+            self.computed += 1
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            # Shielded: cancelling a waiter mustn't cancel the others' result
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                # Nobody left waiting. Forgotten now so that a new request
+                # starts afresh rather than joining a cancelled computation
+                flight.task.cancel()
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+
+    async def _compute(self, key: Key, params: dict[str, Any]) -> T:
+        factory, timeout = self._factories[key[0]]
+        flight = self._flights.get(key)
+        try:
+            async with asyncio.timeout(timeout):
+                return await factory(**params)
+        finally:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
@@ -1,8 +1,15 @@
+import array
+import random
+from itertools import accumulate
+
+from pydacharts.cache import ChartCache
 from pydacharts.models import (
     ChartType,
     Config,
     Data,
     Dataset,
+    LineData,
+    LineDataSet,
     Options,
     ScaleOptions,
     Scales,
@@ -16,6 +23,11 @@ class RightAlignedScale(ScaleOptions):
     ticks: OffsetTicks = OffsetTicks(mirror=True, display=True, z=100, padding=-10)
 
 
+# Built charts, rebuilt in the background once a minute old
+charts = ChartCache(ttl=60, maxbytes=64 * 2**20)
+
+
+@charts
 def config():
     _data = [
         ("World Bank", 3703888321),
@@ -55,3 +67,15 @@ def config():
     data = Data(labels=[n[0] for n in _data], datasets=[ds])
 
     return Config(type=ChartType.bar, options=options, data=data)
+
+
+def large_config(points: int = 500_000) -> Config:
+    """
+    A random walk, large enough to take a while to build and serialize
+    """
+    steps = (random.uniform(-1, 1) for _ in range(points))
+    data = LineData(
+        labels=[str(i) for i in range(points)],
+        datasets=[LineDataSet(label="Walk", data=array.array("d", accumulate(steps)))],
+    )
+    return Config(type=ChartType.line, data=data)
@@ -0,0 +1,62 @@
+// Live charts from a pydacharts websocket (see serve/live.py).
+// The first message is the chart config, {"type": "config", "config": ...}; the next ones are
+// {"type": "patch", "ops": [...]}: JSON Patch operations, plus the compact
+// {"op": "append", "path": ..., "value": [...], "shift": n} of pydacharts.patch, applied in place.
+(function () {
+    function parse(path) {
+        if (path === "") return [];
+        return path.slice(1).split("/").map((part) => part.replace(/~1/g, "/").replace(/~0/g, "~"));
+    }
+
+    function resolve(document, parts) {
+        return parts.reduce((node, part) => node[part], document);
+    }
+
+    function applyOperation(document, op) {
+        const parts = parse(op.path);
+        const parent = resolve(document, parts.slice(0, -1));
+        const key = parts[parts.length - 1];
+        switch (op.op) {
+            case "append": {
+                const target = resolve(document, parts);
+                if (op.shift) target.splice(0, op.shift);
+                for (const value of op.value) target.push(value);
+                break;
+            }
+            case "add":
+                if (Array.isArray(parent)) parent.splice(key === "-" ? parent.length : Number(key), 0, op.value);
+                else parent[key] = op.value;
+                break;
+            case "remove":
+                if (Array.isArray(parent)) parent.splice(Number(key), 1);
+                else delete parent[key];
+                break;
+            case "replace":
+                parent[key] = op.value;
+                break;
+            default:
+                throw new Error("Unsupported patch operation " + op.op);
+        }
+    }
+
+    function connect(canvas, url) {
+        let chart = null;
+        const socket = new WebSocket(url);
+        socket.onmessage = (event) => {
+            const message = JSON.parse(event.data);
+            if (message.type === "config") {
+                if (chart) chart.destroy();
+                chart = new Chart(canvas, message.config);
+                return;
+            }
+            const document = {data: chart.data, options: chart.options};
+            for (const op of message.ops) applyOperation(document, op);
+            chart.data = document.data;
+            // Points arrive too often to animate each update
+            chart.update("none");
+        };
+        return socket;
+    }
+
+    window.pydachartsLive = {connect, applyOperation};
+})();
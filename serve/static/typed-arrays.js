@@ -0,0 +1,35 @@
+// Charts from pydacharts.binary: JSON with dataset data as little-endian typed arrays.
+//   pydachartsTyped.fromBase64(text)     the JSON of dump_base64
+//   pydachartsTyped.fromBinary(buffer)   the ArrayBuffer of dump_binary (views, no copy)
+//   await pydachartsTyped.fetchChart(url)
+(function () {
+    const TYPES = {Float32Array, Float64Array, Int32Array};
+    const ALIGNMENT = 8;
+
+    function parse(text, load) {
+        return JSON.parse(text, (key, value) =>
+            value !== null && typeof value === "object" && "$typed" in value ? load(value) : value
+        );
+    }
+
+    function fromBase64(text) {
+        return parse(text, (marker) => {
+            const bytes = Uint8Array.from(atob(marker.base64), (c) => c.charCodeAt(0));
+            return new TYPES[marker.$typed](bytes.buffer);
+        });
+    }
+
+    function fromBinary(buffer) {
+        const length = new DataView(buffer).getUint32(0, true);
+        const header = new TextDecoder().decode(new Uint8Array(buffer, 4, length));
+        const start = Math.ceil((4 + length) / ALIGNMENT) * ALIGNMENT;
+        return parse(header, (marker) => new TYPES[marker.$typed](buffer, start + marker.offset, marker.length));
+    }
+
+    async function fetchChart(url) {
+        const response = await fetch(url);
+        return fromBinary(await response.arrayBuffer());
+    }
+
+    window.pydachartsTyped = {fromBase64, fromBinary, fetchChart};
+})();
@@ -0,0 +1,123 @@
+import array
+import sys
+from typing import TYPE_CHECKING, Annotated, Any, TypeAlias
+
+from pydantic import GetCoreSchemaHandler
+from pydantic_core import core_schema
+
+from pydacharts.precision import Precision, from_context
+
+"""
+Buffer backed dataset values.
+
+`Dataset.data` accepts NumPy arrays, `array.array` and `memoryview` objects
+in addition to plain lists. Buffers are kept by reference, without per-element
+validation, and converted with a single `tolist()` call when written to JSON.
+NaN values are written as `null`.
+
+NumPy is optional: install `pydacharts[numpy]` for the helpers which need it.
+"""
+
+
+def numpy_module() -> Any:
+    """
+    Return the `numpy` module if it has already been imported, without importing it.
+    If numpy was never imported there can't be any ndarray to look at.
+    """
+    return sys.modules.get("numpy")
+
+
+def require_numpy() -> Any:
+    """
+    Import and return numpy, with a helpful message when it is not installed
+    """
+    try:
+        import numpy
+    except ImportError as e:  # pragma: no cover
+        raise ImportError(
+            "This feature requires numpy. Install it with `pip install pydacharts[numpy]`"
+        ) from e
+    return numpy
+
+
+def is_buffer(value: Any) -> bool:
+    """
+    True for the array types which are stored as-is in `Dataset.data`
+    """
+    if isinstance(value, array.array | memoryview):
+        return True
+    np = numpy_module()
+    return np is not None and isinstance(value, np.ndarray)
+
+
+def to_list(value: Any) -> Any:
+    """
+    Convert a buffer to (nested) python lists in one C-level pass.
+    Anything else is returned unchanged.
+    """
+    if is_buffer(value):
+        return value.tolist()
+    return value
+
+
+# The serialization context key of an encoder writing arrays as typed array
+# buffers (see `pydacharts.binary`)
+TYPED_ARRAYS_KEY = "typed_arrays"
+
+
+def typed_array(value: Any, context: Any, precision: Precision | None = None) -> Any:
+    """
+    What the typed array encoder in the serialization context writes instead
+    of `value` (rounded with `precision` first), or None if there is no
+    encoder or it doesn't handle the value
+    """
+    encoder = context.get(TYPED_ARRAYS_KEY) if isinstance(context, dict) else None
+    if encoder is None:
+        return None
+    return encoder.encode(value if precision is None else precision.round_array(value))
+
+
+def _validate(value: Any, handler: core_schema.ValidatorFunctionWrapHandler) -> Any:
+    if is_buffer(value):
+        return value
+    return handler(value)
+
+
+def _serialize(value: Any, info: core_schema.SerializationInfo) -> Any:
+    # Python mode keeps the buffer; in JSON mode pydantic writes NaN and +/-inf as `null`
+    if info.mode_is_json():
+        precision = from_context(info.context)
+        typed = typed_array(value, info.context, precision)
+        if typed is not None:
+            return typed
+        if precision is not None:
+            return precision.to_json(value)
+        return to_list(value)
+    return value
+
+
+class _BufferOrList:
+    """
+    Pydantic annotation: accepts buffers unchanged, validates anything else as `list[Any]`
+    """
+
+    def __get_pydantic_core_schema__(
+        self, source_type: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        return core_schema.no_info_wrap_validator_function(
+            _validate,
+            handler.generate_schema(list[Any]),
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                _serialize, info_arg=True
+            ),
+        )
+
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+    DataArray: TypeAlias = Annotated[
+        list[Any] | array.array | memoryview | NDArray[Any], _BufferOrList()
+    ]
+else:
+    DataArray = Annotated[list[Any], _BufferOrList()]
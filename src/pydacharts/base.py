@@ -0,0 +1,41 @@
+from typing import Any, TypeVar
+
+from pydantic import BaseModel, ConfigDict
+
+T = TypeVar("T")
+
+
+class ChartModel(BaseModel):
+    """
+    Base class of the Chart.js models.
+
+    Validation and serialization schemas are built the first time a model is
+    used rather than when it is defined, which keeps importing
+    `pydacharts.models` cheap for short lived processes.
+
+    Fields are dumped by their serialization alias by default, for Chart.js
+    keys which aren't valid Python names (like the sankey "from").
+    """
+
+    model_config = ConfigDict(defer_build=True)
+
+    def model_dump(self, **kwargs: Any) -> dict[str, Any]:
+        kwargs.setdefault("by_alias", True)
+        return super().model_dump(**kwargs)
+
+    def model_dump_json(self, **kwargs: Any) -> str:
+        kwargs.setdefault("by_alias", True)
+        return super().model_dump_json(**kwargs)
+
+
+def built(value: T) -> T:
+    """
+    Build the schema of `value`'s model class if it isn't yet, and return it.
+
+    A model validated as part of its parent never builds its own schema, as
+    the parent's schema holds a copy. Fields serialized with `SerializeAsAny`
+    are dumped with their value's class schema, which must then exist.
+    """
+    if isinstance(value, BaseModel) and not type(value).__pydantic_complete__:
+        type(value).model_rebuild()
+    return value
@@ -0,0 +1,310 @@
+import argparse
+import importlib
+import io
+import os
+import sys
+import tarfile
+import zipfile
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path, PurePosixPath
+from typing import Any
+
+from pydantic import BaseModel
+
+"""
+Serialize many charts at once, across a process pool.
+
+    from pydacharts.batch import write_batch
+
+    def jobs():
+        for district in districts:
+            for indicator in indicators:
+                yield f"{district}/{indicator}", partial(build_chart, district, indicator)
+
+    for result in write_batch(jobs(), "export.zip"):
+        if result.error:
+            print(result.name, result.error)
+
+Each job is a `(name, chart)` pair, where the chart is a model instance or a
+picklable callable returning one (a module level function or a
+`functools.partial`); passing factories means the charts are built in the
+workers too. Charts are serialized with their own `model_dump_json`, so models
+overriding it come out as usual.
+
+The output is a directory (one `<name>.json` file per chart) or, by extension,
+a `.zip`, `.tar`, `.tar.gz` / `.tgz` archive. Jobs are read from the iterable
+lazily and only a bounded number of chunks is in flight at once, so memory use
+doesn't grow with the number of charts. Results come back in job order, or as
+they finish with `ordered=False`. A failing job is reported in its result and
+doesn't stop the batch.
+
+The same is available from the command line, given a callable returning the jobs:
+
+    pydacharts-batch myproject.exports:jobs export.zip --workers 8
+"""
+
+Job = tuple[str, BaseModel | Callable[[], BaseModel]]
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    name: str
+    # Where the chart was written: a file path, or the member name in an archive
+    path: str | None = None
+    size: int = 0
+    error: str | None = None
+
+
+def _error(exc: BaseException) -> str:
+    return f"{type(exc).__name__}: {exc}"
+
+
+def _serialize(job: Job, dump_kwargs: dict[str, Any]) -> bytes:
+    chart = job[1]
+    if not isinstance(chart, BaseModel):
+        chart = chart()
+    if not isinstance(chart, BaseModel):
+        raise TypeError(f"Expected a chart model, got {type(chart).__name__}")
+    return chart.model_dump_json(**dump_kwargs).encode()
+
+
+def _serialize_chunk(
+    jobs: list[Job], dump_kwargs: dict[str, Any]
+) -> list[tuple[str, bytes | None, str | None]]:
+    """
+    Runs in a worker: returns (name, body, error) for each job
+    """
+    results: list[tuple[str, bytes | None, str | None]] = []
+    for job in jobs:
+        try:
+            results.append((job[0], _serialize(job, dump_kwargs), None))
+        except Exception as e:
+            results.append((job[0], None, _error(e)))
+    return results
+
+
+def _member(name: str) -> str:
+    path = PurePosixPath(f"{name}.json")
+    if path.is_absolute() or ".." in path.parts or not name:
+        raise ValueError(f"Invalid chart name {name!r}")
+    return str(path)
+
+
+class _DirectoryWriter:
+    def __init__(self, root: Path):
+        self.root = root
+        root.mkdir(parents=True, exist_ok=True)
+
+    def write(self, member: str, body: bytes) -> str:
+        path = self.root / member
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(body)
+        return str(path)
+
+    def close(self) -> None:
+        pass
+
+
+class _ZipWriter:
+    def __init__(self, path: Path, compress: bool):
+        self.archive = zipfile.ZipFile(
+            path, "w", zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        )
+
+    def write(self, member: str, body: bytes) -> str:
+        # Fixed timestamps keep the archive reproducible
+        info = zipfile.ZipInfo(member, date_time=(1980, 1, 1, 0, 0, 0))
+        info.compress_type = self.archive.compression
+        self.archive.writestr(info, body)
+        return member
+
+    def close(self) -> None:
+        self.archive.close()
+
+
+class _TarWriter:
+    def __init__(self, path: Path, compress: bool):
+        # Kept open across writes, closed by `close`
+        self.archive = tarfile.open(path, "w:gz" if compress else "w")  # noqa: SIM115
+
+    def write(self, member: str, body: bytes) -> str:
+        info = tarfile.TarInfo(member)
+        info.size = len(body)
+        self.archive.addfile(info, io.BytesIO(body))
+        return member
+
+    def close(self) -> None:
+        self.archive.close()
+
+
+def _writer(output: Path, compress: bool) -> _DirectoryWriter | _ZipWriter | _TarWriter:
+    name = output.name.lower()
+    if name.endswith(".zip"):
+        return _ZipWriter(output, compress)
+    if name.endswith((".tar.gz", ".tgz")):
+        return _TarWriter(output, True)
+    if name.endswith(".tar"):
+        return _TarWriter(output, False)
+    return _DirectoryWriter(output)
+
+
+def _chunks(jobs: Iterable[Job], size: int) -> Iterator[list[Job]]:
+    iterator = iter(jobs)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def serialize_batch(
+    jobs: Iterable[Job],
+    *,
+    workers: int | None = None,
+    ordered: bool = True,
+    chunksize: int = 16,
+    max_pending: int | None = None,
+    **dump_kwargs: Any,
+) -> Iterator[tuple[str, bytes | None, str | None]]:
+    """
+    Serialize `(name, chart)` jobs across a process pool, yielding
+    `(name, body, error)` for each; `body` is None when `error` is set.
+
+    Jobs are submitted `chunksize` at a time with at most `max_pending` chunks
+    (default: four per worker) in flight. `workers=0` serializes in this process.
+    """
+    dump_kwargs.setdefault("exclude_none", True)
+    if workers == 0:
+        for chunk in _chunks(jobs, chunksize):
+            yield from _serialize_chunk(chunk, dump_kwargs)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 4
+    with ProcessPoolExecutor(workers) as pool:
+        pending: deque[tuple[Future, list[Job]]] = deque()
+
+        def done(
+            future: Future, chunk: list[Job]
+        ) -> list[tuple[str, bytes | None, str | None]]:
+            try:
+                return future.result()
+            except Exception as e:
+                # The whole chunk failed, for instance a job which can't be pickled
+                return [(job[0], None, _error(e)) for job in chunk]
+
+        def drain(limit: int) -> Iterator[tuple[str, bytes | None, str | None]]:
+            while len(pending) > limit:
+                if ordered:
+                    yield from done(*pending.popleft())
+                    continue
+                wait([future for future, _ in pending], return_when=FIRST_COMPLETED)
+                for item in [item for item in pending if item[0].done()]:
+                    pending.remove(item)
+                    yield from done(*item)
+
+        for chunk in _chunks(jobs, chunksize):
+            pending.append((pool.submit(_serialize_chunk, chunk, dump_kwargs), chunk))
+            yield from drain(max_pending - 1)
+        yield from drain(0)
+
+
+def write_batch(
+    jobs: Iterable[Job],
+    output: str | os.PathLike[str],
+    *,
+    workers: int | None = None,
+    ordered: bool = True,
+    chunksize: int = 16,
+    max_pending: int | None = None,
+    compress: bool = False,
+    **dump_kwargs: Any,
+) -> Iterator[BatchResult]:
+    """
+    Serialize `(name, chart)` jobs across a process pool and write them to
+    `output`, a directory or a `.zip` / `.tar` / `.tar.gz` archive, yielding
+    a `BatchResult` per job as it is written.
+
+    `compress` deflates `.zip` members. Other keyword arguments are passed
+    to `model_dump_json` (`exclude_none` defaults to True).
+    """
+    writer = _writer(Path(output), compress)
+    try:
+        for name, body, error in serialize_batch(
+            jobs,
+            workers=workers,
+            ordered=ordered,
+            chunksize=chunksize,
+            max_pending=max_pending,
+            **dump_kwargs,
+        ):
+            if body is None:
+                yield BatchResult(name, error=error)
+                continue
+            try:
+                path = writer.write(_member(name), body)
+            except (OSError, ValueError) as e:
+                yield BatchResult(name, error=_error(e))
+            else:
+                yield BatchResult(name, path=path, size=len(body))
+    finally:
+        writer.close()
+
+
+def _load(spec: str) -> Callable[[], Iterable[Job]]:
+    module, _, attribute = spec.partition(":")
+    if not attribute:
+        raise argparse.ArgumentTypeError(f"Expected module:callable, got {spec!r}")
+    return getattr(importlib.import_module(module), attribute)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="pydacharts-batch",
+        description="Serialize charts across a process pool into a directory or archive",
+    )
+    parser.add_argument(
+        "jobs",
+        type=_load,
+        help="module:callable returning an iterable of (name, chart or chart factory)",
+    )
+    parser.add_argument(
+        "output", type=Path, help="a directory, or a .zip / .tar / .tar.gz file"
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunksize", type=int, default=16)
+    parser.add_argument(
+        "--unordered", action="store_true", help="write charts as they finish"
+    )
+    parser.add_argument(
+        "--compress", action="store_true", help="deflate .zip archive members"
+    )
+    parser.add_argument("--indent", type=int, default=None)
+    # Find the jobs module in the working directory, as `python -m` would
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+    args = parser.parse_args(argv)
+
+    written = failed = size = 0
+    for result in write_batch(
+        args.jobs(),
+        args.output,
+        workers=args.workers,
+        ordered=not args.unordered,
+        chunksize=args.chunksize,
+        compress=args.compress,
+        indent=args.indent,
+    ):
+        if result.error:
+            failed += 1
+            print(f"{result.name}: {result.error}", file=sys.stderr)
+        else:
+            written += 1
+            size += result.size
+    print(f"Wrote {written} charts ({size:,} bytes) to {args.output}, {failed} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,456 @@
+import array
+import asyncio
+import functools
+import gzip
+import hashlib
+import inspect
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+import pydantic_core
+from pydantic import BaseModel
+
+from pydacharts.arrays import is_buffer, numpy_module
+
+"""
+Caching of serialized chart payloads.
+
+`fingerprint` hashes a model without converting its data buffers to JSON, and
+`PayloadCache` keeps the serialized bytes (plus gzip and, when the `brotli`
+package is installed, brotli variants) for the most recently used fingerprints.
+A `Payload` carries a strong ETag per encoding so that web endpoints can answer
+repeat requests for an unchanged chart with `304 Not Modified`.
+
+`ChartCache` keeps the charts themselves, built by factory functions, for a
+time and within a memory budget.
+"""
+
+try:
+    import brotli  # type: ignore[import-not-found, import-untyped, unused-ignore]
+except ImportError:  # pragma: no cover
+    brotli = None
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def _hash_buffer(digest: Any, value: Any) -> None:
+    np = numpy_module()
+    if np is not None and isinstance(value, np.ndarray):
+        digest.update(f"{value.dtype.str}{value.shape}".encode())
+        digest.update(memoryview(np.ascontiguousarray(value)).cast("B"))
+    elif isinstance(value, memoryview):
+        digest.update(f"{value.format}{value.shape}".encode())
+        digest.update(value.tobytes())
+    else:
+        digest.update(f"{value.typecode}{len(value)}".encode())
+        digest.update(memoryview(value).cast("B"))
+
+
+def _hash_values(digest: Any, values: Any) -> None:
+    """
+    Hash dataset data or labels: buffers from their memory, lists of only
+    floats (or only ints) through an `array.array`, anything else as JSON
+    """
+    if is_buffer(values):
+        _hash_buffer(digest, values)
+        return
+    if isinstance(values, list):
+        types = set(map(type, values))
+        typecode = "d" if types == {float} else "q" if types == {int} else None
+        if typecode is not None:
+            try:
+                _hash_buffer(digest, array.array(typecode, values))
+                return
+            except OverflowError:
+                pass
+    digest.update(pydantic_core.to_json(values, fallback=_buffer_fallback(digest)))
+
+
+def _buffer_fallback(digest: Any) -> Callable[[Any], Any]:
+    """
+    A `to_json` fallback hashing the buffers it meets into `digest`
+    """
+
+    def fallback(value: Any) -> Any:
+        if is_buffer(value):
+            _hash_buffer(digest, value)
+            return None
+        return repr(value)
+
+    return fallback
+
+
+def fingerprint(model: BaseModel, **dump_kwargs: Any) -> str:
+    """
+    A content hash of `model` and the serialization options it will be dumped with.
+
+    The labels and dataset data, the bulk of a large chart, are hashed on their
+    own without going through a python-mode dump: buffers from their raw
+    memory, lists of numbers from an `array.array` of them, along with the
+    datasets' `precision`. The rest of the model tree is dumped in python mode
+    and hashed as JSON.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(type(model).__qualname__.encode())
+    digest.update(repr(sorted(dump_kwargs.items())).encode())
+
+    exclude: dict[str, Any] = {}
+    data = getattr(model, "data", None)
+    datasets = getattr(data, "datasets", None)
+    if isinstance(datasets, list | tuple):
+        exclude = {"data": {"datasets": {"__all__": {"data"}}}}
+        if isinstance(getattr(data, "labels", None), list):
+            exclude["data"]["labels"] = True
+            _hash_values(digest, data.labels)  # type: ignore[union-attr]
+        for dataset in datasets:
+            digest.update(b"\0")
+            _hash_values(digest, getattr(dataset, "data", None))
+            # Excluded from dumps, but changes the serialized data
+            digest.update(repr(getattr(dataset, "precision", None)).encode())
+
+    dumped = model.model_dump(
+        exclude=exclude or None, exclude_none=dump_kwargs.get("exclude_none", False)
+    )
+    digest.update(pydantic_core.to_json(dumped, fallback=_buffer_fallback(digest)))
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class Payload:
+    """
+    Serialized bytes of a model, with precompressed variants keyed by content-coding
+    """
+
+    key: str
+    body: bytes
+    encoded: dict[str, bytes] = field(default_factory=dict)
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.key}"'
+
+    def etag_for(self, encoding: str | None) -> str:
+        """
+        Strong ETags have to differ between the encoded representations
+        """
+        return self.etag if encoding is None else f'"{self.key}-{encoding}"'
+
+    def select(self, accept_encoding: str | None) -> tuple[bytes, str | None]:
+        """
+        Pick the smallest variant the client accepts: returns (body, content-encoding)
+        """
+        accepted = _accepted_encodings(accept_encoding)
+        for encoding in ("br", "gzip"):
+            if encoding in accepted and encoding in self.encoded:
+                return self.encoded[encoding], encoding
+        return self.body, None
+
+    def not_modified(self, if_none_match: str | None) -> bool:
+        """
+        True if an `If-None-Match` header matches any representation of this payload
+        """
+        if not if_none_match:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if "*" in tags:
+            return True
+        variants = {self.etag} | {self.etag_for(e) for e in self.encoded}
+        return not tags.isdisjoint(variants)
+
+
+def _accepted_encodings(accept_encoding: str | None) -> set[str]:
+    accepted = set()
+    for item in (accept_encoding or "").split(","):
+        coding, _, params = item.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        if coding:
+            accepted.add(coding.lower())
+    return accepted
+
+
+def compress(body: bytes, encodings: tuple[str, ...]) -> dict[str, bytes]:
+    encoded = {}
+    if "gzip" in encodings:
+        encoded["gzip"] = gzip.compress(body, compresslevel=6, mtime=0)
+    if "br" in encodings and brotli is not None:
+        encoded["br"] = brotli.compress(body, quality=5)
+    return encoded
+
+
+class PayloadCache:
+    """
+    Bounded LRU of serialized payloads, keyed by `fingerprint`.
+
+        cache = PayloadCache(maxsize=256)
+        payload = cache.get(config, exclude_none=True)
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        encodings: tuple[str, ...] = ("gzip", "br"),
+        min_compress_size: int = 1024,
+    ):
+        self.maxsize = maxsize
+        self.encodings = encodings
+        self.min_compress_size = min_compress_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, Payload] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, model: BaseModel, **dump_kwargs: Any) -> Payload:
+        """
+        Return the cached payload for `model`, serializing it with
+        `model.model_dump_json(**dump_kwargs)` on a miss
+        """
+        key = fingerprint(model, **dump_kwargs)
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return payload
+            self.misses += 1
+
+        body = model.model_dump_json(**dump_kwargs).encode()
+        encoded = (
+            compress(body, self.encodings)
+            if len(body) >= self.min_compress_size
+            else {}
+        )
+        payload = Payload(key=key, body=body, encoded=encoded)
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return payload
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_SCALARS = (int, float, str)
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Approximate number of bytes held by a model tree: buffers count their
+    data, lists of numbers or strings are estimated from their first item
+    rather than walked
+    """
+    size = 0
+    seen: set[int] = set()
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        if is_buffer(item):
+            nbytes = getattr(item, "nbytes", None)
+            size += len(item) * item.itemsize if nbytes is None else nbytes
+        elif isinstance(item, BaseModel):
+            size += sys.getsizeof(item) + sys.getsizeof(item.__dict__)
+            stack.extend(item.__dict__.values())
+        elif isinstance(item, list | tuple):
+            size += sys.getsizeof(item)
+            if item and isinstance(item[0], _SCALARS):
+                size += len(item) * sys.getsizeof(item[0])
+            else:
+                stack.extend(item)
+        elif isinstance(item, dict):
+            size += sys.getsizeof(item)
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        else:
+            size += sys.getsizeof(item)
+    return size
+
+
+@dataclass
+class _Entry:
+    value: Any
+    size: int
+    built: float
+
+
+class ChartCache:
+    """
+    Charts built by factory functions, per function and arguments, for `ttl`
+    seconds and up to `maxbytes` in all (as estimated by `sizeof`), the least
+    recently used going first.
+
+        charts = ChartCache(ttl=60, maxbytes=256 * 2**20)
+
+        @charts
+        def sales(region: str) -> Config:
+            ...
+
+    Past its `ttl`, a chart is stale: for `stale` more seconds (by default
+    `ttl`) it is still returned, while it is rebuilt in the background (in a
+    thread for functions, in a task for async functions). After that it is
+    rebuilt before being returned. A failed rebuild leaves the stale chart in
+    place. Arguments have to be hashable. Cached charts are shared between
+    callers, which mustn't change them.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 60.0,
+        maxbytes: int = 64 * 2**20,
+        stale: float | None = None,
+        sizeof: Callable[[Any], int] = estimate_size,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+        self.stale = ttl if stale is None else stale
+        self.sizeof = sizeof
+        self.clock = clock
+        # Fresh hits, stale hits, misses and evictions to stay within maxbytes
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Background rebuilds, and those which raised
+        self.refreshes = 0
+        self.errors = 0
+        # Estimated bytes held by the cached charts
+        self.nbytes = 0
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._refreshing: set[Hashable] = set()
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __call__(self, factory: F) -> F:
+        if inspect.iscoroutinefunction(factory):
+
+            @functools.wraps(factory)
+            async def cached_async(*args: Any, **kwargs: Any) -> Any:
+                key = (factory, args, tuple(sorted(kwargs.items())))
+                entry = self._lookup(key)
+                if entry is None:
+                    value = await factory(*args, **kwargs)
+                    self._store(key, value)
+                    return value
+                if self._stale(key, entry):
+                    task = asyncio.create_task(
+                        self._refresh_async(key, factory, args, kwargs)
+                    )
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+                return entry.value
+
+            return cached_async  # type: ignore[return-value]
+
+        @functools.wraps(factory)
+        def cached(*args: Any, **kwargs: Any) -> Any:
+            key = (factory, args, tuple(sorted(kwargs.items())))
+            entry = self._lookup(key)
+            if entry is None:
+                value = factory(*args, **kwargs)
+                self._store(key, value)
+                return value
+            if self._stale(key, entry):
+                threading.Thread(
+                    target=self._refresh, args=(key, factory, args, kwargs), daemon=True
+                ).start()
+            return entry.value
+
+        return cached  # type: ignore[return-value]
+
+    def _lookup(self, key: Hashable) -> _Entry | None:
+        """
+        The entry for `key` if it is fresh or stale, counting the hit or miss
+        """
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = now - entry.built
+                if age <= self.ttl + self.stale:
+                    self._entries.move_to_end(key)
+                    if age <= self.ttl:
+                        self.hits += 1
+                    else:
+                        self.stale_hits += 1
+                    return entry
+                del self._entries[key]
+                self.nbytes -= entry.size
+            self.misses += 1
+            return None
+
+    def _stale(self, key: Hashable, entry: _Entry) -> bool:
+        """
+        True if `entry` is stale and not being rebuilt yet: the caller rebuilds it
+        """
+        if self.clock() - entry.built <= self.ttl:
+            return False
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        size = self.sizeof(value)
+        entry = _Entry(value, size, self.clock())
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.nbytes -= previous.size
+            if size > self.maxbytes:
+                # Would evict everything else, and itself
+                return
+            self._entries[key] = entry
+            self.nbytes += size
+            while self.nbytes > self.maxbytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= evicted.size
+                self.evictions += 1
+
+    def _refresh(
+        self, key: Hashable, factory: Callable[..., Any], args: Any, kwargs: Any
+    ) -> None:
+        try:
+            self._refreshed(key, factory(*args, **kwargs))
+        except Exception:
+            self._refreshed(key, None, failed=True)
+
+    async def _refresh_async(
+        self, key: Hashable, factory: Callable[..., Any], args: Any, kwargs: Any
+    ) -> None:
+        try:
+            self._refreshed(key, await factory(*args, **kwargs))
+        except Exception:
+            self._refreshed(key, None, failed=True)
+
+    def _refreshed(self, key: Hashable, value: Any, failed: bool = False) -> None:
+        if not failed:
+            self._store(key, value)
+        with self._lock:
+            self._refreshing.discard(key)
+            if failed:
+                self.errors += 1
+            else:
+                self.refreshes += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
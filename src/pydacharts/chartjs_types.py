@@ -1,12 +1,51 @@
 from enum import Enum
+from typing import Annotated, Any, TypeVar
+
+from pydantic import (
+    Discriminator,
+    PlainSerializer,
+    SerializationInfo,
+    SerializerFunctionWrapHandler,
+    Tag,
+    WrapSerializer,
+)
+
+from pydacharts.base import ChartModel
+from pydacharts.precision import from_context
+
+
+def _serialize_number(value: Any, info: SerializationInfo) -> Any:
+    precision = from_context(info.context) if info.mode_is_json() else None
+    return value if precision is None else precision.round_number(value)
+
+
+T = TypeVar("T")
+
+
+def _serialize_indexable(value: Any, handler: SerializerFunctionWrapHandler) -> Any:
+    # Chart.js reads indexable options as value[index % len(value)], so a list
+    # repeating one value is the same as the value: write it once. Comparing
+    # the ends first rejects most other lists without scanning them.
+    if (
+        isinstance(value, list)
+        and value
+        and value[0] == value[-1]
+        and value.count(value[0]) == len(value)
+    ):
+        value = value[0]
+    return handler(value)
 
-from pydantic import BaseModel
 
 RgbStr = str  # Like `rgb(255, 99, 132)`
 Function = str | None  # Placeholder for what we'll define in JS
 Color = str
 Script = str  # This is intended to represent a "well known function" provided at a given namespace by a JS library
-number = int | float
+# Rounded when serialized with a `Precision` in the context
+number = Annotated[int | float, PlainSerializer(_serialize_number)]
+# One value, or one per data point; uniform lists are written as a single value in JSON
+Indexable = Annotated[
+    list[T] | T, WrapSerializer(_serialize_indexable, when_used="json")
+]
 # TODO: Add specific well known scripts from what we've developed in DIRD?
 
 """
@@ -18,7 +57,7 @@ color: 'rgba(51, 170, 51, .5)'  // RGBa color (semi-transparent)
 """
 
 
-class Font(BaseModel):
+class Font(ChartModel):
     family: str | None = None
     size: int | None = None
     style: str | None = None
@@ -39,19 +78,41 @@ class PointStyle(str, Enum):
     triangle = "triangle"
 
 
-class PaddingObject(BaseModel):
+class PaddingObject(ChartModel):
     left: int | None = None
     right: int | None = None
     top: int | None = None
     bottom: int | None = None
 
 
-class PaddingXY(BaseModel):
+class PaddingXY(ChartModel):
     x: int | None = None
     y: int | None = None
 
 
-Padding = int | PaddingObject | PaddingXY
+_XY_KEYS = frozenset(PaddingXY.model_fields)
+
+
+def _padding_tag(value: Any) -> str:
+    """
+    Pick the padding form from the value's shape rather than by trying each
+    """
+    # Instances of subclasses too
+    if isinstance(value, PaddingXY):
+        return "PaddingXY"
+    if isinstance(value, PaddingObject):
+        return "PaddingObject"
+    if isinstance(value, dict):
+        return "PaddingXY" if value and value.keys() <= _XY_KEYS else "PaddingObject"
+    return "int"
+
+
+Padding = Annotated[
+    Annotated[int, Tag("int")]
+    | Annotated[PaddingObject, Tag("PaddingObject")]
+    | Annotated[PaddingXY, Tag("PaddingXY")],
+    Discriminator(_padding_tag),
+]
 
 
 if __name__ == "__main__":
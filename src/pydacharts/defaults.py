@@ -0,0 +1,328 @@
+import typing
+from collections.abc import Callable
+from enum import Enum
+from typing import Any
+
+from pydantic import BaseModel
+
+from pydacharts.elements import ArcElements, BarsElements, LinesElements, PointsElements
+from pydacharts.models import (
+    Animation,
+    ChartType,
+    Config,
+    Dataset,
+    Decimation,
+    Grid,
+    Interaction,
+    Legend,
+    LegendLabels,
+    Options,
+    ScaleOptions,
+    Title,
+    Tooltip,
+)
+from pydacharts.plugins.datalabels import DataLabelsPlugin, Label
+from pydacharts.plugins.sankey import SankeyDataSet
+
+"""
+Leave values Chart.js would use anyway out of the serialized chart.
+
+Several models default to the values Chart.js itself uses (`responsive`,
+`maintainAspectRatio`, `LegendLabels.boxWidth`...), and `exclude_none` keeps
+them, so every chart carries the same boilerplate. `dump_json` omits any
+option equal to the Chart.js (or plugin) runtime default:
+
+    dump_json(config)  # like config.model_dump_json(exclude_none=True)
+
+`exclude_defaults(config)` returns the matching pydantic `exclude` argument.
+The defaults are the tables below (Chart.js 4, chartjs-plugin-datalabels 2,
+chartjs-chart-sankey); nested options which end up empty are left out too.
+Data arrays are never looked at. Model defaults which differ from Chart.js,
+like `Title.display` or `LineDataSet.tension`, are still written.
+"""
+
+# Either a value, or a function of the model returning the default (None for no default)
+Default = Any | Callable[[Any], Any]
+
+# Interaction.axis defaults by interaction mode (the default mode is "nearest")
+_AXIS_DEFAULTS = {
+    None: "xy",
+    "nearest": "xy",
+    "point": "xy",
+    "dataset": "xy",
+    "index": "x",
+}
+
+# Chart.js defaults by model class, applying to subclasses too
+CHARTJS_DEFAULTS: dict[type[BaseModel], dict[str, Default]] = {
+    Options: {
+        "responsive": True,
+        "maintainAspectRatio": True,
+        "aspectRatio": 2,
+        "resizeDelay": 0,
+        "indexAxis": "x",
+        "parsing": True,
+        "normalized": False,
+        # Not a chart level option, Chart.js ignores it
+        "stacked": False,
+    },
+    Interaction: {
+        "intersect": True,
+        "mode": "nearest",
+        "axis": lambda interaction: _AXIS_DEFAULTS.get(interaction.mode),
+        "includeInvisible": False,
+    },
+    Animation: {"duration": 1000, "easing": "easeOutQuart"},
+    Legend: {
+        "display": True,
+        "position": "top",
+        "align": "center",
+        "fullSize": True,
+        "reverse": False,
+    },
+    LegendLabels: {
+        "boxWidth": 40,
+        "color": "#666",
+        "padding": 10,
+        "textAlign": "center",
+        "usePointStyle": False,
+    },
+    # Both plugins.title and scale titles
+    Title: {"display": False, "align": "center"},
+    Tooltip: {
+        "enabled": True,
+        "position": "average",
+        "backgroundColor": "rgba(0,0,0,0.8)",
+        "titleColor": "#fff",
+        "titleAlign": "left",
+        "titleSpacing": 2,
+        "titleMarginBottom": 6,
+        "bodyColor": "#fff",
+        "bodyAlign": "left",
+        "bodySpacing": 2,
+        "footerColor": "#fff",
+        "footerAlign": "left",
+        "footerSpacing": 2,
+        "footerMarginTop": 6,
+        "padding": 6,
+        "caretPadding": 2,
+        "caretSize": 5,
+        "cornerRadius": 6,
+        "multiKeyBackground": "#fff",
+        "displayColors": True,
+        "boxPadding": 0,
+        "usePointStyle": False,
+        "borderColor": "rgba(0,0,0,0)",
+        "borderWidth": 0,
+    },
+    Decimation: {"enabled": False, "algorithm": "min-max"},
+    ScaleOptions: {"display": True, "stacked": False},
+    Grid: {
+        "display": True,
+        "drawOnChartArea": True,
+        "drawTicks": True,
+        "lineWidth": 1,
+        "tickLength": 8,
+        "offset": False,
+    },
+    PointsElements: {
+        "radius": 3,
+        "pointStyle": "circle",
+        "rotation": 0,
+        "borderWidth": 1,
+        "hitRadius": 1,
+        "hoverRadius": 4,
+        "hoverBorderWidth": 1,
+    },
+    LinesElements: {
+        "tension": 0,
+        "borderWidth": 3,
+        "borderCapStyle": "butt",
+        "borderDashOffset": 0,
+        "borderJoinStyle": "miter",
+        "capBezierPoints": True,
+        "cubicInterpolationMode": "default",
+        "fill": False,
+        "stepped": False,
+    },
+    BarsElements: {
+        "borderWidth": 0,
+        "borderSkipped": "start",
+        "borderRadius": 0,
+        "inflateAmount": "auto",
+    },
+    ArcElements: {"borderAlign": "center", "borderWidth": 2},
+    Dataset: {"fill": False, "hoverOffset": 0, "order": 0},
+    DataLabelsPlugin: {
+        "align": "center",
+        "anchor": "center",
+        "borderRadius": 0,
+        "borderWidth": 0,
+        "clamp": False,
+        "clip": False,
+        "display": True,
+        "offset": 4,
+        "opacity": 1,
+        "rotation": 0,
+        "textAlign": "start",
+        "textStrokeWidth": 0,
+        "textShadowBlur": 0,
+    },
+    Label: {
+        "align": "center",
+        "anchor": "center",
+        "borderRadius": 0,
+        "clamp": False,
+        "offset": 4,
+        "opacity": 1,
+    },
+    SankeyDataSet: {"colorMode": "gradient"},
+}
+
+# Defaults which depend on the chart (or dataset) type, over CHARTJS_DEFAULTS:
+# the defaults and overrides of each Chart.js controller
+_SQUARE: dict[type[BaseModel], dict[str, Default]] = {Options: {"aspectRatio": 1}}
+_POINT: dict[type[BaseModel], dict[str, Default]] = {Interaction: {"mode": "point"}}
+TYPE_DEFAULTS: dict[str, dict[type[BaseModel], dict[str, Default]]] = {
+    # Bar charts offset the grid of the index scale only: which scale a grid
+    # belongs to isn't known here, so its offset is always written
+    ChartType.bar.value: {Grid: {"offset": None}},
+    ChartType.line.value: {Dataset: {"showLine": True}},
+    ChartType.scatter.value: {Dataset: {"showLine": False}, **_POINT},
+    ChartType.bubble.value: _POINT,
+    ChartType.doughnut.value: {Options: {"aspectRatio": 1, "cutout": "50%"}},
+    ChartType.pie.value: _SQUARE,
+    ChartType.polararea.value: _SQUARE,
+    # Radar lines are filled from the start of the scale
+    ChartType.radar.value: {
+        Options: {"aspectRatio": 1, "indexAxis": "r"},
+        Dataset: {"showLine": True, "fill": "start"},
+        LinesElements: {"fill": "start"},
+    },
+}
+
+_tables: dict[tuple[type[BaseModel], str | None], dict[str, Default]] = {}
+_reaches: dict[type[BaseModel], bool] = {}
+
+
+def _table(cls: type[BaseModel], chart_type: str | None) -> dict[str, Default]:
+    """
+    The defaults for a class and chart type, merged along the class' bases once
+    """
+    key = (cls, chart_type)
+    if key not in _tables:
+        overrides = TYPE_DEFAULTS.get(chart_type or "", {})
+        table: dict[str, Default] = {}
+        for base in reversed(cls.__mro__):
+            table.update(CHARTJS_DEFAULTS.get(base, {}))
+            table.update(overrides.get(base, {}))
+        _tables[key] = {k: v for k, v in table.items() if k in cls.model_fields}
+    return _tables[key]
+
+
+def _models(annotation: Any) -> set[type[BaseModel]]:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return {annotation}
+    found: set[type[BaseModel]] = set()
+    for arg in typing.get_args(annotation):
+        found |= _models(arg)
+    return found
+
+
+def _has_defaults(cls: type[BaseModel]) -> bool:
+    """
+    Whether a model, or any model in its fields, has defaults to prune
+    """
+    if cls not in _reaches:
+        _reaches[cls] = False  # Recursive models
+        _reaches[cls] = any(issubclass(cls, base) for base in CHARTJS_DEFAULTS) or any(
+            _has_defaults(model)
+            for field in cls.model_fields.values()
+            for model in _models(field.annotation)
+        )
+    return _reaches[cls]
+
+
+def _type(value: Any) -> str | None:
+    return value.value if isinstance(value, Enum) else value
+
+
+def _equal(value: Any, default: Any) -> bool:
+    if not isinstance(value, str | int | float) or default is None:
+        return False
+    # True == 1, but they aren't the same option value
+    if isinstance(value, bool) != isinstance(default, bool):
+        return False
+    return bool(value == default)
+
+
+def _exclude(
+    model: BaseModel, chart_type: str | None, exclude_none: bool
+) -> tuple[dict[str, Any], bool]:
+    """
+    The exclude spec for one model, and whether every field it would
+    serialize is excluded
+    """
+    if isinstance(model, Config | Dataset) and model.type is not None:
+        chart_type = _type(model.type)
+    table = _table(type(model), chart_type)
+    exclude: dict[str, Any] = {}
+    written = 0
+    for name, field in type(model).model_fields.items():
+        if field.exclude:
+            continue
+        value = getattr(model, name)
+        if value is None:
+            written += not exclude_none
+            continue
+        written += 1
+        if name in table:
+            default = table[name]
+            if callable(default):
+                default = default(model)
+            if _equal(value, default):
+                exclude[name] = True
+                continue
+        if isinstance(value, BaseModel):
+            if not _has_defaults(type(value)):
+                continue
+            nested, empty = _exclude(value, chart_type, exclude_none)
+            if empty and not field.is_required():
+                exclude[name] = True
+            elif nested:
+                exclude[name] = nested
+        elif isinstance(value, list | tuple) and value:
+            # Only lists of models: checking the first item keeps data arrays unread
+            if not isinstance(value[0], BaseModel) or not _has_defaults(type(value[0])):
+                continue
+            items = {}
+            for i, item in enumerate(value):
+                if isinstance(item, BaseModel):
+                    nested, _ = _exclude(item, chart_type, exclude_none)
+                    if nested:
+                        items[i] = nested
+            if items:
+                exclude[name] = items
+    removed = sum(1 for spec in exclude.values() if spec is True)
+    return exclude, removed == written
+
+
+def exclude_defaults(model: BaseModel, *, exclude_none: bool = True) -> dict[str, Any]:
+    """
+    A pydantic `exclude` spec leaving out the options of `model` which are
+    equal to the Chart.js defaults
+    """
+    return _exclude(model, None, exclude_none)[0]
+
+
+def dump_json(model: BaseModel, **kwargs: Any) -> str:
+    """
+    `model.model_dump_json` without the options equal to the Chart.js defaults;
+    `exclude_none` defaults to True
+    """
+    if "exclude" in kwargs:
+        raise TypeError("dump_json computes exclude itself")
+    kwargs.setdefault("exclude_none", True)
+    return model.model_dump_json(
+        exclude=exclude_defaults(model, exclude_none=kwargs["exclude_none"]), **kwargs
+    )
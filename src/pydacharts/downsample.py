@@ -0,0 +1,229 @@
+from collections.abc import Sequence
+from typing import Any, Literal, TypeVar
+
+from pydacharts.arrays import require_numpy
+from pydacharts.models import Data, Dataset
+
+"""
+Server side downsampling for line datasets.
+
+Chart.js can't usefully draw more points than there are pixels, so long series
+can be reduced before they are sent:
+
+ - "lttb": Largest-Triangle-Three-Buckets, keeps the visual shape of the series
+ - "minmax": the minimum and maximum of each bucket, keeps every peak and trough
+
+`downsample_data` reduces every dataset of a `Data` / `LineData` with one shared
+set of buckets, so the datasets stay aligned with each other and with `labels`.
+Requires numpy (`pip install pydacharts[numpy]`).
+"""
+
+Algorithm = Literal["lttb", "minmax"]
+
+DatasetT = TypeVar("DatasetT", bound=Dataset)
+DataT = TypeVar("DataT", bound=Data)
+
+
+def _is_points(values: Any) -> bool:
+    return isinstance(values, list) and bool(values) and isinstance(values[0], dict)
+
+
+def _series(values: Any) -> tuple[Any, Any | None]:
+    """
+    Split dataset values into (y, x). `x` is None for plain value series,
+    or taken from the first column of `[[x, y], ...]` data or the `x` of
+    `{x, y}` points.
+    """
+    np = require_numpy()
+    try:
+        if _is_points(values):
+            y = np.asarray([point.get("y") for point in values], dtype=float)
+            return y, np.asarray([point.get("x") for point in values], dtype=float)
+        array = np.asarray(values, dtype=float)
+    except (TypeError, ValueError) as error:
+        raise ValueError(f"Can only downsample numeric values: {error}") from error
+    if array.ndim == 1:
+        return array, None
+    if array.ndim == 2 and array.shape[1] == 2:
+        return array[:, 1], array[:, 0]
+    raise ValueError(
+        f"Can only downsample 1-d values or [x, y] pairs, got shape {array.shape}"
+    )
+
+
+def lttb_indices(x: Any, ys: Any, threshold: int) -> Any:
+    """
+    Indices of the points kept by Largest-Triangle-Three-Buckets.
+
+    `ys` is a 1-d series or a 2-d array with one series per row; with several
+    series one shared point is picked per bucket, maximising the sum of each
+    series' triangle area (normalised by the series' range).
+    The first and last points are always kept.
+    """
+    np = require_numpy()
+    x = np.asarray(x, dtype=float)
+    ys = np.atleast_2d(np.asarray(ys, dtype=float))
+    n = x.shape[0]
+    if threshold >= n or threshold < 3:
+        return np.arange(n) if threshold >= n else np.array([0, n - 1][:threshold])
+
+    valid = ~np.isnan(ys)
+    filled = np.where(valid, ys, 0.0)
+    spans = np.nanmax(ys, axis=1, initial=-np.inf) - np.nanmin(
+        ys, axis=1, initial=np.inf
+    )
+    scale = np.where(np.isfinite(spans) & (spans > 0), spans, 1.0)[:, None]
+    filled = filled / scale
+
+    # Buckets for the points between the first and the last
+    edges = np.floor(np.linspace(1, n - 1, threshold - 1)).astype(np.intp)
+    starts, ends = edges[:-1], edges[1:]
+    counts = ends - starts
+    x_avg = np.add.reduceat(x[:-1], starts)[: len(starts)] / counts
+    y_counts = np.add.reduceat(valid[:, :-1], starts, axis=1)[:, : len(starts)]
+    y_sums = np.add.reduceat(filled[:, :-1], starts, axis=1)[:, : len(starts)]
+    y_avg = y_sums / np.maximum(y_counts, 1)
+
+    selected = np.empty(threshold, dtype=np.intp)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for bucket in range(len(starts)):
+        start, end = starts[bucket], ends[bucket]
+        if bucket + 1 < len(starts):
+            cx, cy = x_avg[bucket + 1], y_avg[:, bucket + 1 : bucket + 2]
+        else:
+            cx, cy = x[n - 1], filled[:, n - 1 : n]
+        ax, ay = x[a], filled[:, a : a + 1]
+        areas = np.abs(
+            (ax - cx) * (filled[:, start:end] - ay) - (ax - x[start:end]) * (cy - ay)
+        )
+        areas = np.where(valid[:, start:end], areas, 0.0).sum(axis=0)
+        a = start + int(np.argmax(areas))
+        selected[bucket + 1] = a
+    return selected
+
+
+def minmax_indices(ys: Any, threshold: int) -> Any:
+    """
+    Indices of the minimum and maximum of each bucket, in order.
+
+    With several series (one per row of `ys`) the buckets are shared and the
+    extremes of every series are kept; when there are too many series for
+    that, the lowest and highest point of any series (relative to its range)
+    are kept per bucket instead. At most `threshold` points are returned in
+    total. The first and last points are always kept.
+    """
+    np = require_numpy()
+    ys = np.atleast_2d(np.asarray(ys, dtype=float))
+    n = ys.shape[1]
+    if threshold >= n:
+        return np.arange(n)
+    budget = threshold - 2
+    if budget < 2:
+        return np.array([0, n - 1])[:threshold]
+
+    missing = np.isnan(ys)
+    lows = np.where(missing, np.inf, ys)
+    highs = np.where(missing, -np.inf, ys)
+    shared = budget < 2 * ys.shape[0]
+    if shared:
+        # One low and one high envelope over the series, scaled to their range
+        floor = lows.min(axis=1, keepdims=True)
+        spans = highs.max(axis=1, keepdims=True) - floor
+        scale = np.where(np.isfinite(spans) & (spans > 0), spans, 1.0)
+        lows = ((lows - floor) / scale).min(axis=0, keepdims=True)
+        highs = ((highs - floor) / scale).max(axis=0, keepdims=True)
+    buckets = max(1, budget // (2 * lows.shape[0]))
+    edges = np.floor(np.linspace(1, n - 1, buckets + 1)).astype(np.intp)
+    starts, ends = edges[:-1], edges[1:]
+    width = int((ends - starts).max())
+    # One row per bucket, padded with the bucket's own last element
+    index = starts[:, None] + np.arange(width)[None, :]
+    inside = index < ends[:, None]
+    index = np.where(inside, index, (ends - 1)[:, None])
+
+    picks = [np.array([0, n - 1])]
+    rows = np.arange(len(starts))
+    for low_series, high_series in zip(lows, highs, strict=True):
+        picks.append(index[rows, np.argmin(low_series[index], axis=1)])
+        picks.append(index[rows, np.argmax(high_series[index], axis=1)])
+    return np.unique(np.concatenate(picks))
+
+
+def downsample_indices(
+    x: Any, ys: Any, threshold: int, algorithm: Algorithm = "lttb"
+) -> Any:
+    if algorithm == "lttb":
+        return lttb_indices(x, ys, threshold)
+    if algorithm == "minmax":
+        return minmax_indices(ys, threshold)
+    raise ValueError(f"Unknown downsampling algorithm {algorithm!r}")
+
+
+def _take(values: Any, indices: Any) -> Any:
+    if _is_points(values):
+        return [values[i] for i in indices.tolist()]
+    np = require_numpy()
+    return np.asarray(values)[indices]
+
+
+def downsample_dataset(
+    dataset: DatasetT, threshold: int, algorithm: Algorithm = "lttb"
+) -> DatasetT:
+    """
+    Return a copy of `dataset` reduced to about `threshold` points.
+    `[x, y]` pair and `{x, y}` point data is bucketed on its x values, anything
+    else on its position.
+    """
+    np = require_numpy()
+    if dataset.data is None or len(dataset.data) <= threshold:
+        return dataset
+    y, x = _series(dataset.data)
+    if x is None:
+        x = np.arange(len(y))
+    indices = downsample_indices(x, y, threshold, algorithm)
+    return dataset.model_copy(update={"data": _take(dataset.data, indices)})
+
+
+def downsample_data(
+    data: DataT,
+    threshold: int,
+    algorithm: Algorithm = "lttb",
+    x: Sequence[float] | Any | None = None,
+) -> DataT:
+    """
+    Return a copy of `data` with `labels` and every dataset reduced to about
+    `threshold` points, using the same buckets for every dataset.
+
+    Buckets are laid out on `x` if it is given (for instance timestamps matching
+    the labels), otherwise on the point index.
+    """
+    np = require_numpy()
+    n = len(data.labels)
+    if n <= threshold:
+        return data
+    series = [ds for ds in data.datasets if ds.data is not None]
+    for ds in series:
+        size = 0 if ds.data is None else len(ds.data)
+        if size != n:
+            raise ValueError(
+                f"Dataset {ds.label!r} has {size} points but there are {n} labels"
+            )
+    ys = (
+        np.stack([_series(ds.data)[0] for ds in series]) if series else np.zeros((1, n))
+    )
+    indices = downsample_indices(
+        np.arange(n) if x is None else x, ys, threshold, algorithm
+    )
+    return data.model_copy(
+        update={
+            "labels": [data.labels[i] for i in indices.tolist()],
+            "datasets": [
+                ds
+                if ds.data is None
+                else ds.model_copy(update={"data": _take(ds.data, indices)})
+                for ds in data.datasets
+            ],
+        }
+    )
@@ -1,11 +1,12 @@
 from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import Field
 
+from pydacharts.base import ChartModel
 from pydacharts.chartjs_types import Color, PointStyle, number
 
 
-class PointsElements(BaseModel):
+class PointsElements(ChartModel):
     radius: number | None = Field(None, description="Point radius.")
     pointStyle: PointStyle | None = Field(None, description="Point style.")
     rotation: number | None = Field(None, description="Point rotation (in degrees).")
@@ -21,7 +22,7 @@ class PointsElements(BaseModel):
     )
 
 
-class LinesElements(BaseModel):
+class LinesElements(ChartModel):
     tension: number | None = Field(
         None, description="Bézier curve tension (0 for no Bézier curves)."
     )
@@ -52,7 +53,7 @@ class LinesElements(BaseModel):
     )
 
 
-class BarsElements(BaseModel):
+class BarsElements(ChartModel):
     """
     Bar Configuration
     Bar elements are used to represent the bars in a bar chart.
@@ -81,7 +82,7 @@ class BarsElements(BaseModel):
     )
 
 
-class ArcElements(BaseModel):
+class ArcElements(ChartModel):
     """
     Arc Configuration
     Arcs are used in the polar area, doughnut and pie charts.
@@ -100,7 +101,7 @@ class ArcElements(BaseModel):
     borderWidth: number | None = Field(None, description="Arc stroke width.")
 
 
-class Elements(BaseModel):
+class Elements(ChartModel):
     """
     arc, lines, points, and bars.
     """
@@ -0,0 +1,198 @@
+from typing import Any, TypeVar
+
+from pydacharts.arrays import require_numpy
+from pydacharts.models import (
+    ChartType,
+    Config,
+    Dataset,
+    Decimation,
+    DecimationAlgorithm,
+    Options,
+    Plugins,
+    ScaleOptions,
+    Scales,
+)
+
+"""
+Chart.js settings for charts with many points.
+
+`large_data_mode(config)` returns `config` unchanged while it has fewer than
+`threshold` points in total. Past that it returns a copy with animations off,
+and for line and scatter charts, the data converted to the `{x, y}` points
+Chart.js uses internally, sorted by x, so the chart can be drawn with
+`parsing: false`, `normalized: true` (when the datasets share their x values),
+`spanGaps: true` and, on a numeric x axis, the decimation plugin enabled.
+
+The x values come from `[x, y]` pairs or `{x, y}` points already in a dataset,
+else from the labels when they are all numbers (on a linear x axis), else from
+the label positions (on the category axis, where decimation doesn't apply).
+On a time x axis, dates (ISO strings) are converted to timestamps. Charts with
+other x values which aren't numbers only get the options which don't need
+parsed data.
+Options which are already set are left alone. Requires numpy
+(`pip install pydacharts[numpy]`).
+"""
+
+ConfigT = TypeVar("ConfigT", bound=Config)
+
+# Total number of points from which `large_data_mode` changes a chart
+LARGE_DATA_POINTS = 10_000
+
+# Chart types whose datasets are converted to {x, y} points
+POINT_CHART_TYPES = frozenset({ChartType.line.value, ChartType.scatter.value})
+
+# X axis types the decimation plugin works with
+NUMERIC_SCALE_TYPES = frozenset({"linear", "logarithmic", "time", "timeseries"})
+
+
+def point_count(config: Config) -> int:
+    if config.data is None:
+        return 0
+    return sum(len(ds.data) for ds in config.data.datasets if ds.data is not None)
+
+
+def _type(value: Any) -> str | None:
+    return value.value if isinstance(value, ChartType) else value
+
+
+def _floats(values: Any, dates: bool) -> Any:
+    """
+    x values as floats, dates as milliseconds since the epoch on a time axis;
+    ValueError for anything else
+    """
+    np = require_numpy()
+    try:
+        return np.asarray(values, dtype=float)
+    except (TypeError, ValueError):
+        if not dates:
+            raise ValueError("x values are not numbers") from None
+        return np.asarray(values, dtype="datetime64[ms]").astype("int64").astype(float)
+
+
+def _numeric(labels: list[str], dates: bool) -> Any | None:
+    try:
+        return _floats(labels, dates)
+    except ValueError:
+        return None
+
+
+def _xy(values: Any, labels_x: Any | None, dates: bool) -> tuple[Any, Any, bool]:
+    """
+    Split dataset values into x and y arrays; the bool says whether the x
+    values are the shared ones (the numeric labels, else label positions)
+    """
+    np = require_numpy()
+    if len(values) and isinstance(values[0], dict):
+        x = _floats([point.get("x") for point in values], dates)
+        return x, np.asarray([point.get("y") for point in values], dtype=float), False
+    try:
+        array = np.asarray(values, dtype=float)
+    except ValueError:
+        if not len(values) or not isinstance(values[0], list | tuple):
+            raise
+        # [x, y] pairs with x as strings
+        x = _floats([pair[0] for pair in values], dates)
+        return x, np.asarray([pair[1] for pair in values], dtype=float), False
+    if array.ndim == 2 and array.shape[1] == 2:
+        return array[:, 0], array[:, 1], False
+    if labels_x is None:
+        # Values past the last label are drawn at the next positions
+        return np.arange(len(array)), array, True
+    # Chart.js doesn't draw values without a label on a linear axis
+    size = min(len(array), len(labels_x))
+    return labels_x[:size], array[:size], True
+
+
+def _points(x: Any, y: Any) -> list[dict[str, Any]]:
+    np = require_numpy()
+    if len(x) > 1 and not np.all(x[1:] >= x[:-1]):
+        order = np.argsort(x, kind="stable")
+        x, y = x[order], y[order]
+    return [{"x": a, "y": b} for a, b in zip(x.tolist(), y.tolist(), strict=True)]
+
+
+def _default(model: Any, **values: Any) -> Any:
+    """
+    Copy of `model` with the given values set, where they are not set already
+    """
+    update = {k: v for k, v in values.items() if getattr(model, k) is None}
+    return model.model_copy(update=update) if update else model
+
+
+def large_data_mode(
+    config: ConfigT,
+    *,
+    threshold: int = LARGE_DATA_POINTS,
+    algorithm: DecimationAlgorithm = DecimationAlgorithm.lttb,
+    samples: int | None = None,
+) -> ConfigT:
+    """
+    Return a copy of `config` set up for drawing many points quickly, or
+    `config` itself if it has fewer than `threshold` points
+    """
+    if config.data is None or point_count(config) < threshold:
+        return config
+    np = require_numpy()
+    options = _default(config.options or Options(), animation=False)
+    update: dict[str, Any] = {}
+
+    data = config.data
+    convert = (
+        _type(config.type) in POINT_CHART_TYPES
+        and options.indexAxis in (None, "x")
+        and all(_type(ds.type) in (None, *POINT_CHART_TYPES) for ds in data.datasets)
+    )
+    if convert:
+        x_type = options.scales.x.type if options.scales and options.scales.x else None
+        dates = x_type in ("time", "timeseries")
+        labels_x = _numeric(data.labels, dates)
+        datasets: list[Dataset] = []
+        normalized = True
+        numeric = labels_x is not None
+        try:
+            for ds in data.datasets:
+                if ds.data is None:
+                    datasets.append(ds)
+                    continue
+                x, y, is_shared = _xy(ds.data, labels_x, dates)
+                normalized = normalized and is_shared
+                numeric = numeric or not is_shared
+                datasets.append(ds.model_copy(update={"data": _points(x, y)}))
+        except ValueError:
+            # x values which are neither numbers nor dates on a time axis
+            # (such as labels on a category axis): left for Chart.js to parse
+            convert = False
+    if convert:
+        if normalized and labels_x is not None and len(labels_x) > 1:
+            normalized = bool(np.all(np.diff(np.sort(labels_x)) > 0))
+        update["data"] = data.model_copy(
+            update={
+                "datasets": datasets,
+                # Numeric labels are now the x values
+                "labels": [] if labels_x is not None else data.labels,
+            }
+        )
+
+        options = _default(options, parsing=False, spanGaps=True)
+        if normalized:
+            options = _default(options, normalized=True)
+        if numeric:
+            scales = options.scales or Scales()
+            x_scale = scales.x or ScaleOptions()
+            if x_scale.type not in NUMERIC_SCALE_TYPES:
+                x_scale = x_scale.model_copy(update={"type": "linear"})
+            plugins = _default(
+                options.plugins or Plugins(),
+                decimation=Decimation(
+                    enabled=True, algorithm=algorithm, samples=samples
+                ),
+            )
+            options = options.model_copy(
+                update={
+                    "scales": scales.model_copy(update={"x": x_scale}),
+                    "plugins": plugins,
+                }
+            )
+
+    update["options"] = options
+    return config.model_copy(update=update)
@@ -0,0 +1,166 @@
+from collections.abc import Sequence
+from typing import Any
+
+from pydacharts.arrays import require_numpy
+from pydacharts.models import Data, Dataset, LineData
+from pydacharts.patch import Operation
+from pydacharts.streaming import field_adapter
+from pydacharts.trusted import construct
+
+"""
+Live line charts over a fixed window of the latest points.
+
+Rebuilding `LineData` on every tick validates the whole history again.
+`LiveData` keeps the labels and the values of every dataset in one ring
+buffer instead, appending in constant time and dropping the oldest points
+once `capacity` is reached:
+
+    live = LiveData(600, [LineDataSet(label="CPU"), LineDataSet(label="Memory")])
+    live.append("12:00:01", [0.42, 0.73])
+
+    Config(type="line", data=live.data())  # the current window, for a page load
+    live.delta()  # then the points added since, as patch operations
+
+`delta()` returns `pydacharts.patch` operations, one compact `append` per
+array ({"op": "append", "path": "/data/labels", "value": [...], "shift": 1}),
+which `apply_patch` (or the browser) applies to the JSON sent last.
+Requires numpy (`pip install pydacharts[numpy]`).
+
+Each reader can keep its own `cursor()` and ask for `delta(since=cursor)`,
+so a slow reader gets the points it missed in one update rather than a
+queue of them.
+"""
+
+# Points appended, and the window size, at some point in time
+Cursor = tuple[int, int]
+
+
+class LiveData:
+    """
+    The latest `capacity` points of `datasets` (LineDataSet, or any dataset
+    model, as templates for everything but `data`), with their labels
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        datasets: Sequence[Dataset],
+        *,
+        data_class: type[Data] = LineData,
+    ):
+        np = require_numpy()
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.datasets = list(datasets)
+        self.data_class = data_class
+        # Every point is stored twice, at i and i + capacity, so that the
+        # window is always one contiguous slice which can be serialized as is
+        self._values = np.full((len(self.datasets), 2 * capacity), np.nan)
+        self._labels: list[str] = [""] * (2 * capacity)
+        # Points appended so far, and when last serialized
+        self._total = 0
+        self._sent = 0
+        self._sent_size = 0
+
+    def __len__(self) -> int:
+        return min(self._total, self.capacity)
+
+    def _window(self) -> slice:
+        size = len(self)
+        start = (self._total - size) % self.capacity
+        return slice(start, start + size)
+
+    def append(self, label: str, values: Sequence[float]) -> None:
+        """
+        Add a point: its label and one value per dataset (NaN for a gap)
+        """
+        np = require_numpy()
+        row = np.asarray(values, dtype=float)
+        if row.shape != (len(self.datasets),):
+            raise ValueError(f"Expected {len(self.datasets)} values, one per dataset")
+        position = self._total % self.capacity
+        self._values[:, position] = row
+        self._values[:, position + self.capacity] = row
+        self._labels[position] = self._labels[position + self.capacity] = label
+        self._total += 1
+
+    def extend(self, labels: Sequence[str], values: Any) -> None:
+        """
+        Add points: their labels and a (points x datasets) array of values
+        """
+        np = require_numpy()
+        count = len(labels)
+        rows = np.asarray(values, dtype=float)
+        if rows.shape != (count, len(self.datasets)):
+            raise ValueError(
+                f"Expected values of shape ({count}, {len(self.datasets)}), "
+                "one row per label and one column per dataset"
+            )
+        # Points which would be dropped straight away are never written
+        skip = max(0, count - self.capacity)
+        positions = (self._total + skip + np.arange(count - skip)) % self.capacity
+        self._values[:, positions] = rows[skip:].T
+        self._values[:, positions + self.capacity] = rows[skip:].T
+        for position, label in zip(positions.tolist(), labels[skip:], strict=True):
+            self._labels[position] = self._labels[position + self.capacity] = label
+        self._total += count
+
+    def cursor(self) -> Cursor:
+        """
+        The position of the window, which a later `delta` can start from
+        """
+        return self._total, len(self)
+
+    def _mark(self) -> None:
+        self._sent, self._sent_size = self.cursor()
+
+    def data(self) -> Data:
+        """
+        The current window as `data_class`, and the point from which the next
+        `delta` starts. The datasets' data are views of the buffer, valid
+        until the next `append` or `extend`: serialize them before that.
+        """
+        window = self._window()
+        datasets = [
+            dataset.model_copy(update={"data": values[window]})
+            for dataset, values in zip(self.datasets, self._values, strict=True)
+        ]
+        self._mark()
+        return construct(
+            self.data_class, labels=self._labels[window], datasets=datasets
+        )
+
+    def delta(
+        self, path: str = "/data", *, since: Cursor | None = None
+    ) -> list[Operation]:
+        """
+        Patch operations from the window at the last `data` or `delta` call
+        (or at the `since` cursor) to the current one, for a `Data` at `path`
+        in the chart's JSON. Any number of updates since come out as one
+        operation per array.
+        """
+        sent, sent_size = (self._sent, self._sent_size) if since is None else since
+        appended = self._total - sent
+        if not appended:
+            return []
+        size = len(self)
+        # Points which left the window since, at most all of those sent
+        shift = min(self._total - size - (sent - sent_size), sent_size)
+        window = self._window()
+        new = slice(window.stop - min(appended, size), window.stop)
+        adapter = field_adapter(Dataset, "data")
+
+        def operation(array_path: str, value: Any) -> Operation:
+            op: Operation = {"op": "append", "path": array_path, "value": value}
+            if shift:
+                op["shift"] = shift
+            return op
+
+        ops = [operation(f"{path}/labels", self._labels[new])]
+        for index, values in enumerate(self._values):
+            value = adapter.dump_python(values[new], mode="json")
+            ops.append(operation(f"{path}/datasets/{index}/data", value))
+        if since is None:
+            self._mark()
+        return ops
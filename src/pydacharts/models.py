@@ -1,13 +1,29 @@
+import typing
 from collections.abc import Sequence
 from enum import Enum
-from typing import Any, Literal
-
-from pydantic import BaseModel, Field
+from typing import Annotated, Any, Literal, Self
+
+from pydantic import (
+    Discriminator,
+    Field,
+    SerializationInfo,
+    SerializeAsAny,
+    SerializerFunctionWrapHandler,
+    Tag,
+    TypeAdapter,
+    ValidationInfo,
+    ValidatorFunctionWrapHandler,
+    field_serializer,
+    field_validator,
+)
 
+from pydacharts.arrays import DataArray, typed_array
+from pydacharts.base import ChartModel, built
 from pydacharts.chartjs_types import (
     Color,
     Font,
     Function,
+    Indexable,
     Padding,
     PointStyle,
     RgbStr,
@@ -15,6 +31,7 @@ from pydacharts.chartjs_types import (
 )
 from pydacharts.elements import Elements
 from pydacharts.plugins.datalabels import DataLabelsPlugin
+from pydacharts.precision import Precision
 
 
 class ChartType(str, Enum):
@@ -31,12 +48,28 @@ class ChartType(str, Enum):
     sankey = "sankey"
 
 
+def _chart_type_tag(value: Any) -> str:
+    return "ChartType" if isinstance(value, ChartType) else "str"
+
+
+# The ChartType enum, or a chart type name (kept as given)
+AnyChartType = Annotated[
+    Annotated[ChartType, Tag("ChartType")] | Annotated[str, Tag("str")],
+    Discriminator(_chart_type_tag),
+]
+
+
 class StepOption(str, Enum):
     before = "before"
     after = "after"
     middle = "middle"
 
 
+class DecimationAlgorithm(str, Enum):
+    lttb = "lttb"
+    minmax = "min-max"
+
+
 class LegendAlign(str, Enum):
     top = "top"
     left = "left"
@@ -53,7 +86,7 @@ class LegendPosition(str, Enum):
     chartArea = "chartArea"
 
 
-class Layout(BaseModel):
+class Layout(ChartModel):
     """
     the global options for the chart layout is defined in Chart.defaults.layout
     """
@@ -61,11 +94,11 @@ class Layout(BaseModel):
     padding: Padding | None = None
 
 
-class Dataset(BaseModel):
+class Dataset(ChartModel):
     label: str | None = None
-    data: list[Any] | None = None
-    borderColor: list[RgbStr] | RgbStr | None = None
-    backgroundColor: list[RgbStr] | RgbStr | None = None
+    data: DataArray | None = None
+    borderColor: Indexable[RgbStr] | None = None
+    backgroundColor: Indexable[RgbStr] | None = None
     showLine: bool | None = None
     hoverOffset: int | None = None
     # Support stacked bar charts
@@ -76,11 +109,28 @@ class Dataset(BaseModel):
     borderSkipped: bool | None = None
     borderDash: list[int] | None = None
     # Support "combo chart"
-    type: ChartType | str | None = None
+    type: AnyChartType | None = None
     order: int | None = None
 
     datalabels: DataLabelsPlugin | None = None
 
+    # Rounding of `data` for this dataset, overriding a `Precision` in the serialization context
+    precision: Precision | None = Field(None, exclude=True)
+
+    @field_serializer("data", mode="wrap")
+    def _serialize_data(
+        self,
+        value: Any,
+        handler: SerializerFunctionWrapHandler,
+        info: SerializationInfo,
+    ) -> Any:
+        if self.precision is None or value is None:
+            return handler(value)
+        if info.mode_is_json():
+            typed = typed_array(value, info.context, self.precision)
+            return self.precision.to_json(value) if typed is None else typed
+        return self.precision.round_array(value)
+
 
 class LineDataSet(Dataset):
     showLine: bool | None = True
@@ -93,9 +143,51 @@ class PieDataSet(Dataset):
     fill: bool | None = False
 
 
-class Data(BaseModel):
+# The dataset model for datasets of a given type, such as the line datasets of a
+# mixed bar / line chart
+DATASET_CLASSES: dict[str, type[Dataset]] = {
+    ChartType.line.value: LineDataSet,
+    ChartType.pie.value: PieDataSet,
+    ChartType.doughnut.value: PieDataSet,
+}
+
+
+def _dataset_tag(value: Any) -> str:
+    """
+    Datasets are picked by their own `type`; instances keep their class
+    """
+    if isinstance(value, dict):
+        dataset_type = value.get("type")
+        dataset_type = getattr(dataset_type, "value", dataset_type)
+        if isinstance(dataset_type, str) and dataset_type in DATASET_CLASSES:
+            return DATASET_CLASSES[dataset_type].__name__
+        return "Dataset"
+    for dataset_class in DATASET_CLASSES.values():
+        if isinstance(value, dataset_class):
+            return dataset_class.__name__
+    return "Dataset"
+
+
+class Data(ChartModel):
     labels: list[str]
-    datasets: Sequence[Dataset]
+    datasets: Sequence[
+        SerializeAsAny[
+            Annotated[
+                Annotated[Dataset, Tag("Dataset")]
+                | Annotated[LineDataSet, Tag("LineDataSet")]
+                | Annotated[PieDataSet, Tag("PieDataSet")],
+                Discriminator(_dataset_tag),
+            ]
+        ]
+    ]
+
+    @field_validator("datasets")
+    @classmethod
+    def _build_datasets(cls, value: Sequence[Dataset]) -> Sequence[Dataset]:
+        # Dumped as their own class, whose schema may not be built yet
+        for dataset in value:
+            built(dataset)
+        return value
 
 
 class LineData(Data):
@@ -106,7 +198,7 @@ class PieData(Data):
     datasets: Sequence[PieDataSet]
 
 
-class Title(BaseModel):
+class Title(ChartModel):
     display: bool = True
     text: str | None = None
     color: RgbStr | None = None
@@ -115,7 +207,7 @@ class Title(BaseModel):
     align: Literal["left", "right", "center"] | None = None
 
 
-class LegendLabels(BaseModel):
+class LegendLabels(ChartModel):
     """
     Namespace: options.plugins.legend.labels
     """
@@ -153,7 +245,7 @@ class LegendLabels(BaseModel):
     )
 
 
-class LegendTitle(BaseModel):
+class LegendTitle(ChartModel):
     color: Color | None = Field(None, description="Color of text.")
     display: bool | None = Field(None, description="Is the legend title displayed.")
     font: Font | None = Field(None, description="See Fonts")
@@ -161,7 +253,7 @@ class LegendTitle(BaseModel):
     text: str | None = Field(None, description="The string title.")
 
 
-class Legend(BaseModel):
+class Legend(ChartModel):
     display: bool | None = Field(None, description="Is the legend shown?")
     position: str | None = Field(None, description="Position of the legend")
     align: str | None = Field(None, description="Alignment of the legend")
@@ -205,7 +297,7 @@ class Legend(BaseModel):
     )
 
 
-class TooltipCallbacks(BaseModel):
+class TooltipCallbacks(ChartModel):
     beforeTitle: Function | None = Field(
         None, description="Returns the text to render before the title."
     )
@@ -254,7 +346,7 @@ class TooltipCallbacks(BaseModel):
     )
 
 
-class Tooltip(BaseModel):
+class Tooltip(ChartModel):
     """
     https://www.chartjs.org/docs/latest/configuration/tooltip.html#tooltip-callbacks
     """
@@ -357,14 +449,46 @@ class Tooltip(BaseModel):
     )
 
 
-class Plugins(BaseModel):
+class Decimation(ChartModel):
+    """
+    The built in data decimation plugin. It only acts on line datasets with
+    `parsing: false` data on a linear or time x axis.
+    """
+
+    enabled: bool | None = Field(None, description="Is decimation enabled?")
+    algorithm: DecimationAlgorithm | str | None = Field(
+        None, description="Decimation algorithm to use: 'lttb' or 'min-max'."
+    )
+    samples: int | None = Field(
+        None,
+        description="If the 'lttb' algorithm is used, this is the number of samples in the output dataset. Defaults to the canvas width to pick 1 sample per pixel.",
+    )
+    threshold: int | None = Field(
+        None,
+        description="If the number of samples in the current axis range is above this value, the decimation will be triggered. Defaults to 4 times the canvas width.",
+    )
+
+
+def _datalabels_tag(value: Any) -> str:
+    return "list" if isinstance(value, list | tuple) else "DataLabelsPlugin"
+
+
+class Plugins(ChartModel):
     legend: Legend | None = None
     title: Title | None = None
-    datalabels: DataLabelsPlugin | list[DataLabelsPlugin] | None = None
+    datalabels: (
+        Annotated[
+            Annotated[DataLabelsPlugin, Tag("DataLabelsPlugin")]
+            | Annotated[list[DataLabelsPlugin], Tag("list")],
+            Discriminator(_datalabels_tag),
+        ]
+        | None
+    ) = None
     tooltip: Tooltip | None = None
+    decimation: Decimation | None = None
 
 
-class Ticks(BaseModel):
+class Ticks(ChartModel):
     """
     Namespace: options.scales[scaleId].ticks
     """
@@ -403,7 +527,7 @@ class Ticks(BaseModel):
     )
 
 
-class Grid(BaseModel):
+class Grid(ChartModel):
     borderColor: Color | None = Field(
         default=None, description="The color of the border line."
     )
@@ -533,23 +657,50 @@ class CartesianTicks(Ticks):
     )
 
 
-class ScaleOptions(BaseModel):
+# Options which only the ticks of cartesian axes have
+_CARTESIAN_TICKS_FIELDS = frozenset(CartesianTicks.model_fields) - frozenset(
+    Ticks.model_fields
+)
+
+
+def _ticks_tag(value: Any) -> str:
+    """
+    Cartesian ticks are picked when any of their own options is given
+    """
+    # CartesianTicks is a Ticks: checked first, and subclasses of either match
+    if isinstance(value, CartesianTicks):
+        return "CartesianTicks"
+    if isinstance(value, Ticks):
+        return "Ticks"
+    if isinstance(value, dict) and not _CARTESIAN_TICKS_FIELDS.isdisjoint(value):
+        return "CartesianTicks"
+    return "Ticks"
+
+
+class ScaleOptions(ChartModel):
     display: bool | None = True
     beginAtZero: bool | None = None
     title: Title | None = None
-    min: int | None = None
-    max: int | None = None
+    min: number | None = None
+    max: number | None = None
     stacked: bool | None = None
     position: str | None = None
     offset: bool = True
-    ticks: Ticks | CartesianTicks | None = None
+    ticks: (
+        Annotated[
+            Annotated[Ticks, Tag("Ticks")]
+            | Annotated[CartesianTicks, Tag("CartesianTicks")],
+            Discriminator(_ticks_tag),
+        ]
+        | None
+    ) = None
     barThickness: int | None = None
     labels: Any | None = None
     grid: Grid | None = None
     type: str | None = None
 
 
-class Scales(BaseModel):
+class Scales(ChartModel):
     y: ScaleOptions | None = None
     x: ScaleOptions | None = None
     # Added for datalabels plugin
@@ -561,7 +712,7 @@ class Scales(BaseModel):
     grid: Grid | None = None
 
 
-class Interaction(BaseModel):
+class Interaction(ChartModel):
     intersect: bool | None = None  # False for stacked charts
     mode: str | None = Field(
         None,
@@ -571,7 +722,20 @@ class Interaction(BaseModel):
     includeInvisible: bool | None = False
 
 
-class Options(BaseModel):
+class Animation(ChartModel):
+    duration: number | None = Field(
+        None, description="The number of milliseconds an animation takes."
+    )
+    easing: str | None = Field(None, description="Easing function to use.")
+    delay: number | None = Field(
+        None, description="Delay before starting the animations."
+    )
+    loop: bool | None = Field(
+        None, description="If set to true, the animations loop endlessly."
+    )
+
+
+class Options(ChartModel):
     responsive: bool | None = Field(
         True,
         description="Resizes the chart canvas when its container does (important note...).",
@@ -607,12 +771,130 @@ class Options(BaseModel):
     # Doughnut chart
     cutout: str | None = None
 
+    # Large datasets
+    animation: Animation | Literal[False] | None = Field(
+        None, description="Animation configuration, or false to disable animations."
+    )
+    parsing: bool | dict[str, str] | None = Field(
+        None,
+        description="How to parse the dataset. Set to false when the data is already in Chart.js' internal format ({x, y} points, sorted).",
+    )
+    normalized: bool | None = Field(
+        None,
+        description="Set to true when the data is unique, sorted and consistent across datasets, so Chart.js can skip those checks.",
+    )
+    spanGaps: bool | number | None = Field(
+        None,
+        description="If true, lines will be drawn between points with no or null data. If false, points with null data will create a break in the line. Can also be a number specifying the maximum gap length to span.",
+    )
+
 
-class Config(BaseModel):
-    type: ChartType | str = ChartType.line
-    data: Data | None = None
+def _declared(annotation: Any) -> type | None:
+    """
+    The class in an `X | None` (or `Annotated[X, ...] | None`) annotation
+    """
+    if isinstance(annotation, type):
+        return None if annotation is type(None) else annotation
+    for arg in typing.get_args(annotation):
+        declared = _declared(arg)
+        if declared is not None:
+            return declared
+    return None
+
+
+# The data model for chart types with their own dataset model
+DATA_CLASSES: dict[str, type[Data]] = {
+    ChartType.line.value: LineData,
+    ChartType.pie.value: PieData,
+    ChartType.doughnut.value: PieData,
+}
+
+
+# (`Config.type` hides the builtin in the class body)
+DataClass = type[Data]
+
+# Config subclasses which `Config.load_json` loads charts of a given type into
+CONFIG_CLASSES: dict[str, type["Config"]] = {}
+
+_loaders: dict[tuple[type, tuple], TypeAdapter] = {}
+
+
+def _config_tag(value: Any) -> str:
+    chart_type = (
+        value.get("type") if isinstance(value, dict) else getattr(value, "type", None)
+    )
+    chart_type = getattr(chart_type, "value", chart_type)
+    return (
+        chart_type
+        if isinstance(chart_type, str) and chart_type in CONFIG_CLASSES
+        else ""
+    )
+
+
+class Config(ChartModel):
+    type: AnyChartType = ChartType.line
+    data: SerializeAsAny[Data] | None = None
     options: Options | None = None
 
+    @field_validator("data", mode="wrap")
+    @classmethod
+    def _data_for_type(
+        cls, value: Any, handler: ValidatorFunctionWrapHandler, info: ValidationInfo
+    ) -> Any:
+        """
+        Validate data given as a dict once, with the data model for the chart type
+        """
+        data_class = cls.data_class_for(info.data.get("type"))
+        if data_class is None or not isinstance(value, dict):
+            # Dumped as its own class, whose schema may not be built yet
+            return built(handler(value))
+        return data_class.model_validate(value, context=info.context)
+
+    @classmethod
+    def data_class_for(cls, chart_type: Any) -> DataClass | None:
+        """
+        The `DATA_CLASSES` model for data of `chart_type` given as a dict, or
+        None where the declared data model applies
+        """
+        data_class = DATA_CLASSES.get(str(getattr(chart_type, "value", chart_type)))
+        if data_class is None or not issubclass(
+            data_class, _declared(cls.model_fields["data"].annotation) or Data
+        ):
+            return None
+        return data_class
+
+    @classmethod
+    def load_json(cls, data: str | bytes | bytearray | memoryview | Any) -> Self:
+        """
+        Parse stored chart JSON into the most specific model in one pass: the
+        `CONFIG_CLASSES` entry for its type (such as `Sankey`) when that is a
+        subclass of `cls`, else `cls`, with the data model for the chart type.
+        Buffers such as a `mmap` are read as bytes.
+        """
+        if not isinstance(data, str | bytes):
+            # pydantic's parser takes str and bytes, not buffers
+            data = memoryview(data).tobytes()
+        # Register the plugin chart types
+        import pydacharts.plugins.sankey  # noqa: F401
+
+        return _loader(cls).validate_json(data)
+
+
+def _loader(cls: type[Config]) -> TypeAdapter:
+    key = (cls, tuple(CONFIG_CLASSES.items()))
+    if key not in _loaders:
+        members = [
+            Annotated[config_class, Tag(chart_type)]
+            for chart_type, config_class in CONFIG_CLASSES.items()
+            if issubclass(config_class, cls) and config_class is not cls
+        ]
+        if not members:
+            _loaders[key] = TypeAdapter(cls)
+        else:
+            union: Any = typing.Union[(Annotated[cls, Tag("")], *members)]  # noqa: UP007
+            _loaders[key] = TypeAdapter(Annotated[union, Discriminator(_config_tag)])
+    return _loaders[key]
+
 
 if __name__ == "__main__":
     Layout().model_dump_json()
@@ -0,0 +1,448 @@
+import copy
+from collections.abc import Iterable
+from typing import Any
+
+from pydantic import BaseModel, TypeAdapter
+from pydantic.fields import FieldInfo
+
+from pydacharts.arrays import is_buffer, numpy_module
+from pydacharts.streaming import (
+    STREAMED_FIELDS,
+    declared_model,
+    field_adapter,
+    has_streamed_fields,
+    walkable,
+)
+
+"""
+Patches between two versions of a chart, for live updates.
+
+`make_patch(old, new)` returns a list of RFC 6902 JSON Patch operations which
+turn the JSON of `old` into the JSON of `new` (`model_dump(mode="json",
+exclude_none=True)`). `labels` and the datasets' `data` arrays are compared
+structurally: when the new array is the old one with points dropped from the
+front and/or added at the end, the patch carries only the added points, in a
+compact operation
+
+    {"op": "append", "path": "/data/datasets/0/data", "value": [41, 42], "shift": 2}
+
+meaning "remove the first `shift` items, then append `value`". With
+`compact=False` the same change is written as standard `remove` / `add`
+operations instead. `apply_patch` applies either form to a JSON document.
+
+The operations hold only the changed points. Finding them compares the
+overlapping parts of the arrays, which is a C level comparison (list slices or
+`numpy.array_equal`) rather than per-point python work, and is skipped entirely
+when the array object is unchanged. It is still proportional to the size of
+the chart, not to the change: any point of the overlap may have been edited.
+Candidate shifts are first checked on the tail of the overlap and a few
+anchor points, so at most one full comparison is made per array. With
+`exact=False` that check is all there is, which makes the patch O(changed)
+but misses edits between the anchors; `LiveData.delta` in `pydacharts.live`
+knows what changed without comparing anything.
+"""
+
+Operation = dict[str, Any]
+
+# How many positions of the new first point are tried when looking for a shift
+MAX_SHIFT_CANDIDATES = 8
+
+# How many points at the end of the overlap, and spread over it, are compared
+# before (or, with `exact=False`, instead of) the whole overlap
+SAMPLED_POINTS = 8
+
+
+def _pointer(path: str, key: str | int) -> str:
+    return f"{path}/{str(key).replace('~', '~0').replace('/', '~1')}"
+
+
+def _is_sequence(value: Any) -> bool:
+    if isinstance(value, list | tuple):
+        return True
+    np = numpy_module()
+    if np is not None and isinstance(value, np.ndarray):
+        return value.ndim == 1
+    return is_buffer(value) and (not isinstance(value, memoryview) or value.ndim == 1)
+
+
+def _same(old: Any, new: Any) -> bool:
+    np = numpy_module()
+    if np is not None and (isinstance(old, np.ndarray) or isinstance(new, np.ndarray)):
+        old, new = np.asarray(old), np.asarray(new)
+        try:
+            return bool(np.array_equal(old, new, equal_nan=True))
+        except TypeError:
+            return bool(np.array_equal(old, new))
+    if type(old) is not type(new):
+        return list(old) == list(new)
+    return bool(old == new)
+
+
+def _positions(values: Any, value: Any) -> Iterable[int]:
+    """
+    Indexes (after the first) where `value` occurs in `values`, in order
+    """
+    np = numpy_module()
+    if np is not None and isinstance(values, np.ndarray):
+        matches = np.flatnonzero(values[1:] == value)[:MAX_SHIFT_CANDIDATES] + 1
+        return matches.tolist()
+    if isinstance(values, memoryview):
+        values = values.tolist()
+    found: list[int] = []
+    start = 1
+    while len(found) < MAX_SHIFT_CANDIDATES:
+        try:
+            start = values.index(value, start)
+        except ValueError:
+            break
+        found.append(start)
+        start += 1
+    return found
+
+
+def _sampled(old: Any, new: Any, shift: int, overlap: int) -> bool:
+    """
+    Whether `old[shift:]` and `new[:overlap]` agree on the last points and on a
+    few points spread over the overlap
+    """
+    tail = min(overlap, SAMPLED_POINTS)
+    if not _same(
+        old[shift + overlap - tail : shift + overlap], new[overlap - tail : overlap]
+    ):
+        return False
+    step = max(overlap // SAMPLED_POINTS, 1)
+    return all(
+        _same(old[shift + index : shift + index + 1], new[index : index + 1])
+        for index in range(0, overlap - tail, step)
+    )
+
+
+def _shift(old: Any, new: Any, exact: bool = True) -> int | None:
+    """
+    The smallest number of points to drop from the front of `old` so that `new`
+    starts with what is left, or None if `new` doesn't continue `old` at all.
+
+    With `exact=False` the overlap is only compared on sampled points.
+    """
+
+    def continues(shift: int, overlap: int) -> bool:
+        return _sampled(old, new, shift, overlap) and (
+            not exact or _same(old[shift:], new[:overlap])
+        )
+
+    size = len(old)
+    if len(new) >= size and continues(0, size):
+        return 0
+    if not len(new):
+        return None
+    for shift in _positions(old, new[0]):
+        overlap = size - shift
+        if overlap <= len(new) and continues(shift, overlap):
+            return shift
+    return None
+
+
+class _Differ:
+    def __init__(self, compact: bool, exact: bool = True):
+        self.compact = compact
+        self.exact = exact
+        self.ops: list[Operation] = []
+
+    def json(self, old: Any, new: Any, path: str) -> None:
+        """
+        Generic diff of two JSON values. Lists are replaced as a whole.
+        """
+        if type(old) is type(new) and old == new:
+            return
+        if isinstance(old, dict) and isinstance(new, dict):
+            for key in old:
+                if key not in new:
+                    self.ops.append({"op": "remove", "path": _pointer(path, key)})
+            for key, value in new.items():
+                if key in old:
+                    self.json(old[key], value, _pointer(path, key))
+                else:
+                    self.ops.append(
+                        {"op": "add", "path": _pointer(path, key), "value": value}
+                    )
+            return
+        self.ops.append({"op": "replace", "path": path, "value": new})
+
+    def model(
+        self, old: BaseModel, new: BaseModel, cls: type[BaseModel], path: str
+    ) -> None:
+        walked = {
+            name: field
+            for name, field in cls.model_fields.items()
+            if name in STREAMED_FIELDS and not field.exclude
+        }
+        if not walked or not walkable(cls):
+            self.json(self.dump(old, cls), self.dump(new, cls), path)
+            return
+        self.json(
+            self.dump(old, cls, exclude=set(walked)),
+            self.dump(new, cls, exclude=set(walked)),
+            path,
+        )
+        for name, field in walked.items():
+            self.field(
+                cls,
+                name,
+                field,
+                getattr(old, name),
+                getattr(new, name),
+                _pointer(path, name),
+            )
+
+    @staticmethod
+    def dump(
+        value: BaseModel, cls: type[BaseModel], exclude: set[str] | None = None
+    ) -> Any:
+        return cls.__pydantic_serializer__.to_python(
+            value, mode="json", exclude_none=True, by_alias=True, exclude=exclude
+        )
+
+    def field(
+        self,
+        cls: type[BaseModel],
+        name: str,
+        field: FieldInfo,
+        old: Any,
+        new: Any,
+        path: str,
+    ) -> None:
+        if old is new:
+            return
+        adapter = field_adapter(cls, name)
+        if new is None:
+            self.ops.append({"op": "remove", "path": path})
+            return
+        if old is None:
+            self.ops.append(
+                {
+                    "op": "add",
+                    "path": path,
+                    "value": adapter.dump_python(
+                        new, mode="json", exclude_none=True, by_alias=True
+                    ),
+                }
+            )
+            return
+
+        model_cls, as_any = declared_model(field)
+        if (
+            model_cls is not None
+            and isinstance(old, BaseModel)
+            and isinstance(new, BaseModel)
+        ):
+            if as_any and type(old) is not type(new):
+                self.replace(
+                    adapter.dump_python(
+                        new, mode="json", exclude_none=True, by_alias=True
+                    ),
+                    path,
+                )
+            else:
+                self.model(old, new, type(new) if as_any else model_cls, path)
+        elif (
+            model_cls is not None
+            and isinstance(old, list | tuple)
+            and isinstance(new, list | tuple)
+            and has_streamed_fields(model_cls)
+            and all(isinstance(i, BaseModel) for i in (*old, *new))
+        ):
+            self.models(old, new, model_cls, as_any, path)
+        elif _is_sequence(old) and _is_sequence(new):
+            self.array(cls, name, old, new, path)
+        else:
+            self.json(
+                adapter.dump_python(old, mode="json", exclude_none=True, by_alias=True),
+                adapter.dump_python(new, mode="json", exclude_none=True, by_alias=True),
+                path,
+            )
+
+    def models(
+        self,
+        old: Any,
+        new: Any,
+        model_cls: type[BaseModel],
+        as_any: bool,
+        path: str,
+    ) -> None:
+        """
+        A list of models, such as `Data.datasets`: matched up by position
+        """
+        common = min(len(old), len(new))
+        for index in range(common):
+            if old[index] is new[index]:
+                continue
+            if as_any and type(old[index]) is not type(new[index]):
+                self.replace(
+                    self.dump(new[index], type(new[index])), _pointer(path, index)
+                )
+            else:
+                self.model(
+                    old[index],
+                    new[index],
+                    type(new[index]) if as_any else model_cls,
+                    _pointer(path, index),
+                )
+        for index in reversed(range(common, len(old))):
+            self.ops.append({"op": "remove", "path": _pointer(path, index)})
+        for item in new[common:]:
+            self.ops.append(
+                {
+                    "op": "add",
+                    "path": _pointer(path, "-"),
+                    "value": self.dump(item, type(item) if as_any else model_cls),
+                }
+            )
+
+    def array(
+        self, cls: type[BaseModel], name: str, old: Any, new: Any, path: str
+    ) -> None:
+        adapter = field_adapter(cls, name)
+        shift = _shift(old, new, self.exact)
+        if shift is not None:
+            appended = len(new) - len(old) + shift
+            if not shift and not appended:
+                return
+            # Keep the operation only if it is smaller than replacing the array
+            if appended < len(new) and (self.compact or shift + appended < len(new)):
+                self.update(adapter, new, path, shift, appended)
+                return
+        self.replace(
+            adapter.dump_python(new, mode="json", exclude_none=True, by_alias=True),
+            path,
+        )
+
+    def update(
+        self, adapter: TypeAdapter, new: Any, path: str, shift: int, appended: int
+    ) -> None:
+        values = adapter.dump_python(
+            new[len(new) - appended :], mode="json", exclude_none=True, by_alias=True
+        )
+        if self.compact:
+            op: Operation = {"op": "append", "path": path, "value": values}
+            if shift:
+                op["shift"] = shift
+            self.ops.append(op)
+            return
+        self.ops.extend(
+            {"op": "remove", "path": _pointer(path, 0)} for _ in range(shift)
+        )
+        self.ops.extend(
+            {"op": "add", "path": _pointer(path, "-"), "value": value}
+            for value in values
+        )
+
+    def replace(self, value: Any, path: str) -> None:
+        self.ops.append({"op": "replace", "path": path, "value": value})
+
+
+def make_patch(
+    old: BaseModel, new: BaseModel, *, compact: bool = True, exact: bool = True
+) -> list[Operation]:
+    """
+    Operations turning the JSON of `old` into the JSON of `new`.
+
+    With `compact=False` only RFC 6902 operations are used; otherwise appends and
+    shifts of `labels` and dataset `data` are written as single `append` operations.
+
+    Detecting those compares the arrays' overlap, in time proportional to the
+    chart's size. With `exact=False` only the end of the overlap and a few
+    points spread over it are compared: the cost depends on the change only,
+    for arrays which are known to be only appended to and shifted (points
+    edited in place elsewhere are then missed). `LiveData.delta` builds the
+    same operations from its ring buffer without any comparison.
+    """
+    differ = _Differ(compact, exact)
+    if type(old) is not type(new):
+        differ.replace(
+            new.model_dump(mode="json", exclude_none=True, by_alias=True), ""
+        )
+    else:
+        differ.model(old, new, type(new), "")
+    return differ.ops
+
+
+def _parse(path: str) -> list[str]:
+    if path == "":
+        return []
+    if not path.startswith("/"):
+        raise ValueError(f"Invalid JSON pointer {path!r}")
+    return [part.replace("~1", "/").replace("~0", "~") for part in path[1:].split("/")]
+
+
+def _index(container: list, key: str, insert: bool = False) -> int:
+    if key == "-" and insert:
+        return len(container)
+    if not key.isdigit() or (len(key) > 1 and key.startswith("0")):
+        raise ValueError(f"Invalid array index {key!r}")
+    index = int(key)
+    if index > len(container) or (index == len(container) and not insert):
+        raise IndexError(f"Array index {index} out of range")
+    return index
+
+
+def _resolve(document: Any, parts: list[str]) -> Any:
+    for part in parts:
+        if isinstance(document, list):
+            document = document[_index(document, part)]
+        else:
+            document = document[part]
+    return document
+
+
+def _add(document: Any, parts: list[str], value: Any) -> Any:
+    if not parts:
+        return value
+    parent = _resolve(document, parts[:-1])
+    if isinstance(parent, list):
+        parent.insert(_index(parent, parts[-1], insert=True), value)
+    else:
+        parent[parts[-1]] = value
+    return document
+
+
+def _remove(document: Any, parts: list[str]) -> Any:
+    parent = _resolve(document, parts[:-1])
+    if isinstance(parent, list):
+        return parent.pop(_index(parent, parts[-1]))
+    return parent.pop(parts[-1])
+
+
+def apply_patch(document: Any, patch: Iterable[Operation]) -> Any:
+    """
+    Apply a patch from `make_patch` (or any RFC 6902 patch) to a JSON document.
+
+    The document is modified in place and returned; values from the patch are
+    inserted without copying.
+    """
+    for operation in patch:
+        op = operation["op"]
+        parts = _parse(operation["path"])
+        if op == "add":
+            document = _add(document, parts, operation["value"])
+        elif op == "remove":
+            _remove(document, parts)
+        elif op == "replace":
+            if parts:
+                _remove(document, parts)
+            document = _add(document, parts, operation["value"])
+        elif op == "move":
+            value = _remove(document, _parse(operation["from"]))
+            document = _add(document, parts, value)
+        elif op == "copy":
+            value = copy.deepcopy(_resolve(document, _parse(operation["from"])))
+            document = _add(document, parts, value)
+        elif op == "test":
+            if _resolve(document, parts) != operation["value"]:
+                raise ValueError(f"Test failed at {operation['path']!r}")
+        elif op == "append":
+            target = _resolve(document, parts)
+            del target[: operation.get("shift", 0)]
+            target.extend(operation["value"])
+        else:
+            raise ValueError(f"Unsupported patch operation {op!r}")
+    return document
@@ -0,0 +1,242 @@
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any, Literal, TypeVar
+
+from pydacharts.arrays import require_numpy
+from pydacharts.models import Data
+from pydacharts.streaming import declared_model
+
+"""
+Build `Data` from long format query rows.
+
+    rows = [("2024-01", "North", 10.5), ("2024-01", "South", 3.0), ("2024-02", "North", 12.1)]
+    data = from_rows(rows, data_class=LineData)
+
+gives one dataset per series ("North", "South"), each aligned to the labels
+("2024-01", "2024-02"), with `null` where a series has no value for a label.
+The same works from a dict of columns (`from_columns`) or from separate
+sequences / NumPy arrays (`pivot`).
+
+Grouping and aggregation are vectorized with numpy; the dataset values are
+float arrays, one row of a single (series x labels) grid each. Integer NumPy
+arrays are grouped in linear time, string arrays by sorting hashes of the
+strings, other arrays by sorting, and python sequences with a dict, so
+pre-coded NumPy columns pivot fastest.
+Requires numpy (`pip install pydacharts[numpy]`).
+"""
+
+Aggregate = Literal["sum", "mean", "min", "max", "first", "last"]
+
+DataT = TypeVar("DataT", bound=Data)
+
+
+def _first_and_codes(values: Any) -> tuple[Any, Any]:
+    """
+    The position of the first occurrence of each distinct value, in order,
+    and the index of each value into them
+    """
+    np = require_numpy()
+    uniques, inverse = np.unique(values, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    size = len(values)
+    first = np.empty(len(uniques), dtype=np.intp)
+    # Reversed, so the earliest position is the one assigned last
+    first[inverse[::-1]] = np.arange(size - 1, -1, -1)
+    order = np.argsort(first)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return first[order], rank[inverse]
+
+
+def _factorize_strings(values: Any) -> tuple[list[Any], Any] | None:
+    """
+    Factorize a string array by 64-bit hashes of its values, which sort much
+    faster than the strings; None if two distinct strings share a hash
+    """
+    np = require_numpy()
+    width = values.dtype.itemsize
+    # Hash whole 8 byte words where the strings' width allows
+    unit = np.uint64 if width % 8 == 0 else np.uint32 if width % 4 == 0 else np.uint8
+    units = np.ascontiguousarray(values).view(unit).reshape(len(values), -1)
+    # FNV-1a style, over words rather than bytes
+    hashes = np.full(len(values), 0xCBF29CE484222325, dtype=np.uint64)
+    for column in units.T:
+        hashes ^= column
+        hashes *= np.uint64(0x100000001B3)
+    first, codes = _first_and_codes(hashes)
+    uniques = values[first]
+    if not np.array_equal(uniques[codes], values):
+        return None
+    return uniques.tolist(), codes
+
+
+def factorize(values: Any) -> tuple[list[Any], Any]:
+    """
+    The distinct values in order of first appearance, and the index of each value into them
+    """
+    np = require_numpy()
+    if isinstance(values, np.ndarray):
+        values = values.reshape(-1)
+        if values.dtype.kind in "iu" and len(values):
+            low = int(values.min())
+            span = int(values.max()) - low + 1
+            # A dense range of integers doesn't need sorting: index by offset instead
+            if span <= 2 * len(values):
+                offsets = (values - low).astype(np.intp)
+                size = len(values)
+                first = np.full(span, size, dtype=np.intp)
+                # Reversed, so the earliest position is the one assigned last
+                first[offsets[::-1]] = np.arange(size - 1, -1, -1)
+                present = np.flatnonzero(first < size)
+                order = present[np.argsort(first[present], kind="stable")]
+                codes = np.full(span, -1, dtype=np.intp)
+                codes[order] = np.arange(len(order))
+                return (order + low).tolist(), codes[offsets]
+        if values.dtype.kind in "US" and len(values):
+            found = _factorize_strings(values)
+            if found is not None:
+                return found
+        first, codes = _first_and_codes(values)
+        return values[first].tolist(), codes
+    index = {value: i for i, value in enumerate(dict.fromkeys(values))}
+    codes = np.fromiter(
+        map(index.__getitem__, values), dtype=np.intp, count=len(values)
+    )
+    return list(index), codes
+
+
+def _reorder(
+    uniques: list[Any], codes: Any, order: Iterable[Any] | None, sort: bool
+) -> tuple[list[Any], Any]:
+    """
+    Put the distinct values in the given order (values not in it get code -1),
+    or sorted
+    """
+    if order is None and not sort:
+        return uniques, codes
+    np = require_numpy()
+    order = list(order) if order is not None else sorted(uniques)
+    position = {value: i for i, value in enumerate(order)}
+    remap = np.array([position.get(value, -1) for value in uniques], dtype=np.intp)
+    return order, remap[codes]
+
+
+def _grid(flat: Any, values: Any, size: int, aggregate: Aggregate) -> Any:
+    np = require_numpy()
+    if aggregate in ("first", "last"):
+        grid = np.full(size, np.nan)
+        if aggregate == "first":
+            flat, values = flat[::-1], values[::-1]
+        # With repeated indices the last assignment wins
+        grid[flat] = values
+        return grid
+    counts = np.bincount(flat, minlength=size)
+    if aggregate in ("sum", "mean"):
+        grid = np.bincount(flat, weights=values, minlength=size).astype(float)
+        if aggregate == "mean":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                grid /= counts
+    elif aggregate in ("min", "max"):
+        grid = np.full(size, np.inf if aggregate == "min" else -np.inf)
+        (np.minimum if aggregate == "min" else np.maximum).at(grid, flat, values)
+    else:
+        raise ValueError(f"Unknown aggregate {aggregate!r}")
+    grid[counts == 0] = np.nan
+    return grid
+
+
+def pivot(
+    categories: Sequence[Any],
+    series: Sequence[Any] | None,
+    values: Sequence[Any],
+    *,
+    data_class: type[DataT] = Data,  # type: ignore[assignment]
+    labels: Iterable[Any] | None = None,
+    series_order: Iterable[Any] | None = None,
+    sort: bool = False,
+    aggregate: Aggregate = "sum",
+    dataset_kwargs: Mapping[str, Any] | None = None,
+    series_kwargs: Mapping[Any, Mapping[str, Any]] | None = None,
+) -> DataT:
+    """
+    Pivot three parallel columns (the category, series and value of each row)
+    into a `data_class` instance with one dataset per series.
+
+    Labels and datasets are in order of first appearance, or `sort`ed, or in
+    the order given by `labels` / `series_order` (rows with other categories or
+    series are left out). Several rows for the same cell are combined with
+    `aggregate`; cells without a row are `null`. With `series=None` all rows
+    belong to a single dataset.
+
+    `dataset_kwargs` are passed to every dataset, `series_kwargs[name]` to the
+    dataset of series `name` (for colours and the like).
+    """
+    np = require_numpy()
+    values = np.asarray(values, dtype=float).reshape(-1)
+    if len(categories) != len(values) or (
+        series is not None and len(series) != len(values)
+    ):
+        raise ValueError("categories, series and values must have the same length")
+
+    label_values, category_codes = _reorder(*factorize(categories), labels, sort)
+    if series is None:
+        names: list[Any] = [None]
+        series_codes = np.zeros(len(values), dtype=np.intp)
+    else:
+        names, series_codes = _reorder(*factorize(series), series_order, sort)
+
+    if labels is not None or series_order is not None:
+        keep = (category_codes >= 0) & (series_codes >= 0)
+        if not keep.all():
+            category_codes = category_codes[keep]
+            series_codes = series_codes[keep]
+            values = values[keep]
+
+    width = len(label_values)
+    flat = series_codes * width + category_codes
+    grid = _grid(flat, values, len(names) * width, aggregate).reshape(len(names), width)
+
+    dataset_class = declared_model(data_class.model_fields["datasets"])[0]
+    assert dataset_class is not None
+    datasets: list[Any] = []
+    for name, row in zip(names, grid, strict=True):
+        kwargs = dict(dataset_kwargs or {})
+        if name is not None:
+            kwargs["label"] = str(name)
+            kwargs.update((series_kwargs or {}).get(name, {}))
+        datasets.append(dataset_class(data=row, **kwargs))
+    return data_class(labels=[str(label) for label in label_values], datasets=datasets)
+
+
+def from_rows(rows: Iterable[Sequence[Any]], **kwargs: Any) -> Any:
+    """
+    Pivot `(category, series, value)` rows, or `(category, value)` rows for a
+    single dataset. Takes the same keyword arguments as `pivot`.
+    """
+    rows = rows if isinstance(rows, Sequence) else list(rows)
+    width = len(rows[0]) if rows else 3
+    if width not in (2, 3):
+        raise ValueError(f"Rows must have 2 or 3 columns, not {width}")
+    columns = [[row[i] for row in rows] for i in range(width)]
+    if width == 2:
+        return pivot(columns[0], None, columns[1], **kwargs)
+    return pivot(*columns, **kwargs)
+
+
+def from_columns(
+    columns: Mapping[str, Sequence[Any]],
+    category: str,
+    value: str,
+    series: str | None = None,
+    **kwargs: Any,
+) -> Any:
+    """
+    Pivot a dict of equal length columns (lists or NumPy arrays), naming the
+    category, value and (optionally) series columns.
+    Takes the same keyword arguments as `pivot`.
+    """
+    return pivot(
+        columns[category],
+        columns[series] if series is not None else None,
+        columns[value],
+        **kwargs,
+    )
@@ -0,0 +1,11 @@
+import importlib
+from types import ModuleType
+
+# Plugin modules are only imported when they are first used
+__all__ = ["datalabels", "doughnutlabel", "sankey"]
+
+
+def __getattr__(name: str) -> ModuleType:
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
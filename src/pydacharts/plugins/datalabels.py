@@ -1,9 +1,10 @@
 from enum import Enum
 from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import Field
 
-from pydacharts.chartjs_types import Color, Font, Function, Padding, number
+from pydacharts.base import ChartModel
+from pydacharts.chartjs_types import Color, Font, Function, Indexable, Padding, number
 
 """
 https://chartjs-plugin-datalabels.netlify.app/guide/options.html
@@ -16,7 +17,7 @@ or globally: Chart.defaults.plugins.datalabels.*
 """
 
 
-class Label(BaseModel):
+class Label(ChartModel):
     """
     Represents a DataLabels Label instance
     """
@@ -73,16 +74,16 @@ align_values = Literal[
 degrees = int
 
 
-class DataLabelsPlugin(BaseModel):
+class DataLabelsPlugin(ChartModel):
     align: align_values | degrees | None = None
     anchor: str | None = "center"
-    backgroundColor: DataLabelsPluginStyle | None = None
-    borderColor: DataLabelsPluginStyle | None = None
-    borderRadius: number | None = None
-    borderWidth: number | None = None
+    backgroundColor: Indexable[DataLabelsPluginStyle] | None = None
+    borderColor: Indexable[DataLabelsPluginStyle] | None = None
+    borderRadius: Indexable[number] | None = None
+    borderWidth: Indexable[number] | None = None
     clamp: bool | None = None
     clip: bool | None = None
-    color: DataLabelsPluginStyle | None = None
+    color: Indexable[DataLabelsPluginStyle] | None = None
     display: Function | Literal[True, False, "auto"] | None = Field(
         True, description="controls the visibility of labels"
     )
@@ -90,18 +91,18 @@ class DataLabelsPlugin(BaseModel):
     formatter: Function | None = None
     labels: object | None = None
     listeners: object | None = None
-    offset: number | None = Field(
+    offset: Indexable[number] | None = Field(
         4,
         description="The offset represents the distance (in pixels) to pull the label away from the anchor point. This option is not applicable when align is 'center'. Also note that if align is 'start', the label is moved in the opposite direction. The default value is 4.",
     )
-    opacity: number | None = None
+    opacity: Indexable[number] | None = None
     padding: Padding | None = None
-    rotation: degrees | None = None
+    rotation: Indexable[degrees] | None = None
     textAlign: str | None = None
-    textStrokeColor: DataLabelsPluginStyle | None = None
-    textStrokeWidth: number | None = None
-    textShadowBlur: number | None = None
-    textShadowColor: Color | None = None
+    textStrokeColor: Indexable[DataLabelsPluginStyle] | None = None
+    textStrokeWidth: Indexable[number] | None = None
+    textShadowBlur: Indexable[number] | None = None
+    textShadowColor: Indexable[Color] | None = None
 
 
 if __name__ == "__main__":
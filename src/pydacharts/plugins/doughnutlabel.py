@@ -1,13 +1,12 @@
-from pydantic import BaseModel
-
+from pydacharts.base import ChartModel
 from pydacharts.models import Font, RgbStr
 
 
-class Label(BaseModel):
+class Label(ChartModel):
     text: str
     font: Font | None
     color: RgbStr | None
 
 
-class DoughnutLabel(BaseModel):
+class DoughnutLabel(ChartModel):
     labels: list[Label]
@@ -1,22 +1,47 @@
-from pydantic import BaseModel
+from collections.abc import Mapping, Sequence
+from typing import Any
 
-from pydacharts.models import Config
+from pydantic import AliasChoices, Field
 
+from pydacharts.arrays import require_numpy
+from pydacharts.base import ChartModel
+from pydacharts.chartjs_types import number
+from pydacharts.models import CONFIG_CLASSES, ChartType, Config
+from pydacharts.pivot import factorize
 
-class SankeyDatasetData(BaseModel):
-    from_: str
+"""
+Models for the chartjs-chart-sankey plugin.
+
+`from_edges` builds a dataset from edge columns, for instance straight from
+query results:
+
+    dataset = from_edges(rows["from"], rows["to"], rows["amount"], top=10)
+    Sankey(data=SankeyData(datasets=[dataset]))
+
+Duplicate (from, to) pairs are summed, and flows below `min_flow`, or beyond
+the `top` largest out of each node, are folded into a single edge from that
+node to an "Other" node, so that the chart stays readable. Grouping is
+vectorized with numpy (`pip install pydacharts[numpy]`).
+"""
+
+
+class SankeyDatasetData(ChartModel):
+    # "from" is a Python keyword
+    from_: str = Field(
+        serialization_alias="from", validation_alias=AliasChoices("from", "from_")
+    )
     to: str
-    flow: int
+    flow: number
 
 
-class SankeyDataSet(BaseModel):
+class SankeyDataSet(ChartModel):
     data: list[SankeyDatasetData]
     colorMode: str = "gradient"
-    labels: dict[str, str] | None
-    priority: dict[str, int] | None
+    labels: dict[str, str] | None = None
+    priority: dict[str, int] | None = None
 
 
-class SankeyData(BaseModel):
+class SankeyData(ChartModel):
     datasets: list[SankeyDataSet]
 
 
@@ -24,10 +49,257 @@ class Sankey(Config):
     type: str = "sankey"
     data: SankeyData  # type: ignore
 
-    def model_dump_json(self, *args, **kwargs):
-        """
-        Hack to make python -> json keyword conversion
-        """
-        data = super().model_dump_json(*args, **kwargs)
-        data = data.replace('"from_":', '"from":')
-        return data
+
+CONFIG_CLASSES[ChartType.sankey.value] = Sankey
+
+
+def _aggregate(sources: Any, targets: Any, flows: Any, size: int) -> tuple[Any, ...]:
+    """
+    Sum the flows of duplicate (source, target) code pairs
+    """
+    np = require_numpy()
+    keys, inverse = np.unique(sources * size + targets, return_inverse=True)
+    return keys // size, keys % size, np.bincount(inverse.reshape(-1), weights=flows)
+
+
+def _top(sources: Any, flows: Any, top: int, size: int) -> Any:
+    """
+    Whether each edge is among the `top` largest out of its source
+    """
+    np = require_numpy()
+    order = np.argsort(-flows)
+    codes = sources[order]
+    if size <= 2**16:
+        # numpy sorts 16 bit integers stably in linear time
+        codes = codes.astype(np.uint16)
+    order = order[np.argsort(codes, kind="stable")]
+    ordered = sources[order]
+    starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])
+    rank = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+    keep = np.empty(len(order), dtype=bool)
+    keep[order] = rank < top
+    return keep
+
+
+def from_edges(
+    sources: Sequence[Any],
+    targets: Sequence[Any],
+    flows: Sequence[Any] | None = None,
+    *,
+    labels: Mapping[str, str] | None = None,
+    min_flow: float | None = None,
+    top: int | None = None,
+    other: str = "Other",
+    **dataset_kwargs: Any,
+) -> SankeyDataSet:
+    """
+    A `SankeyDataSet` from parallel edge columns (sequences or NumPy arrays):
+    the source and target node of each row and its flow (1 per row if not
+    given). Duplicate pairs are summed.
+
+    Flows under `min_flow`, and all but the `top` largest flows out of each
+    node, are folded into one edge from the node to the `other` node.
+    `labels` (node to label) is filtered down to the nodes in the chart.
+    Other keyword arguments are passed to `SankeyDataSet`.
+    """
+    np = require_numpy()
+    count = len(sources)
+    if len(targets) != count or (flows is not None and len(flows) != count):
+        raise ValueError("sources, targets and flows must have the same length")
+    if top is not None and top < 1:
+        raise ValueError("top must be at least 1")
+    if isinstance(sources, np.ndarray) and isinstance(targets, np.ndarray):
+        both: Any = np.concatenate([sources.reshape(-1), targets.reshape(-1)])
+    else:
+        both = [*sources, *targets]
+    nodes, codes = factorize(both)
+    names = [str(node) for node in nodes]
+    values = np.ones(count) if flows is None else np.asarray(flows).reshape(-1)
+    integral = values.dtype.kind in "iub"
+
+    size = len(names) + 1
+    edge_sources, edge_targets, edge_flows = _aggregate(
+        codes[:count], codes[count:], values.astype(float), size
+    )
+    keep = np.ones(len(edge_flows), dtype=bool)
+    if min_flow is not None:
+        keep &= edge_flows >= min_flow
+    if top is not None:
+        keep &= _top(edge_sources, edge_flows, top, size)
+    if not keep.all():
+        if other in names:
+            other_code = names.index(other)
+        else:
+            other_code = len(names)
+            names.append(other)
+        folded = edge_sources[~keep]
+        edge_sources, edge_targets, edge_flows = _aggregate(
+            np.concatenate([edge_sources[keep], folded]),
+            np.concatenate(
+                [edge_targets[keep], np.full(len(folded), other_code, dtype=np.intp)]
+            ),
+            np.concatenate([edge_flows[keep], edge_flows[~keep]]),
+            size,
+        )
+
+    flow_values = (edge_flows.astype(np.int64) if integral else edge_flows).tolist()
+    # Validating plain dicts in one go is faster than building each model in Python
+    data = [
+        {"from": names[source], "to": names[target], "flow": flow}
+        for source, target, flow in zip(
+            edge_sources.tolist(), edge_targets.tolist(), flow_values, strict=True
+        )
+    ]
+    if labels is not None:
+        used = set(edge_sources.tolist()) | set(edge_targets.tolist())
+        labels = {
+            names[code]: labels.get(names[code], names[code]) for code in sorted(used)
+        }
+    dataset_kwargs.setdefault("priority", None)
+    return SankeyDataSet(data=data, labels=labels, **dataset_kwargs)  # type: ignore[arg-type]
+
+
+def _acyclic(count: int, sources: Any, targets: Any, flows: Any) -> tuple[Any, Any]:
+    """
+    Depth first search taking the largest flows first: the edges which are
+    not back edges (the ones which would close a cycle), and the nodes in
+    topological order of the remaining graph
+    """
+    np = require_numpy()
+    order = np.lexsort((-flows, sources))
+    starts = np.searchsorted(sources[order], np.arange(count + 1)).tolist()
+    children = targets[order].tolist()
+    incoming = np.bincount(targets, minlength=count)
+    # Start from the nodes without incoming edges, so that cycles are broken
+    # at the edge closing them rather than anywhere on them
+    roots = np.r_[np.flatnonzero(incoming == 0), np.flatnonzero(incoming)].tolist()
+
+    kept = [True] * len(children)
+    state = [0] * count  # 0 unvisited, 1 on the stack, 2 done
+    following = starts[:-1]
+    finished: list[int] = []
+    for root in roots:
+        if state[root]:
+            continue
+        state[root] = 1
+        stack = [root]
+        while stack:
+            node = stack[-1]
+            edge = following[node]
+            if edge == starts[node + 1]:
+                state[node] = 2
+                finished.append(stack.pop())
+                continue
+            following[node] = edge + 1
+            child = children[edge]
+            if state[child] == 1:
+                kept[edge] = False
+            elif not state[child]:
+                state[child] = 1
+                stack.append(child)
+    keep = np.empty(len(order), dtype=bool)
+    keep[order] = kept
+    return keep, np.array(finished[::-1], dtype=np.intp)
+
+
+def _columns(count: int, sources: Any, targets: Any, topological: Any) -> Any:
+    """
+    The longest path to each node from a node without incoming edges, with
+    the nodes without outgoing edges in the last column, as the sankey
+    plugin places them
+    """
+    np = require_numpy()
+    rank = np.empty(count, dtype=np.intp)
+    rank[topological] = np.arange(count)
+    order = np.argsort(rank[sources], kind="stable")
+    edge_sources, edge_targets = sources[order].tolist(), targets[order].tolist()
+    column = [0] * count
+    for source, target in zip(edge_sources, edge_targets, strict=True):
+        if column[target] <= column[source]:
+            column[target] = column[source] + 1
+    columns = np.array(column, dtype=np.intp)
+    if count:
+        sinks = np.bincount(sources, minlength=count) == 0
+        columns[sinks] = columns.max()
+    return columns
+
+
+def _order(columns: Any, sources: Any, targets: Any, flows: Any, sweeps: int) -> Any:
+    """
+    The position of each node within its column (0 to 1), after sweeps of
+    the barycenter heuristic: placing each node at the flow weighted mean
+    position of its neighbours in the previous columns, then the next ones
+    """
+    np = require_numpy()
+    count = len(columns)
+    width = int(columns.max()) + 1 if count else 0
+    by_column = np.argsort(columns, kind="stable")
+    bounds = np.searchsorted(columns[by_column], np.arange(width + 1))
+    local = np.empty(count, dtype=np.intp)
+    for column in range(width):
+        nodes = by_column[bounds[column] : bounds[column + 1]]
+        local[nodes] = np.arange(len(nodes))
+    position = np.empty(count)
+    for column in range(width):
+        nodes = by_column[bounds[column] : bounds[column + 1]]
+        position[nodes] = (np.arange(len(nodes)) + 0.5) / len(nodes)
+
+    # Edges grouped by the column of their target, then of their source
+    sides = []
+    for near, far in ((targets, sources), (sources, targets)):
+        order = np.argsort(columns[near], kind="stable")
+        edge_bounds = np.searchsorted(columns[near][order], np.arange(width + 1))
+        sides.append((near[order], far[order], flows[order], edge_bounds))
+
+    for sweep in range(sweeps):
+        near, far, weights, edge_bounds = sides[sweep % 2]
+        # Down the columns, then back up
+        sequence = range(1, width) if sweep % 2 == 0 else range(width - 2, -1, -1)
+        for column in sequence:
+            nodes = by_column[bounds[column] : bounds[column + 1]]
+            edges = slice(edge_bounds[column], edge_bounds[column + 1])
+            if len(nodes) < 2 or edges.start == edges.stop:
+                continue
+            at = local[near[edges]]
+            total = np.bincount(at, weights=weights[edges], minlength=len(nodes))
+            moments = np.bincount(
+                at, weights=weights[edges] * position[far[edges]], minlength=len(nodes)
+            )
+            current = position[nodes]
+            # Nodes without neighbours on this side keep their place
+            center = np.divide(moments, total, out=current.copy(), where=total > 0)
+            ranked = nodes[np.lexsort((current, center))]
+            position[ranked] = (np.arange(len(nodes)) + 0.5) / len(nodes)
+    return position
+
+
+def layout(dataset: SankeyDataSet, *, sweeps: int = 8) -> SankeyDataSet:
+    """
+    A copy of `dataset` with `priority` set from a layout of its nodes, so
+    the sankey plugin doesn't compute its own in the browser.
+
+    Nodes are placed in columns by their longest path from a node without
+    incoming edges (the plugin's own columns); cycles are broken at the
+    edges closing them. Within each column, nodes are ordered to reduce
+    crossings by `sweeps` passes of the barycenter heuristic, and
+    `priority` numbers nodes top to bottom, column by column.
+    """
+    np = require_numpy()
+    if sweeps < 0:
+        raise ValueError("sweeps must not be negative")
+    edges = dataset.data
+    nodes, codes = factorize(
+        [edge.from_ for edge in edges] + [edge.to for edge in edges]
+    )
+    count = len(nodes)
+    codes = np.asarray(codes, dtype=np.intp)
+    sources, targets = codes[: len(edges)], codes[len(edges) :]
+    flows = np.array([edge.flow for edge in edges], dtype=float)
+
+    keep, topological = _acyclic(count, sources, targets, flows)
+    sources, targets, flows = sources[keep], targets[keep], flows[keep]
+    columns = _columns(count, sources, targets, topological)
+    position = _order(columns, sources, targets, flows, sweeps)
+    ranked = np.lexsort((position, columns)).tolist()
+    priority = {str(nodes[node]): rank for rank, node in enumerate(ranked)}
+    return dataset.model_copy(update={"priority": priority})
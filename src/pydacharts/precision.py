@@ -0,0 +1,168 @@
+import math
+import sys
+from dataclasses import dataclass
+from typing import Any
+
+"""
+Rounding of numbers when charts are serialized.
+
+Dataset values like `1596.973970000001` cost bytes without adding anything a
+chart can show. A `Precision` passed in the serialization context rounds every
+dataset's data, and every option typed as a number (such as scale bounds), to
+a number of significant digits or of decimals, and writes whole numbers
+without a trailing `.0`:
+
+    config.model_dump_json(exclude_none=True, context=Precision(significant=4).context)
+
+`Dataset.precision` overrides the context for one dataset. Dataset values are
+rounded as arrays with numpy when it is installed (one vectorized pass, no
+per-value formatting), one value at a time otherwise.
+"""
+
+# The serialization context key holding the `Precision`
+CONTEXT_KEY = "precision"
+
+# Floats up to this size are exact integers
+_MAX_EXACT = 2**53
+
+
+def _numpy() -> Any:
+    numpy = sys.modules.get("numpy")
+    if numpy is None:
+        try:
+            import numpy
+        except ImportError:  # pragma: no cover
+            return None
+    return numpy
+
+
+@dataclass(frozen=True)
+class Precision:
+    """
+    Round to `significant` digits or to `decimals` places (not both), and with
+    `integers` write whole numbers as integers
+    """
+
+    significant: int | None = None
+    decimals: int | None = None
+    integers: bool = True
+
+    def __post_init__(self) -> None:
+        if self.significant is not None and self.decimals is not None:
+            raise ValueError("Give either significant digits or decimals, not both")
+        if self.significant is not None and self.significant < 1:
+            raise ValueError("There must be at least one significant digit")
+
+    @property
+    def context(self) -> dict[str, "Precision"]:
+        """
+        A serialization context applying this precision
+        """
+        return {CONTEXT_KEY: self}
+
+    def round_number(self, value: Any) -> Any:
+        """
+        Round a single number (ints and non-numbers are returned unchanged)
+        """
+        if not isinstance(value, float) or not math.isfinite(value):
+            return value
+        if self.decimals is not None:
+            value = round(value, self.decimals)
+        elif self.significant is not None and value:
+            value = float(f"{value:.{self.significant}g}")
+        if self.integers and value.is_integer() and abs(value) < _MAX_EXACT:
+            return int(value)
+        return value
+
+    def round_array(self, values: Any) -> Any:
+        """
+        Round numeric values to a float ndarray, or return them unchanged if
+        they aren't numeric (or numpy isn't installed)
+        """
+        np = _numpy()
+        if np is None:
+            return values
+        try:
+            array = np.asarray(values)
+        except ValueError:
+            # Ragged nested lists
+            return values
+        if array.dtype.kind in "iub":
+            return array
+        if array.dtype.kind == "O":
+            try:
+                array = array.astype(float)
+            except (TypeError, ValueError):
+                return values
+        elif array.dtype.kind != "f":
+            return values
+        if self.decimals is not None:
+            return np.round(array, self.decimals)
+        if self.significant is None:
+            return array
+        with np.errstate(divide="ignore", invalid="ignore"):
+            exponent = self.significant - 1 - np.floor(np.log10(np.abs(array)))
+        exponent = np.where(np.isfinite(exponent), exponent, 0)
+        # Scale by exact powers of ten, so the result is the closest float to the rounded decimal
+        scale = 10.0 ** np.abs(exponent)
+        with np.errstate(over="ignore", invalid="ignore"):
+            return np.where(
+                exponent >= 0,
+                np.round(array * scale) / scale,
+                np.round(array / scale) * scale,
+            )
+
+    def to_json(self, values: Any) -> Any:
+        """
+        Rounded values ready for JSON: a list with whole numbers as ints
+        """
+        if isinstance(values, list | tuple) and values and isinstance(values[0], dict):
+            return self._points_to_json(values)
+        np = _numpy()
+        if np is None:
+            if isinstance(values, list | tuple):
+                return [self.round_number(v) for v in values]
+            return values.tolist() if hasattr(values, "tolist") else values
+        array = self.round_array(values)
+        if not isinstance(array, np.ndarray):
+            return values.tolist() if hasattr(values, "tolist") else values
+        if not self.integers or array.dtype.kind != "f":
+            return array.tolist()
+        integral = (
+            np.isfinite(array)
+            & (array == np.trunc(array))
+            & (np.abs(array) < _MAX_EXACT)
+        )
+        if integral.all():
+            return array.astype(np.int64).tolist()
+        if not integral.any():
+            return array.tolist()
+        mixed = array.astype(object)
+        mixed[integral] = array[integral].astype(np.int64).tolist()
+        return mixed.tolist()
+
+    def _points_to_json(self, points: Any) -> list[Any]:
+        """
+        `{x, y}` points rounded one key at a time, as arrays, when they all
+        have the same keys
+        """
+        keys = points[0].keys()
+        if not all(
+            isinstance(point, dict) and point.keys() == keys for point in points
+        ):
+            return [
+                {k: self.round_number(v) for k, v in point.items()}
+                if isinstance(point, dict)
+                else point
+                for point in points
+            ]
+        columns = [self.to_json([point[key] for point in points]) for key in keys]
+        return [dict(zip(keys, row, strict=True)) for row in zip(*columns, strict=True)]
+
+
+def from_context(context: Any) -> Precision | None:
+    if isinstance(context, dict):
+        precision = context.get(CONTEXT_KEY)
+        if isinstance(precision, Precision):
+            return precision
+    return None
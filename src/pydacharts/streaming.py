@@ -0,0 +1,283 @@
+import typing
+from collections.abc import Iterator, Sequence
+from typing import IO, Any
+
+from pydantic import BaseModel, SerializeAsAny, TypeAdapter
+from pydantic.fields import FieldInfo
+
+from pydacharts.arrays import is_buffer
+from pydacharts.precision import CONTEXT_KEY, Precision
+
+"""
+Chunked JSON serialization.
+
+`iter_json` walks Config -> Data -> datasets -> data and yields the JSON
+payload in pieces, so a large chart can be written to a socket or file while
+it is still being serialized. Everything except the walked containers and the
+data arrays is serialized by pydantic exactly as `model_dump_json` would, and
+the joined chunks are identical to `model_dump_json(exclude_none=True)`:
+
+    StreamingResponse(iter_json(config), media_type="application/json")
+"""
+
+# Fields which are walked instead of being serialized in one go
+STREAMED_FIELDS = frozenset({"data", "datasets", "labels"})
+
+# Number of items in each serialized slice of a data array
+DEFAULT_CHUNK_ITEMS = 10_000
+
+# Small pieces are buffered until there are at least this many bytes to yield
+DEFAULT_CHUNK_BYTES = 64 * 1024
+
+_UnionType = type(int | None)
+
+_adapters: dict[tuple[type[BaseModel], str], TypeAdapter] = {}
+
+
+def field_adapter(cls: type[BaseModel], name: str) -> TypeAdapter:
+    """
+    A TypeAdapter matching the annotation of `cls.name`, so that slices of an
+    array serialize the same way the whole field would
+    """
+    key = (cls, name)
+    if key not in _adapters:
+        field = cls.model_fields[name]
+        annotation: Any = field.annotation
+        if field.metadata:
+            annotation = typing.Annotated[(annotation, *field.metadata)]
+        _adapters[key] = TypeAdapter(annotation)
+    return _adapters[key]
+
+
+def _is_serialize_as_any(metadata: Any) -> bool:
+    return isinstance(metadata, SerializeAsAny)  # type: ignore[misc]
+
+
+def _unwrapped(annotation: Any) -> Any:
+    while typing.get_origin(annotation) is typing.Annotated:
+        annotation = typing.get_args(annotation)[0]
+    return annotation
+
+
+def declared_model(field: FieldInfo) -> tuple[type[BaseModel] | None, bool]:
+    """
+    Return the model class a field is declared with (looking through `| None`,
+    unions of a model and its subclasses and `Sequence[...]`) and whether the field serializes as the runtime type.
+    Pydantic serializes subclass instances with the declared class unless the
+    annotation is wrapped in `SerializeAsAny`.
+    """
+    annotation: Any = field.annotation
+    as_any = any(_is_serialize_as_any(m) for m in field.metadata)
+    while True:
+        origin = typing.get_origin(annotation)
+        if origin is typing.Annotated:
+            as_any = as_any or any(
+                _is_serialize_as_any(m) for m in annotation.__metadata__
+            )
+            annotation = typing.get_args(annotation)[0]
+            continue
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        if origin in (typing.Union, _UnionType) and len(args) == 1:
+            annotation = args[0]
+            continue
+        if origin in (typing.Union, _UnionType) and args:
+            # A union of a model and its subclasses, such as the datasets'
+            classes = [_unwrapped(arg) for arg in args]
+            base = classes[0]
+            if isinstance(base, type) and issubclass(base, BaseModel):
+                if all(isinstance(c, type) and issubclass(c, base) for c in classes):
+                    annotation = base
+                    continue
+        if origin in (list, Sequence) and len(args) == 1:
+            annotation = args[0]
+            continue
+        break
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, as_any
+    return None, as_any
+
+
+def walkable(cls: type[BaseModel]) -> bool:
+    # A custom model serializer decides its own layout, so it can't be walked field by field
+    return not cls.__pydantic_decorators__.model_serializers
+
+
+def has_streamed_fields(cls: type[BaseModel]) -> bool:
+    return walkable(cls) and not STREAMED_FIELDS.isdisjoint(cls.model_fields)
+
+
+class _Walker:
+    def __init__(self, exclude_none: bool, chunk_items: int, context: Any = None):
+        self.exclude_none = exclude_none
+        self.chunk_items = chunk_items
+        self.context = context
+
+    def model(self, value: BaseModel, cls: type[BaseModel]) -> Iterator[bytes]:
+        if not walkable(cls):
+            yield cls.__pydantic_serializer__.to_json(
+                value,
+                exclude_none=self.exclude_none,
+                by_alias=True,
+                context=self.context,
+            )
+            return
+
+        yield b"{"
+        separator = b""
+        pending: list[str] = []
+        for name, field in cls.model_fields.items():
+            if field.exclude:
+                continue
+            item = getattr(value, name)
+            if name in STREAMED_FIELDS and item is not None:
+                if pending:
+                    body = self._fields(value, cls, pending)
+                    pending = []
+                    if body:
+                        yield separator + body
+                        separator = b","
+                key = field.serialization_alias or name
+                yield separator + b'"' + key.encode() + b'":'
+                separator = b","
+                yield from self.field(value, cls, name, field, item)
+            else:
+                pending.append(name)
+        if pending:
+            body = self._fields(value, cls, pending)
+            if body:
+                yield separator + body
+        yield b"}"
+
+    def _fields(
+        self, value: BaseModel, cls: type[BaseModel], names: list[str]
+    ) -> bytes:
+        """
+        Serialize a run of fields with the model's own serializer, minus the braces
+        """
+        return cls.__pydantic_serializer__.to_json(
+            value,
+            include=set(names),
+            exclude_none=self.exclude_none,
+            by_alias=True,
+            context=self.context,
+        )[1:-1]
+
+    def field(
+        self,
+        parent: BaseModel,
+        parent_cls: type[BaseModel],
+        name: str,
+        field: FieldInfo,
+        item: Any,
+    ) -> Iterator[bytes]:
+        model_cls, as_any = declared_model(field)
+        if isinstance(item, BaseModel) and model_cls is not None:
+            yield from self.model(item, type(item) if as_any else model_cls)
+        elif (
+            model_cls is not None
+            and isinstance(item, list | tuple)
+            and has_streamed_fields(model_cls)
+            and all(isinstance(i, BaseModel) for i in item)
+        ):
+            yield b"["
+            for index, element in enumerate(item):
+                if index:
+                    yield b","
+                yield from self.model(element, type(element) if as_any else model_cls)
+            yield b"]"
+        else:
+            yield from self.array(parent_cls, name, item, self._context(parent, name))
+
+    def _context(self, parent: BaseModel, name: str) -> Any:
+        # `Dataset.precision` applies to the dataset's data (see `Dataset._serialize_data`)
+        precision = getattr(parent, "precision", None)
+        if name == "data" and isinstance(precision, Precision):
+            return {**(self.context or {}), CONTEXT_KEY: precision}
+        return self.context
+
+    def array(
+        self, cls: type[BaseModel], name: str, item: Any, context: Any
+    ) -> Iterator[bytes]:
+        adapter = field_adapter(cls, name)
+        if isinstance(item, memoryview):
+            sliceable = item.ndim == 1
+        else:
+            sliceable = isinstance(item, list | tuple) or is_buffer(item)
+        if not sliceable or len(item) <= self.chunk_items:
+            yield adapter.dump_json(
+                item, exclude_none=self.exclude_none, by_alias=True, context=context
+            )
+            return
+        yield b"["
+        for start in range(0, len(item), self.chunk_items):
+            chunk = adapter.dump_json(
+                item[start : start + self.chunk_items],
+                exclude_none=self.exclude_none,
+                by_alias=True,
+                context=context,
+            )
+            yield (b"," if start else b"") + chunk[1:-1]
+        yield b"]"
+
+
+def _coalesce(pieces: Iterator[bytes], chunk_bytes: int) -> Iterator[bytes]:
+    buffer: list[bytes] = []
+    size = 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_bytes:
+            yield b"".join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def iter_json(
+    model: BaseModel,
+    *,
+    exclude_none: bool = True,
+    chunk_items: int = DEFAULT_CHUNK_ITEMS,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    context: Any = None,
+) -> Iterator[bytes]:
+    """
+    Yield the JSON for `model` in chunks of roughly `chunk_bytes` bytes.
+    Data arrays are serialized `chunk_items` values at a time.
+
+    `b"".join(iter_json(config))` equals `config.model_dump_json(exclude_none=True).encode()`,
+    and with a serialization `context` (such as a `Precision`), the same as passing
+    it to `model_dump_json`.
+    The generator is synchronous, so Starlette runs it in a worker thread when it
+    is passed to a `StreamingResponse`.
+    """
+    walker = _Walker(
+        exclude_none=exclude_none, chunk_items=chunk_items, context=context
+    )
+    return _coalesce(walker.model(model, type(model)), chunk_bytes)
+
+
+def write_json(
+    model: BaseModel,
+    fp: IO[bytes],
+    *,
+    exclude_none: bool = True,
+    chunk_items: int = DEFAULT_CHUNK_ITEMS,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    context: Any = None,
+) -> int:
+    """
+    Write the JSON for `model` to a binary file-like object, returning the number of bytes written
+    """
+    written = 0
+    for chunk in iter_json(
+        model,
+        exclude_none=exclude_none,
+        chunk_items=chunk_items,
+        chunk_bytes=chunk_bytes,
+        context=context,
+    ):
+        fp.write(chunk)
+        written += len(chunk)
+    return written
@@ -0,0 +1,276 @@
+import copy
+import os
+import typing
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, TypeVar
+
+from pydantic import AliasChoices, BaseModel, Discriminator, Tag
+
+"""
+Trusted construction of chart models, skipping validation.
+
+For bulk chart building from data which is already of the right types:
+
+    from pydacharts.trusted import construct
+
+    dataset = construct(LineDataSet, label="Sales", data=values)
+    config = construct(Config, type=ChartType.line, data=construct(LineData, labels=labels, datasets=[dataset]))
+
+`construct` is built on `model_construct`: class defaults (such as
+`LineDataSet.tension`) are applied and nested dicts are turned into the model
+their field is declared with, but values are neither checked nor coerced. Given
+correctly typed values the serialized output is identical to that of the
+validated constructors.
+
+Set `PYDACHARTS_VALIDATE_TRUSTED=1`, or use `with validation():`, to route every
+`construct` call through normal validation (for instance in tests).
+"""
+
+M = TypeVar("M", bound=BaseModel)
+
+_validate: ContextVar[bool] = ContextVar(
+    "pydacharts_validate_trusted",
+    default=os.environ.get("PYDACHARTS_VALIDATE_TRUSTED", "") not in ("", "0"),
+)
+
+_UnionType = type(int | None)
+
+# Defaults of these types can be shared between instances instead of copied
+_IMMUTABLE = (type(None), bool, int, float, str, bytes, tuple, frozenset, Enum)
+
+_MISSING = object()
+
+# A callable discriminator and the model class for each of its tags
+_Tagger = tuple[Callable[[Any], Any], dict[str, type[BaseModel]]]
+
+
+@dataclass
+class _Plan:
+    """
+    What `construct` needs to know about a model class, worked out once per class
+    """
+
+    names: frozenset[str]
+    # Every field in declaration order (pydantic serializes in `__dict__` order),
+    # with its default or `_MISSING` for required fields and defaults which are copied
+    template: dict[str, Any]
+    copied_defaults: dict[str, Any]
+    required: frozenset[str]
+    # alias (or validation alias) -> field name
+    aliases: dict[str, str]
+    # field name -> (model classes for a single value, model classes for list items)
+    nested: dict[str, tuple[list[type[BaseModel]], list[type[BaseModel]]]]
+    # field name -> (discriminator of a single value, discriminator of list items)
+    tagged: dict[str, tuple[_Tagger | None, _Tagger | None]]
+    # Classes with private attributes or a post-init hook go through `model_construct`
+    simple: bool
+
+
+_plans: dict[type[BaseModel], _Plan] = {}
+
+
+def validation_enabled() -> bool:
+    return _validate.get()
+
+
+def set_validation(enabled: bool) -> None:
+    """
+    Switch validation of trusted construction on or off for the current context
+    """
+    _validate.set(enabled)
+
+
+@contextmanager
+def validation(enabled: bool = True) -> Iterator[None]:
+    """
+    Validate (or not) every `construct` call made inside the block
+    """
+    token = _validate.set(enabled)
+    try:
+        yield
+    finally:
+        _validate.reset(token)
+
+
+def _models_in(annotation: Any) -> tuple[list[type[BaseModel]], list[type[BaseModel]]]:
+    origin = typing.get_origin(annotation)
+    if origin is typing.Annotated:
+        return _models_in(typing.get_args(annotation)[0])
+    if origin in (typing.Union, _UnionType):
+        single: list[type[BaseModel]] = []
+        items: list[type[BaseModel]] = []
+        for arg in typing.get_args(annotation):
+            arg_single, arg_items = _models_in(arg)
+            single += arg_single
+            items += arg_items
+        return single, items
+    if origin in (list, Sequence):
+        args = typing.get_args(annotation)
+        return [], _models_in(args[0])[0] if args else []
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return [annotation], []
+    return [], []
+
+
+def _tagged(annotation: Any) -> tuple[_Tagger | None, _Tagger | None]:
+    """
+    The callable discriminators of a union of models, as `_models_in` finds the models
+    """
+    origin = typing.get_origin(annotation)
+    if origin is typing.Annotated:
+        inner, *metadata = typing.get_args(annotation)
+        for discriminator in metadata:
+            if isinstance(discriminator, Discriminator) and callable(
+                discriminator.discriminator
+            ):
+                tags: dict[str, type[BaseModel]] = {}
+                for member in typing.get_args(inner):
+                    if typing.get_origin(member) is not typing.Annotated:
+                        continue
+                    model, *member_metadata = typing.get_args(member)
+                    models = _models_in(model)[0]
+                    for tag in member_metadata:
+                        if isinstance(tag, Tag) and models:
+                            tags[tag.tag] = models[0]
+                return (discriminator.discriminator, tags), None
+        return _tagged(inner)
+    if origin in (typing.Union, _UnionType):
+        for arg in typing.get_args(annotation):
+            single, items = _tagged(arg)
+            if single or items:
+                return single, items
+        return None, None
+    if origin in (list, Sequence):
+        args = typing.get_args(annotation)
+        return None, _tagged(args[0])[0] if args else None
+    return None, None
+
+
+def _plan(cls: type[BaseModel]) -> _Plan:
+    plan = _plans.get(cls)
+    if plan is None:
+        # Models build their schema when first validated. Instances made here
+        # never are, and a parent serializing them as their own class (with
+        # `SerializeAsAny`) needs the schema to exist already.
+        cls.model_rebuild()
+        plan = _Plan(
+            names=frozenset(cls.model_fields),
+            template={},
+            copied_defaults={},
+            required=frozenset(
+                name for name, field in cls.model_fields.items() if field.is_required()
+            ),
+            aliases={},
+            nested={},
+            tagged={},
+            simple=not cls.__private_attributes__
+            and cls.model_post_init is BaseModel.model_post_init,
+        )
+        for name, field in cls.model_fields.items():
+            plan.template[name] = _MISSING
+            if field.default_factory is not None:
+                plan.simple = False
+            elif isinstance(field.default, _IMMUTABLE):
+                plan.template[name] = field.default
+            elif not field.is_required():
+                plan.copied_defaults[name] = field.default
+            if field.alias:
+                plan.aliases[field.alias] = name
+            validation_alias = field.validation_alias
+            choices = (
+                validation_alias.choices
+                if isinstance(validation_alias, AliasChoices)
+                else [validation_alias]
+            )
+            for alias in choices:
+                if isinstance(alias, str):
+                    plan.aliases.setdefault(alias, name)
+                elif alias is not None:
+                    # Alias paths are left to `model_construct`
+                    plan.simple = False
+            single, items = _models_in(field.annotation)
+            if single or items:
+                plan.nested[name] = (single, items)
+                plan.tagged[name] = _tagged(field.annotation)
+        _plans[cls] = plan
+    return plan
+
+
+def _choose(
+    candidates: list[type[BaseModel]], value: dict, tagger: _Tagger | None = None
+) -> type[BaseModel]:
+    """
+    The model the union's discriminator picks for the dict, or else the first
+    model declaring all of its keys, as pydantic's smart union would pick
+    """
+    if tagger is not None:
+        discriminator, tags = tagger
+        tag = discriminator(value)
+        if tag in tags:
+            return tags[tag]
+    keys = value.keys()
+    for candidate in candidates:
+        plan = _plan(candidate)
+        if keys <= plan.names or keys <= plan.names | plan.aliases.keys():
+            return candidate
+    return candidates[0]
+
+
+def _nested(
+    value: Any,
+    single: list[type[BaseModel]],
+    items: list[type[BaseModel]],
+    tagged: tuple[_Tagger | None, _Tagger | None],
+) -> Any:
+    if isinstance(value, dict) and single:
+        return construct(_choose(single, value, tagged[0]), **value)
+    if isinstance(value, list) and items:
+        return [
+            construct(_choose(items, item, tagged[1]), **item)
+            if isinstance(item, dict)
+            else item
+            for item in value
+        ]
+    return value
+
+
+def construct(cls: type[M], /, **values: Any) -> M:
+    """
+    Build `cls` from trusted, correctly typed values without validating them
+    """
+    if _validate.get():
+        return cls(**values)
+    plan = _plan(cls)
+    data_class_for = getattr(cls, "data_class_for", None)
+    if data_class_for is not None and isinstance(values.get("data"), dict):
+        # The chart type's data model, as `Config` validates dicts of data with
+        chart_type = values.get("type", cls.model_fields["type"].default)
+        data_class = data_class_for(chart_type)
+        if data_class is not None:
+            values["data"] = construct(data_class, **values["data"])
+    for name, value in values.items():
+        if name in plan.nested and isinstance(value, dict | list):
+            values[name] = _nested(value, *plan.nested[name], plan.tagged[name])
+    if not plan.simple or plan.aliases:
+        return cls.model_construct(**values)
+
+    # The same steps as `model_construct`, minus per-field default lookups
+    fields_set = values.keys() & plan.names
+    if len(fields_set) != len(values):
+        values = {name: values[name] for name in fields_set}
+    fields = plan.template | values
+    for name, default in plan.copied_defaults.items():
+        if name not in values:
+            fields[name] = copy.deepcopy(default)
+    for name in plan.required - fields_set:
+        del fields[name]
+    instance = cls.__new__(cls)
+    object.__setattr__(instance, "__dict__", fields)
+    object.__setattr__(instance, "__pydantic_fields_set__", fields_set)
+    object.__setattr__(instance, "__pydantic_extra__", None)
+    object.__setattr__(instance, "__pydantic_private__", None)
+    return instance
@@ -0,0 +1,51 @@
+import array
+
+import pytest
+
+from pydacharts.models import Config, Data, Dataset, LineData, LineDataSet, PieDataSet
+
+np = pytest.importorskip("numpy")
+
+
+@pytest.mark.parametrize("dataset", [Dataset, LineDataSet, PieDataSet])
+def test_numpy_data_kept_as_is(dataset):
+    values = np.array([1.5, 2.0, 3.25])
+    ds = dataset(data=values)
+    assert ds.data is values
+    assert ds.model_dump()["data"] is values
+
+
+def test_numpy_nan_is_null():
+    config = Config(
+        data=LineData(
+            labels=["a", "b", "c"],
+            datasets=[LineDataSet(data=np.array([1.5, np.nan, 3.0]))],
+        )
+    )
+    assert (
+        config.model_dump_json(exclude_none=True)
+        == '{"type":"line","data":{"labels":["a","b","c"],"datasets":[{"data":[1.5,null,3.0],"showLine":true,"fill":false,"tension":0.1}]}}'
+    )
+
+
+def test_numpy_matches_list_output():
+    values = [[1, 2], [3, 4]]
+    from_list = Data(labels=["a", "b"], datasets=[Dataset(data=values)])
+    from_array = Data(labels=["a", "b"], datasets=[Dataset(data=np.array(values))])
+    assert from_list.model_dump_json() == from_array.model_dump_json()
+
+
+def test_array_and_memoryview():
+    buffer = array.array("d", [1.0, float("nan"), 2.5])
+    assert Dataset(data=buffer).data is buffer
+    assert Dataset(data=buffer).model_dump_json(exclude_none=True) == (
+        '{"data":[1.0,null,2.5]}'
+    )
+    view = memoryview(array.array("i", [1, 2, 3]))
+    assert Dataset(data=view).model_dump_json(exclude_none=True) == '{"data":[1,2,3]}'
+    assert Dataset(data=view).model_dump(mode="json")["data"] == [1, 2, 3]
+
+
+def test_list_data_still_validated():
+    with pytest.raises(ValueError):
+        Dataset(data="not a list")
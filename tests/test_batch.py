@@ -0,0 +1,119 @@
+import json
+import tarfile
+import zipfile
+from functools import partial
+
+import pytest
+
+from pydacharts.batch import main, serialize_batch, write_batch
+from pydacharts.models import Config, Data, Dataset
+from pydacharts.plugins.sankey import (
+    Sankey,
+    SankeyData,
+    SankeyDataSet,
+    SankeyDatasetData,
+)
+
+
+def build(values):
+    return Config(
+        type="bar",
+        data=Data(labels=[str(v) for v in values], datasets=[Dataset(data=values)]),
+    )
+
+
+def broken():
+    raise RuntimeError("no data")
+
+
+def sankey():
+    return Sankey(
+        data=SankeyData(
+            datasets=[
+                SankeyDataSet(
+                    data=[SankeyDatasetData(from_="a", to="b", flow=1)],
+                    labels=None,
+                    priority=None,
+                )
+            ]
+        )
+    )
+
+
+def jobs(count=20):
+    for i in range(count):
+        yield f"charts/{i}", partial(build, list(range(i)))
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_directory(tmp_path, workers):
+    results = list(write_batch(jobs(), tmp_path / "out", workers=workers, chunksize=3))
+    assert [r.name for r in results] == [f"charts/{i}" for i in range(20)]
+    assert all(r.error is None for r in results)
+    path = tmp_path / "out" / "charts" / "7.json"
+    assert path.read_text() == build(list(range(7))).model_dump_json(exclude_none=True)
+    assert results[7].path == str(path)
+    assert results[7].size == path.stat().st_size
+
+
+def test_unordered(tmp_path):
+    results = list(
+        write_batch(
+            jobs(), tmp_path, workers=2, ordered=False, chunksize=1, max_pending=2
+        )
+    )
+    assert sorted(r.name for r in results) == sorted(f"charts/{i}" for i in range(20))
+
+
+def test_archives(tmp_path):
+    list(write_batch(jobs(3), tmp_path / "out.zip", workers=0, compress=True))
+    with zipfile.ZipFile(tmp_path / "out.zip") as archive:
+        assert archive.namelist() == ["charts/0.json", "charts/1.json", "charts/2.json"]
+        assert json.loads(archive.read("charts/2.json"))["data"]["labels"] == ["0", "1"]
+
+    list(write_batch(jobs(3), tmp_path / "out.tar.gz", workers=0, indent=2))
+    with tarfile.open(tmp_path / "out.tar.gz") as archive:
+        body = archive.extractfile("charts/1.json").read()
+    assert body.decode() == build([0]).model_dump_json(exclude_none=True, indent=2)
+
+
+def test_errors_are_per_item(tmp_path):
+    items = [
+        ("good", build([1])),
+        ("broken", broken),
+        ("not a chart", dict),
+        ("../escape", build([2])),
+        ("also good", partial(build, [3])),
+    ]
+    results = {r.name: r for r in write_batch(items, tmp_path, workers=0)}
+    assert results["good"].error is None
+    assert results["broken"].error == "RuntimeError: no data"
+    assert results["not a chart"].error.startswith("TypeError")
+    assert results["../escape"].error.startswith("ValueError")
+    assert results["also good"].error is None
+    assert not (tmp_path.parent / "escape.json").exists()
+
+
+def test_unpicklable_jobs_fail_alone():
+    items = [("lambda", lambda: build([1])), ("fine", partial(build, [1]))]
+    results = list(serialize_batch(items, workers=1, chunksize=1))
+    assert results[0][0] == "lambda" and results[0][1] is None
+    assert "pickle" in results[0][2].lower()
+    assert results[1][1] == build([1]).model_dump_json(exclude_none=True).encode()
+
+
+def test_sankey_uses_its_own_dump(tmp_path):
+    (result,) = write_batch([("sankey", sankey)], tmp_path, workers=1)
+    body = json.loads((tmp_path / "sankey.json").read_text())
+    assert body["data"]["datasets"][0]["data"] == [{"from": "a", "to": "b", "flow": 1}]
+    assert result.size == len(sankey().model_dump_json(exclude_none=True))
+
+
+def test_cli(tmp_path, capsys):
+    assert (
+        main(["tests.test_batch:jobs", str(tmp_path / "cli.zip"), "--workers", "2"])
+        == 0
+    )
+    assert "Wrote 20 charts" in capsys.readouterr().out
+    with zipfile.ZipFile(tmp_path / "cli.zip") as archive:
+        assert len(archive.namelist()) == 20
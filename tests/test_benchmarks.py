@@ -0,0 +1,44 @@
+from benchmarks.scale import Case, Result, cases, regressions, run
+
+
+def test_cases_cover_presets():
+    names = [case.name for case in cases()]
+    assert "plain-1x1000000" in names
+    assert "plain-200x1000" in names
+    assert {"bar-5x100", "pyramid-5x100", "doughnut-5x100"} <= set(names)
+
+
+def test_run_small_case():
+    result = run(Case("pyramid", 2, 10))
+    assert result.bytes > 0
+    assert result.peak > 0
+    assert min(result.construct, result.dump, result.validate) > 0
+
+
+def test_regressions():
+    baseline = {
+        "construct": 0.01,
+        "dump": 0.01,
+        "validate": 0.01,
+        "peak": 100,
+        "bytes": 5,
+    }
+    assert regressions(Result(0.01, 0.011, 0.01, 100, 5), baseline, 1.5) == []
+    found = regressions(Result(0.03, 0.01, 0.01, 200, 6), baseline, 1.5)
+    assert [f.split()[0] for f in found] == ["construct", "peak", "bytes"]
+
+
+def test_validation_corpus():
+    from benchmarks.validation import corpus, picks
+    from pydacharts.models import Config
+
+    payloads = corpus()
+    assert len(payloads) >= 8
+    found = picks(Config.model_validate_json(payloads["line_time_series"]))
+    assert "data.datasets.0: LineDataSet" in found
+    assert "options.scales.x.ticks: CartesianTicks" in found
+    assert "options.layout.padding: PaddingXY" in found
+    # A line dataset in a bar chart, picked by its own type
+    found = picks(Config.model_validate_json(payloads["mixed_bar_line"]))
+    assert "data.datasets.0: LineDataSet" in found
+    assert "data.datasets.1: Dataset" in found
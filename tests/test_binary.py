@@ -0,0 +1,115 @@
+import array
+import base64
+import json
+
+import pytest
+
+from pydacharts.models import Config, Data, Dataset, LineDataSet
+from pydacharts.precision import Precision
+
+np = pytest.importorskip("numpy")
+
+from pydacharts.binary import ALIGNMENT, dump_base64, dump_binary, typed  # noqa: E402
+
+DTYPES = {"Float64Array": "<f8", "Float32Array": "<f4", "Int32Array": "<i4"}
+
+
+def _revive(node, load):
+    if isinstance(node, dict):
+        if "$typed" in node:
+            return load(node)
+        return {key: _revive(value, load) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_revive(item, load) for item in node]
+    return node
+
+
+def _from_base64(text):
+    return _revive(
+        json.loads(text),
+        lambda m: np.frombuffer(base64.b64decode(m["base64"]), DTYPES[m["$typed"]]),
+    )
+
+
+def _from_binary(body):
+    length = int.from_bytes(body[:4], "little")
+    start = -(-(4 + length) // ALIGNMENT) * ALIGNMENT
+
+    def load(marker):
+        assert marker["offset"] % ALIGNMENT == 0
+        return np.frombuffer(
+            body,
+            DTYPES[marker["$typed"]],
+            count=marker["length"],
+            offset=start + marker["offset"],
+        )
+
+    return _revive(json.loads(body[4 : 4 + length]), load)
+
+
+def _config(*datasets):
+    return Config(
+        type="line",
+        data=Data(labels=["a", "b", "c"], datasets=list(datasets)),
+    )
+
+
+@pytest.mark.parametrize("decode", [_from_base64, _from_binary])
+def test_round_trip(decode):
+    values = np.random.default_rng(0).normal(size=1001)
+    config = _config(
+        LineDataSet(label="floats", data=values),
+        Dataset(data=array.array("i", [1, 2, 3])),
+        Dataset(data=[1.5, None, 3]),
+        Dataset(data=[{"x": 1, "y": 2}]),
+    )
+    dump = dump_base64 if decode is _from_base64 else dump_binary
+    loaded = decode(dump(config))
+    expected = json.loads(config.model_dump_json(exclude_none=True))
+    datasets = loaded["data"]["datasets"]
+    assert datasets[0]["data"].dtype == np.float64
+    assert np.array_equal(datasets[0]["data"], values)
+    assert datasets[1]["data"].dtype == np.int32
+    assert datasets[1]["data"].tolist() == [1, 2, 3]
+    assert np.array_equal(datasets[2]["data"], [1.5, np.nan, 3], equal_nan=True)
+    # Not numbers: left as JSON, like everything outside the data arrays
+    assert datasets[3]["data"] == [{"x": 1, "y": 2}]
+    for dataset in datasets:
+        dataset.pop("data")
+    for dataset in expected["data"]["datasets"]:
+        dataset.pop("data")
+    assert loaded == expected
+
+
+def test_smaller_than_json():
+    config = _config(Dataset(data=np.random.default_rng(1).normal(size=10_000)))
+    size = len(config.model_dump_json(exclude_none=True))
+    assert len(dump_binary(config)) < size / 2
+    assert len(dump_binary(config, float32=True)) < size / 4
+
+
+def test_dtypes():
+    assert typed(np.arange(3, dtype=np.int16))[0] == "Int32Array"
+    assert typed(np.array([2**40]))[0] == "Float64Array"
+    assert typed(np.arange(3.0), float32=True)[0] == "Float32Array"
+    assert typed(np.ones((2, 2))) is None
+    assert typed(np.array([True])) is None
+    assert typed(["a"]) is None
+    big_endian = np.arange(3.0, dtype=">f8")
+    name, values = typed(big_endian)
+    assert values.dtype.str == "<f8"
+    assert values.tolist() == [0, 1, 2]
+
+
+def test_precision():
+    values = np.array([1.23456, 2.34567])
+    dataset = Dataset(data=values)
+    loaded = _from_base64(
+        dump_base64(_config(dataset), context=Precision(decimals=1).context)
+    )
+    assert loaded["data"]["datasets"][0]["data"].tolist() == [1.2, 2.3]
+    dataset = Dataset(data=values, precision=Precision(decimals=2))
+    loaded = _from_binary(dump_binary(_config(dataset)))
+    assert loaded["data"]["datasets"][0]["data"].tolist() == [1.23, 2.35]
+    # Plain dumps are unchanged
+    assert json.loads(dataset.model_dump_json())["data"] == [1.23, 2.35]
@@ -0,0 +1,216 @@
+import array
+import asyncio
+import gzip
+import threading
+import time
+
+import pytest
+
+from pydacharts.cache import ChartCache, PayloadCache, estimate_size, fingerprint
+from pydacharts.chart_utils import chart_options
+from pydacharts.models import Config, Data, Dataset
+from pydacharts.precision import Precision
+
+
+def _config(values, label="values"):
+    return Config(
+        type="bar",
+        data=Data(
+            labels=[str(i) for i in range(len(values))],
+            datasets=[Dataset(label=label, data=values)],
+        ),
+    )
+
+
+def test_fingerprint_is_content_based():
+    assert fingerprint(_config([1, 2, 3])) == fingerprint(_config([1, 2, 3]))
+    assert fingerprint(_config([1, 2, 3])) != fingerprint(_config([1, 2, 4]))
+    assert fingerprint(_config([1], label="a")) != fingerprint(_config([1], label="b"))
+    assert fingerprint(_config([1]), indent=2) != fingerprint(_config([1]))
+
+
+def test_fingerprint_dataset_precision():
+    config = _config([1.23456, 2.34567])
+    rounded = _config([1.23456, 2.34567])
+    rounded.data.datasets[0].precision = Precision(significant=2)
+    assert fingerprint(config) != fingerprint(rounded)
+    cache = PayloadCache()
+    assert cache.get(config).body != cache.get(rounded).body
+    assert b"[1.2,2.3]" in cache.get(rounded).body
+
+
+def test_fingerprint_data_lists():
+    assert fingerprint(_config([1, 2])) != fingerprint(_config([1.0, 2.0]))
+    assert fingerprint(_config([1, 2.5])) != fingerprint(_config([1.0, 2.5]))
+    assert fingerprint(_config([2**70])) != fingerprint(_config([2**70 + 1]))
+    assert fingerprint(_config([1.5, None])) != fingerprint(_config([1.5, 0.0]))
+    config = _config([1.5, 2.5])
+    relabeled = _config([1.5, 2.5])
+    relabeled.data.labels = ["a", "b"]
+    assert fingerprint(config) != fingerprint(relabeled)
+    # Same JSON, same payload
+    buffer = _config(array.array("d", [1.5, 2.5]))
+    assert fingerprint(buffer) == fingerprint(config)
+
+
+def test_fingerprint_numpy_buffers():
+    np = pytest.importorskip("numpy")
+    values = np.arange(1000, dtype=float)
+    assert fingerprint(_config(values)) == fingerprint(_config(values.copy()))
+    changed = values.copy()
+    changed[500] = -1
+    assert fingerprint(_config(values)) != fingerprint(_config(changed))
+    assert fingerprint(_config(values)) != fingerprint(_config(values.astype("f4")))
+
+
+def test_cache_hits_and_eviction():
+    cache = PayloadCache(maxsize=2)
+    first = cache.get(_config([1]), exclude_none=True)
+    assert cache.get(_config([1]), exclude_none=True) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.get(_config([2]), exclude_none=True)
+    cache.get(_config([3]), exclude_none=True)
+    assert len(cache) == 2
+    assert cache.get(_config([1]), exclude_none=True) is not first
+    assert cache.misses == 4
+
+
+def test_payload_body_and_encodings():
+    config = _config(list(range(2000)))
+    payload = PayloadCache().get(config, exclude_none=True)
+    assert payload.body == config.model_dump_json(exclude_none=True).encode()
+    assert gzip.decompress(payload.encoded["gzip"]) == payload.body
+
+    body, encoding = payload.select("gzip, deflate")
+    assert encoding == "gzip"
+    assert body == payload.encoded["gzip"]
+    assert payload.select("gzip;q=0, identity") == (payload.body, None)
+    assert payload.select(None) == (payload.body, None)
+
+
+def test_small_payloads_not_compressed():
+    payload = PayloadCache(min_compress_size=1024).get(_config([1]))
+    assert payload.encoded == {}
+    assert payload.select("gzip, br") == (payload.body, None)
+
+
+def test_etags():
+    payload = PayloadCache().get(_config(list(range(2000))), exclude_none=True)
+    assert payload.etag.startswith('"') and payload.etag.endswith('"')
+    assert payload.etag_for("gzip") != payload.etag
+    assert payload.not_modified(payload.etag)
+    assert payload.not_modified(f'"other", {payload.etag_for("gzip")}')
+    assert payload.not_modified(f"W/{payload.etag}")
+    assert payload.not_modified("*")
+    assert not payload.not_modified('"other"')
+    assert not payload.not_modified(None)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_estimate_size():
+    small = estimate_size(Dataset(data=[1.5] * 10))
+    large = estimate_size(Dataset(data=[1.5] * 10_000))
+    assert 10_000 * 24 < large - small < 10_000 * 40
+    buffer = estimate_size(Dataset(data=array.array("d", [1.5] * 10_000)))
+    assert 10_000 * 8 <= buffer < 10_000 * 16
+
+
+def test_chart_cache_ttl():
+    clock = _Clock()
+    charts = ChartCache(ttl=10, stale=0, clock=clock)
+    calls = []
+
+    @charts
+    def build(n, label="values"):
+        calls.append(n)
+        return _config(list(range(n)), label=label)
+
+    assert build(3) is build(3)
+    assert build(3, label="other") is not build(3)
+    assert calls == [3, 3]
+    clock.now = 11
+    build(3)
+    assert calls == [3, 3, 3]
+    assert (charts.hits, charts.misses) == (2, 3)
+
+
+def test_chart_cache_bytes():
+    clock = _Clock()
+    charts = ChartCache(ttl=10, maxbytes=2500, sizeof=lambda chart: 1000, clock=clock)
+    build = charts(chart_options)
+    other = charts(lambda n: _config([n]))
+    first = build()
+    other(1)
+    other(2)
+    assert (len(charts), charts.nbytes, charts.evictions) == (2, 2000, 1)
+    assert build() is not first
+    # Too large to be cached at all
+    charts.sizeof = lambda chart: 5000
+    other(3)
+    assert other(3) is not other(3)
+    assert charts.nbytes == 2000
+
+
+def test_chart_cache_stale_while_revalidate():
+    clock = _Clock()
+    charts = ChartCache(ttl=10, clock=clock)
+    calls = []
+    release = threading.Event()
+
+    @charts
+    def build():
+        calls.append(clock.now)
+        if len(calls) > 1:
+            release.wait(5)
+        return _config([len(calls)])
+
+    first = build()
+    clock.now = 15
+    # Stale: returned while it is rebuilt in the background, once
+    assert build() is first
+    assert build() is first
+    release.set()
+    deadline = time.monotonic() + 5
+    while not charts.refreshes and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert build() is not first
+    assert calls == [0, 15]
+    assert (charts.hits, charts.stale_hits, charts.misses) == (1, 2, 1)
+    # Too old to be returned stale
+    clock.now = 100
+    build()
+    assert charts.misses == 2
+
+
+def test_chart_cache_async():
+    clock = _Clock()
+    charts = ChartCache(ttl=10, clock=clock)
+    calls = []
+
+    @charts
+    async def build(fail=False):
+        calls.append(clock.now)
+        if fail and len(calls) > 1:
+            raise ValueError("no data")
+        await asyncio.sleep(0)
+        return _config([len(calls)])
+
+    async def run():
+        first = await build(fail=True)
+        clock.now = 15
+        assert await build(fail=True) is first
+        await asyncio.gather(*charts._tasks)
+        # The rebuild failed: still stale
+        assert await build(fail=True) is first
+        await asyncio.gather(*charts._tasks)
+
+    asyncio.run(run())
+    assert (charts.refreshes, charts.errors) == (0, 2)
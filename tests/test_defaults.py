@@ -0,0 +1,162 @@
+import json
+
+import pytest
+
+from pydacharts.defaults import dump_json, exclude_defaults
+from pydacharts.elements import Elements, LinesElements
+from pydacharts.models import (
+    Config,
+    Data,
+    Dataset,
+    Grid,
+    Interaction,
+    Legend,
+    LegendLabels,
+    LineData,
+    LineDataSet,
+    Options,
+    Plugins,
+    ScaleOptions,
+    Scales,
+    Title,
+)
+from pydacharts.plugins.datalabels import DataLabelsPlugin
+from pydacharts.plugins.sankey import Sankey, SankeyData, SankeyDataSet
+
+
+def _chart(chart_type="bar", **options):
+    return Config(
+        type=chart_type,
+        data=Data(labels=["a", "b"], datasets=[Dataset(label="A", data=[1, 2])]),
+        options=Options(**options),
+    )
+
+
+def test_model_defaults_are_pruned():
+    assert json.loads(dump_json(_chart())) == {
+        "type": "bar",
+        "data": {"labels": ["a", "b"], "datasets": [{"label": "A", "data": [1, 2]}]},
+    }
+
+
+def test_other_values_are_kept():
+    config = _chart(
+        responsive=False,
+        aspectRatio=1,
+        scales=Scales(y=ScaleOptions(stacked=True), x=ScaleOptions()),
+        plugins=Plugins(
+            title=Title(text="Sales"),
+            legend=Legend(labels=LegendLabels(boxWidth=20)),
+            datalabels=DataLabelsPlugin(offset=8),
+        ),
+    )
+    options = json.loads(dump_json(config))["options"]
+    assert options == {
+        "responsive": False,
+        "aspectRatio": 1,
+        "plugins": {
+            # Chart.js doesn't show the title by default
+            "title": {"display": True, "text": "Sales"},
+            "legend": {
+                "labels": {
+                    "boxWidth": 20,
+                    "boxHeight": 40,
+                    "color": "black",
+                    "padding": 5,
+                    "pointStyle": "circle",
+                }
+            },
+            "datalabels": {"offset": 8},
+        },
+        # Chart.js offsets the category axis of bar charts only
+        "scales": {"y": {"stacked": True, "offset": True}, "x": {"offset": True}},
+    }
+
+
+def test_chart_type_defaults():
+    assert "options" not in json.loads(dump_json(_chart("pie", aspectRatio=1)))
+    assert json.loads(dump_json(_chart("bar", aspectRatio=1)))["options"] == {
+        "aspectRatio": 1
+    }
+
+    line = LineDataSet(data=[1])
+    scatter = LineDataSet(data=[1], type="scatter")
+    data = LineData(labels=["a"], datasets=[line, scatter])
+    datasets = exclude_defaults(Config(type="line", data=data))["data"]["datasets"]
+    # Scatter datasets don't show a line by default
+    assert datasets == {0: {"showLine": True, "fill": True}, 1: {"fill": True}}
+
+
+def test_radar_defaults():
+    data = LineData(labels=["a"], datasets=[LineDataSet(data=[1], fill=False)])
+    options = Options(elements=Elements(lines=LinesElements(fill=False)))
+    body = json.loads(dump_json(Config(type="radar", data=data, options=options)))
+    # Chart.js fills radar lines unless told not to
+    assert body["data"]["datasets"][0]["fill"] is False
+    assert body["options"]["elements"]["lines"] == {"fill": False}
+    body = json.loads(dump_json(Config(type="line", data=data, options=options)))
+    assert "fill" not in body["data"]["datasets"][0]
+    assert "elements" not in body.get("options", {})
+
+
+def _options(chart_type, **options):
+    return json.loads(dump_json(_chart(chart_type, **options))).get("options", {})
+
+
+def test_controller_defaults():
+    assert "cutout" not in _options("doughnut", cutout="50%")
+    assert "cutout" in _options("pie", cutout="50%")
+    nearest = Interaction(mode="nearest")
+    assert "mode" in _options("scatter", interaction=nearest)["interaction"]
+    assert "mode" not in _options("bar", interaction=nearest)["interaction"]
+    point = Interaction(mode="point")
+    assert "mode" not in _options("bubble", interaction=point)["interaction"]
+    # The bar controller offsets the index scale's grid
+    scales = Scales(x=ScaleOptions(grid=Grid(offset=False, color="red")))
+    assert _options("bar", scales=scales)["scales"]["x"]["grid"] == {
+        "offset": False,
+        "color": "red",
+    }
+    assert _options("line", scales=scales)["scales"]["x"]["grid"] == {"color": "red"}
+
+
+@pytest.mark.parametrize(
+    "mode, pruned", [(None, False), ("nearest", False), ("index", True)]
+)
+def test_interaction_axis(mode, pruned):
+    config = _chart(interaction=Interaction(mode=mode, axis="x"))
+    interaction = json.loads(dump_json(config))["options"]["interaction"]
+    assert ("axis" in interaction) is not pruned
+
+
+def test_exclude_none_false():
+    config = _chart()
+    body = json.loads(dump_json(config, exclude_none=False))
+    assert "responsive" not in body["options"]
+    assert body["options"]["plugins"] is None
+
+
+def test_sankey():
+    chart = Sankey(
+        data=SankeyData(
+            datasets=[
+                SankeyDataSet(
+                    data=[{"from_": "a", "to": "b", "flow": 1}],
+                    labels=None,
+                    priority=None,
+                )
+            ]
+        )
+    )
+    assert json.loads(dump_json(chart))["data"]["datasets"] == [
+        {"data": [{"from": "a", "to": "b", "flow": 1}]}
+    ]
+    with pytest.raises(TypeError):
+        dump_json(chart, exclude={"type"})
+
+
+def test_smaller_payload():
+    charts = [_chart(plugins=Plugins(legend=Legend(labels=LegendLabels())))] * 100
+    full = sum(len(c.model_dump_json(exclude_none=True)) for c in charts)
+    pruned = sum(len(dump_json(c)) for c in charts)
+    assert pruned < full * 0.6
@@ -0,0 +1,132 @@
+import pytest
+
+from pydacharts.models import Config, LineData, LineDataSet
+
+np = pytest.importorskip("numpy")
+
+from pydacharts.downsample import (  # noqa: E402
+    downsample_data,
+    downsample_dataset,
+    lttb_indices,
+    minmax_indices,
+)
+
+
+def reference_lttb(x, y, threshold):
+    """
+    Straightforward LTTB, as published by Sveinn Steinarsson
+    """
+    n = len(y)
+    every = (n - 2) / (threshold - 2)
+    selected = [0]
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        cx = sum(x[end:next_end]) / (next_end - end)
+        cy = sum(y[end:next_end]) / (next_end - end)
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((x[a] - cx) * (y[j] - y[a]) - (x[a] - x[j]) * (cy - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return selected
+
+
+@pytest.mark.parametrize("n,threshold", [(100, 10), (1000, 37), (5001, 500)])
+def test_lttb_matches_reference(n, threshold):
+    rng = np.random.default_rng(n)
+    x = np.sort(rng.uniform(0, 100, n))
+    y = rng.normal(size=n).cumsum()
+    expected = reference_lttb(x.tolist(), y.tolist(), threshold)
+    assert lttb_indices(x, y, threshold).tolist() == expected
+
+
+def test_lttb_keeps_spike():
+    y = np.zeros(1000)
+    y[567] = 50
+    indices = lttb_indices(np.arange(1000), y, 20)
+    assert len(indices) == 20
+    assert 567 in indices
+
+
+def test_minmax_keeps_extremes():
+    y = np.sin(np.linspace(0, 20, 10_000))
+    y[1234] = 10
+    y[8765] = -10
+    indices = minmax_indices(y, 100)
+    assert len(indices) <= 100
+    assert {0, 1234, 8765, 9999} <= set(indices.tolist())
+    assert np.all(np.diff(indices) > 0)
+
+
+@pytest.mark.parametrize("series", [1, 24, 49, 60])
+def test_minmax_many_series(series):
+    ys = np.random.default_rng(0).normal(size=(series, 5000))
+    ys[-1, 2345] = 100
+    indices = minmax_indices(ys, 100)
+    assert len(indices) <= 100
+    assert 2345 in indices.tolist()
+
+
+def test_downsample_dataset_list_data():
+    dataset = LineDataSet(label="raw", data=list(range(1000)), tension=0.4)
+    reduced = downsample_dataset(dataset, 50)
+    assert len(reduced.data) == 50
+    assert reduced.label == "raw"
+    assert reduced.tension == 0.4
+    assert len(dataset.data) == 1000
+
+
+def test_downsample_dataset_xy_pairs():
+    x = np.linspace(0, 1, 2000)
+    dataset = LineDataSet(data=np.column_stack([x, np.sin(x * 40)]))
+    reduced = downsample_dataset(dataset, 100, algorithm="minmax")
+    assert reduced.data.shape[1] == 2
+    assert len(reduced.data) <= 100
+    assert np.all(np.diff(reduced.data[:, 0]) > 0)
+
+
+def test_downsample_dataset_points():
+    points = [{"x": i * 0.5, "y": (i * 7919) % 101} for i in range(1000)]
+    reduced = downsample_dataset(LineDataSet(data=points), 50, algorithm="minmax")
+    assert len(reduced.data) <= 50
+    assert all(point in points for point in reduced.data)
+    assert [p["x"] for p in reduced.data] == sorted(p["x"] for p in reduced.data)
+    dates = [{"x": f"2024-01-{i % 28 + 1:02}", "y": i} for i in range(100)]
+    with pytest.raises(ValueError):
+        downsample_dataset(LineDataSet(data=dates), 10)
+
+
+@pytest.mark.parametrize("algorithm", ["lttb", "minmax"])
+def test_downsample_data_keeps_alignment(algorithm):
+    n = 20_000
+    labels = [f"t{i}" for i in range(n)]
+    first = np.arange(n, dtype=float)
+    second = np.arange(n, dtype=float) * -2
+    data = LineData(
+        labels=labels,
+        datasets=[LineDataSet(data=first), LineDataSet(data=second)],
+    )
+    reduced = downsample_data(data, 400, algorithm=algorithm)
+    assert isinstance(reduced, LineData)
+    assert len(reduced.labels) <= 400
+    indices = [int(label[1:]) for label in reduced.labels]
+    assert reduced.datasets[0].data.tolist() == first[indices].tolist()
+    assert reduced.datasets[1].data.tolist() == second[indices].tolist()
+    Config(data=reduced).model_dump_json(exclude_none=True)
+
+
+def test_downsample_data_length_mismatch():
+    data = LineData(labels=["a"] * 10, datasets=[LineDataSet(data=list(range(9)))])
+    with pytest.raises(ValueError):
+        downsample_data(data, 5)
+
+
+def test_small_series_untouched():
+    data = LineData(labels=["a", "b"], datasets=[LineDataSet(data=[1, 2])])
+    assert downsample_data(data, 10) is data
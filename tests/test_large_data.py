@@ -0,0 +1,167 @@
+import json
+
+import pytest
+
+from pydacharts.models import (
+    Animation,
+    ChartType,
+    Config,
+    Data,
+    Dataset,
+    Decimation,
+    DecimationAlgorithm,
+    Options,
+    Plugins,
+    ScaleOptions,
+    Scales,
+)
+
+np = pytest.importorskip("numpy")
+
+from pydacharts.large_data import large_data_mode, point_count  # noqa: E402
+
+
+def _config(labels, *datasets, chart_type=ChartType.line, options=None):
+    return Config(
+        type=chart_type,
+        data=Data(
+            labels=labels, datasets=[Dataset(label="d", data=d) for d in datasets]
+        ),
+        options=options,
+    )
+
+
+def _json(config):
+    return json.loads(config.model_dump_json(exclude_none=True))
+
+
+def test_options_models():
+    options = Options(
+        animation=False,
+        parsing=False,
+        normalized=True,
+        spanGaps=True,
+        plugins=Plugins(
+            decimation=Decimation(
+                enabled=True, algorithm=DecimationAlgorithm.minmax, threshold=500
+            )
+        ),
+    )
+    dumped = json.loads(options.model_dump_json(exclude_none=True))
+    assert dumped["animation"] is False
+    assert dumped["plugins"]["decimation"] == {
+        "enabled": True,
+        "algorithm": "min-max",
+        "threshold": 500,
+    }
+    assert Options(animation=Animation(duration=0)).animation.duration == 0
+    assert Options(parsing={"xAxisKey": "t"}).parsing == {"xAxisKey": "t"}
+
+
+def test_small_charts_unchanged():
+    config = _config(["1", "2"], [1, 2])
+    assert point_count(config) == 2
+    assert large_data_mode(config) is config
+
+
+def test_numeric_labels():
+    config = _config(["3", "1", "2"], [30, 10, 20], [3, None, 2])
+    dumped = _json(large_data_mode(config, threshold=6))
+    assert dumped["data"]["labels"] == []
+    assert dumped["data"]["datasets"][1]["data"] == [
+        {"x": 1.0, "y": None},
+        {"x": 2.0, "y": 2.0},
+        {"x": 3.0, "y": 3.0},
+    ]
+    options = dumped["options"]
+    assert options["animation"] is False
+    assert options["parsing"] is False
+    assert options["normalized"] is True
+    assert options["spanGaps"] is True
+    assert options["scales"]["x"]["type"] == "linear"
+    assert options["plugins"]["decimation"] == {"enabled": True, "algorithm": "lttb"}
+    # The original is left alone
+    assert config.data.datasets[0].data == [30, 10, 20]
+
+
+def test_category_labels():
+    dumped = _json(
+        large_data_mode(_config(["a", "b"], np.array([1.0, 2.0])), threshold=1)
+    )
+    assert dumped["data"]["labels"] == ["a", "b"]
+    assert dumped["data"]["datasets"][0]["data"] == [
+        {"x": 0, "y": 1.0},
+        {"x": 1, "y": 2.0},
+    ]
+    assert "decimation" not in dumped["options"].get("plugins", {})
+    assert "scales" not in dumped["options"]
+
+
+def test_pairs_are_sorted():
+    dumped = _json(large_data_mode(_config([], [[2, 20], [1, 10]]), threshold=1))
+    assert dumped["data"]["datasets"][0]["data"] == [
+        {"x": 1.0, "y": 10.0},
+        {"x": 2.0, "y": 20.0},
+    ]
+    assert "normalized" not in dumped["options"]
+    assert dumped["options"]["plugins"]["decimation"]["enabled"] is True
+
+
+def test_dates_on_time_axis():
+    points = [
+        {"x": "2024-01-01T00:00:00", "y": 1},
+        {"x": "2024-01-01T00:00:01", "y": 2},
+    ]
+    options = Options(scales=Scales(x=ScaleOptions(type="time")))
+    dumped = _json(large_data_mode(_config([], points, options=options), threshold=1))
+    assert dumped["data"]["datasets"][0]["data"] == [
+        {"x": 1704067200000.0, "y": 1.0},
+        {"x": 1704067201000.0, "y": 2.0},
+    ]
+    assert dumped["options"]["scales"]["x"]["type"] == "time"
+    assert dumped["options"]["plugins"]["decimation"]["enabled"] is True
+
+    labels = ["2024-01-01", "2024-01-02"]
+    config = _config(labels, [1, 2], [["2024-01-03", 3]], options=options)
+    dumped = _json(large_data_mode(config, threshold=1))
+    assert dumped["data"]["labels"] == []
+    assert [p["x"] for p in dumped["data"]["datasets"][0]["data"]] == [
+        1704067200000.0,
+        1704153600000.0,
+    ]
+    assert dumped["data"]["datasets"][1]["data"] == [{"x": 1704240000000.0, "y": 3.0}]
+
+
+def test_strings_not_converted():
+    points = [{"x": "a", "y": 1}, {"x": "b", "y": 2}]
+    config = _config(["a", "b"], points, [["a", 1]])
+    dumped = _json(large_data_mode(config, threshold=1))
+    assert dumped["data"] == _json(config)["data"]
+    assert dumped["options"]["animation"] is False
+    assert "parsing" not in dumped["options"]
+
+
+def test_more_values_than_labels():
+    dumped = _json(large_data_mode(_config(["a", "b"], [1, 2, 3]), threshold=1))
+    assert [p["x"] for p in dumped["data"]["datasets"][0]["data"]] == [0, 1, 2]
+    dumped = _json(large_data_mode(_config(["1", "2"], [1, 2, 3], [4]), threshold=1))
+    assert dumped["data"]["datasets"][0]["data"] == [
+        {"x": 1.0, "y": 1.0},
+        {"x": 2.0, "y": 2.0},
+    ]
+    assert dumped["data"]["datasets"][1]["data"] == [{"x": 1.0, "y": 4.0}]
+
+
+def test_explicit_options_are_kept():
+    options = Options(animation=Animation(duration=100), spanGaps=False)
+    dumped = _json(large_data_mode(_config(["1"], [1], options=options), threshold=1))
+    assert dumped["options"]["animation"] == {"duration": 100}
+    assert dumped["options"]["spanGaps"] is False
+
+
+def test_other_chart_types_only_lose_animation():
+    config = _config(["a", "b"], [1, 2], chart_type=ChartType.bar)
+    dumped = _json(large_data_mode(config, threshold=1))
+    assert dumped["data"] == _json(config)["data"]
+    assert dumped["options"]["animation"] is False
+    assert "parsing" not in dumped["options"]
@@ -0,0 +1,112 @@
+import json
+
+import pytest
+
+from pydacharts.models import Config, LineData, LineDataSet
+from pydacharts.patch import apply_patch
+
+np = pytest.importorskip("numpy")
+
+from pydacharts.live import LiveData  # noqa: E402
+
+
+def _live(capacity=3):
+    return LiveData(capacity, [LineDataSet(label="a"), LineDataSet(label="b")])
+
+
+def _json(live):
+    return json.loads(Config(type="line", data=live.data()).model_dump_json())
+
+
+def test_window():
+    live = _live()
+    live.append("1", [1, 10])
+    live.extend(["2", "3", "4"], [[2, 20], [3, 30], [4, float("nan")]])
+    assert len(live) == 3
+    data = live.data()
+    assert isinstance(data, LineData)
+    assert data.labels == ["2", "3", "4"]
+    assert data.datasets[0].label == "a"
+    assert data.datasets[0].tension == 0.1
+    body = json.loads(data.model_dump_json(exclude_none=True))
+    assert body["datasets"][1]["data"] == [20, 30, None]
+    # Served from the buffer
+    assert np.shares_memory(data.datasets[0].data, live._values)
+    assert live.datasets[0].data is None
+
+
+def test_extend_past_capacity():
+    live = _live()
+    live.extend([str(i) for i in range(10)], np.arange(20).reshape(10, 2))
+    data = live.data()
+    assert data.labels == ["7", "8", "9"]
+    assert data.datasets[0].data.tolist() == [14, 16, 18]
+    assert data.datasets[1].data.tolist() == [15, 17, 19]
+
+
+def test_delta():
+    live = _live()
+    assert live.delta() == []
+    live.append("1", [1, 10])
+    assert live.delta() == [
+        {"op": "append", "path": "/data/labels", "value": ["1"]},
+        {"op": "append", "path": "/data/datasets/0/data", "value": [1.0]},
+        {"op": "append", "path": "/data/datasets/1/data", "value": [10.0]},
+    ]
+    live.extend(["2", "3", "4"], [[2, 20], [3, 30], [4, 40]])
+    assert live.delta()[0] == {
+        "op": "append",
+        "path": "/data/labels",
+        "value": ["2", "3", "4"],
+        "shift": 1,
+    }
+
+
+@pytest.mark.parametrize("capacity", [1, 4, 7])
+def test_delta_applies(capacity):
+    rng = np.random.default_rng(capacity)
+    live = _live(capacity)
+    document = _json(live)
+    count = 0
+    for _ in range(30):
+        added = int(rng.integers(0, 10))
+        labels = [str(count + i) for i in range(added)]
+        live.extend(labels, rng.random((added, 2)))
+        count += added
+        if rng.random() < 0.2:
+            live.append(str(count), [count, -count])
+            count += 1
+        document = apply_patch(document, live.delta())
+        expected = json.loads(live.data().model_dump_json())
+        assert document["data"] == expected
+
+
+def test_errors():
+    with pytest.raises(ValueError):
+        _live(0)
+    with pytest.raises(ValueError):
+        _live().append("1", [1])
+    with pytest.raises(ValueError):
+        _live().extend(["1", "2"], [[1, 2]])
+
+
+def test_delta_since_cursor():
+    live = _live(4)
+    live.extend(["1", "2"], [[1, 1], [2, 2]])
+    document = _json(live)
+    cursor = live.cursor()
+    for i in range(3, 8):
+        live.append(str(i), [i, i])
+        # Other readers don't move this one's cursor
+        live.delta()
+    ops = live.delta(since=cursor)
+    assert len(ops) == 3
+    assert ops[0] == {
+        "op": "append",
+        "path": "/data/labels",
+        "value": ["4", "5", "6", "7"],
+        "shift": 2,
+    }
+    assert apply_patch(document, ops)["data"] == json.loads(
+        live.data().model_dump_json()
+    )
@@ -1,3 +1,8 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
 import pytest
 
 from pydacharts.models import (
@@ -21,6 +26,7 @@ from pydacharts.models import (
     TooltipCallbacks,
 )
 from pydacharts.plugins.datalabels import DataLabelsPlugin
+from pydacharts.streaming import iter_json
 
 
 @pytest.mark.parametrize(
@@ -51,3 +57,86 @@ def test_all_models(testcase):
 
 def test_data_labels():
     Data(labels=["1", "2", "3"], datasets=[Dataset()]).model_dump_json()
+
+
+def test_models_build_lazily():
+    """
+    Importing the models must not build any schema, or import the plugin modules
+    """
+    probe = """
+import sys
+from pydantic import BaseModel
+import pydacharts.models
+import pydacharts.plugins
+
+built = [
+    cls.__name__
+    for cls in vars(pydacharts.models).values()
+    if isinstance(cls, type) and issubclass(cls, BaseModel) and cls.__pydantic_complete__
+]
+assert not built, built
+assert "pydacharts.plugins.sankey" not in sys.modules
+assert pydacharts.plugins.sankey.Sankey
+pydacharts.models.Tooltip()
+assert pydacharts.models.Tooltip.__pydantic_complete__
+"""
+    subprocess.run(
+        [sys.executable, "-c", probe],
+        check=True,
+        env={"PYTHONPATH": str(Path(__file__).parent.parent / "src")},
+    )
+
+
+def test_validated_models_dump():
+    """
+    Models validated from dicts, whose own schema isn't built, dump as their class
+    """
+    probe = """
+from pathlib import Path
+from pydacharts.cache import fingerprint
+from pydacharts.models import Config, Data
+
+Data(labels=["a"], datasets=[{"data": [1]}]).model_dump_json()
+for path in sorted(Path("benchmarks/corpus").glob("*.json")):
+    config = Config.load_json(path.read_bytes())
+    config.model_dump_json()
+    fingerprint(config)
+"""
+    root = Path(__file__).parent.parent
+    subprocess.run(
+        [sys.executable, "-c", probe],
+        check=True,
+        cwd=root,
+        env={"PYTHONPATH": str(root / "src")},
+    )
+
+
+def test_uniform_indexable_options():
+    dataset = Dataset(
+        data=[1, 2, 3],
+        backgroundColor=["red"] * 3,
+        borderColor=["red", "blue", "red"],
+        borderDash=[4, 4],
+        datalabels=DataLabelsPlugin(color=["#fff"] * 3, offset=[2.5, 2.5], opacity=[]),
+    )
+    assert json.loads(dataset.model_dump_json(exclude_none=True)) == {
+        "data": [1, 2, 3],
+        "backgroundColor": "red",
+        "borderColor": ["red", "blue", "red"],
+        # A dash pattern, not one value per point
+        "borderDash": [4, 4],
+        "datalabels": {
+            "anchor": "center",
+            "color": "#fff",
+            "display": True,
+            "offset": 2.5,
+            "opacity": [],
+        },
+    }
+    # Python dumps keep the lists as given
+    assert dataset.model_dump()["backgroundColor"] == ["red"] * 3
+    config = Config(type="bar", data=Data(labels=["a", "b", "c"], datasets=[dataset]))
+    assert (
+        b"".join(iter_json(config))
+        == config.model_dump_json(exclude_none=True).encode()
+    )
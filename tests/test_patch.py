@@ -0,0 +1,233 @@
+import json
+
+import pytest
+
+from pydacharts.models import (
+    ChartType,
+    Config,
+    Data,
+    Dataset,
+    LineData,
+    LineDataSet,
+    Options,
+    Plugins,
+    Title,
+)
+from pydacharts.patch import apply_patch, make_patch
+from pydacharts.plugins.sankey import (
+    Sankey,
+    SankeyData,
+    SankeyDataSet,
+    SankeyDatasetData,
+)
+
+
+def _config(labels, *datasets, title=None):
+    return Config(
+        type=ChartType.line,
+        data=Data(
+            labels=labels,
+            datasets=[
+                Dataset(label=f"Dataset {i}", data=data)
+                for i, data in enumerate(datasets)
+            ],
+        ),
+        options=Options(plugins=Plugins(title=Title(text=title))) if title else None,
+    )
+
+
+def _check(old, new, compact=True):
+    patch = make_patch(old, new, compact=compact)
+    document = old.model_dump(mode="json", exclude_none=True)
+    # The patch has to survive a trip through JSON
+    patch = json.loads(json.dumps(patch))
+    assert apply_patch(document, patch) == new.model_dump(
+        mode="json", exclude_none=True
+    )
+    return patch
+
+
+@pytest.mark.parametrize("compact", [True, False])
+def test_unchanged(compact):
+    config = _config(["a", "b"], [1, 2])
+    assert _check(config, config, compact) == []
+    assert _check(config, _config(["a", "b"], [1, 2]), compact) == []
+
+
+def test_append():
+    old = _config(list("abc"), [1, 2, 3], [4, 5, 6])
+    new = _config(list("abcd"), [1, 2, 3, 7], [4, 5, 6])
+    assert _check(old, new) == [
+        {"op": "append", "path": "/data/labels", "value": ["d"]},
+        {"op": "append", "path": "/data/datasets/0/data", "value": [7]},
+    ]
+    assert _check(old, new, compact=False) == [
+        {"op": "add", "path": "/data/labels/-", "value": "d"},
+        {"op": "add", "path": "/data/datasets/0/data/-", "value": 7},
+    ]
+
+
+def test_shift():
+    old = _config(list("abcdef"), [1, 2, 3, 4, 5, 6])
+    new = _config(list("cdefgh"), [3, 4, 5, 6, 7, 8])
+    assert _check(old, new) == [
+        {"op": "append", "path": "/data/labels", "value": ["g", "h"], "shift": 2},
+        {"op": "append", "path": "/data/datasets/0/data", "value": [7, 8], "shift": 2},
+    ]
+    assert _check(old, new, compact=False)[:3] == [
+        {"op": "remove", "path": "/data/labels/0"},
+        {"op": "remove", "path": "/data/labels/0"},
+        {"op": "add", "path": "/data/labels/-", "value": "g"},
+    ]
+    # A shift without new points, and repeated values
+    assert _check(_config([], [1, 1, 1, 2]), _config([], [1, 1, 2])) == [
+        {"op": "append", "path": "/data/datasets/0/data", "value": [], "shift": 1}
+    ]
+
+
+def test_sampled_comparison():
+    old = _config([], list(range(1000)))
+    new = _config([], list(range(10, 1005)))
+    expected = [
+        {
+            "op": "append",
+            "path": "/data/datasets/0/data",
+            "value": [1000, 1001, 1002, 1003, 1004],
+            "shift": 10,
+        }
+    ]
+    assert _check(old, new) == expected
+    assert make_patch(old, new, exact=False) == expected
+    # A point edited between the sampled ones is only seen by the full comparison
+    edited = list(range(10, 1005))
+    edited[501] = -1
+    assert _check(old, _config([], edited))[0]["op"] == "replace"
+    assert make_patch(old, _config([], edited), exact=False) == expected
+    # An edited tail is always seen
+    edited = list(range(10, 1005))
+    edited[989] = -1
+    assert make_patch(old, _config([], edited), exact=False)[0]["op"] == "replace"
+
+
+@pytest.mark.parametrize("compact", [True, False])
+def test_unrelated_data_is_replaced(compact):
+    patch = _check(_config(["a"], [1, 2, 3]), _config(["a"], [1, 9, 3]), compact)
+    assert patch == [
+        {"op": "replace", "path": "/data/datasets/0/data", "value": [1, 9, 3]}
+    ]
+
+
+@pytest.mark.parametrize("compact", [True, False])
+def test_datasets_and_options(compact):
+    old = _config(["a"], [1], [2], [3], title="Old")
+    new = _config(["a"], [1], title="New")
+    new.data.datasets[0].backgroundColor = "red"
+    patch = _check(old, new, compact)
+    assert {
+        "op": "add",
+        "path": "/data/datasets/0/backgroundColor",
+        "value": "red",
+    } in patch
+    assert {
+        "op": "replace",
+        "path": "/options/plugins/title/text",
+        "value": "New",
+    } in patch
+    assert [op["path"] for op in patch if op["op"] == "remove"] == [
+        "/data/datasets/2",
+        "/data/datasets/1",
+    ]
+    _check(new, old, compact)
+    _check(_config(["a"]), old, compact)
+    _check(old, Config(type=ChartType.bar), compact)
+    _check(Config(type=ChartType.bar), old, compact)
+
+
+def test_dataset_subclass_fields():
+    # Datasets serialize as their own class, so LineDataSet fields are in the JSON
+    old = Config(
+        type=ChartType.line,
+        data=LineData(labels=["a"], datasets=[LineDataSet(data=[1], tension=0.1)]),
+    )
+    new = Config(
+        type=ChartType.line,
+        data=LineData(labels=["a"], datasets=[LineDataSet(data=[1], tension=0.5)]),
+    )
+    assert _check(old, new) == [
+        {"op": "replace", "path": "/data/datasets/0/tension", "value": 0.5}
+    ]
+
+
+def test_numpy_arrays():
+    np = pytest.importorskip("numpy")
+    values = np.arange(100_000, dtype=float)
+    old = _config([], values)
+    new = _config([], np.concatenate([values[10:], [1.5, np.nan]]))
+    patch = _check(old, new)
+    assert patch == [
+        {
+            "op": "append",
+            "path": "/data/datasets/0/data",
+            "value": [1.5, None],
+            "shift": 10,
+        }
+    ]
+    # NaN values in the retained points don't defeat the comparison
+    newer = _config([], np.concatenate([new.data.datasets[0].data, [2.5]]))
+    assert _check(new, newer)[0]["value"] == [2.5]
+
+
+def test_sankey():
+    def sankey(*flows, labels=None):
+        return Sankey(
+            data=SankeyData(
+                datasets=[
+                    SankeyDataSet(
+                        data=[
+                            SankeyDatasetData(from_=a, to=b, flow=f)
+                            for a, b, f in flows
+                        ],
+                        labels=labels,
+                        priority=None,
+                    )
+                ]
+            )
+        )
+
+    old = sankey(("a", "b", 1), labels={"a": "A"})
+    new = sankey(("a", "b", 1), ("b", "c", 2), labels={"a": "A", "b": "B"})
+    patch = _check(old, new)
+    assert patch == [
+        {
+            "op": "append",
+            "path": "/data/datasets/0/data",
+            "value": [{"from": "b", "to": "c", "flow": 2}],
+        },
+        {"op": "add", "path": "/data/datasets/0/labels/b", "value": "B"},
+    ]
+
+
+def test_different_models_are_replaced():
+    old = _config(["a"], [1])
+    patch = make_patch(old, Sankey(data=SankeyData(datasets=[])))
+    assert [op["op"] for op in patch] == ["replace"]
+    assert apply_patch({}, patch) == patch[0]["value"]
+
+
+def test_apply_standard_operations():
+    document = {"a": {"b": [1, 2]}, "c~d": 1}
+    patch = [
+        {"op": "test", "path": "/c~0d", "value": 1},
+        {"op": "add", "path": "/a/b/1", "value": 5},
+        {"op": "copy", "from": "/a/b", "path": "/e"},
+        {"op": "move", "from": "/c~0d", "path": "/f"},
+        {"op": "replace", "path": "/a/b/0", "value": 0},
+        {"op": "remove", "path": "/e/2"},
+    ]
+    assert apply_patch(document, patch) == {"a": {"b": [0, 5, 2]}, "e": [1, 5], "f": 1}
+    with pytest.raises(ValueError):
+        apply_patch(document, [{"op": "test", "path": "/f", "value": 2}])
+    with pytest.raises(ValueError):
+        apply_patch(document, [{"op": "frobnicate", "path": "/f"}])
+    with pytest.raises(IndexError):
+        apply_patch(document, [{"op": "remove", "path": "/e/2"}])
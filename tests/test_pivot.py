@@ -0,0 +1,142 @@
+import json
+
+import pytest
+
+from pydacharts.models import Data, LineData, LineDataSet, PieData, PieDataSet
+
+np = pytest.importorskip("numpy")
+
+from pydacharts.pivot import from_columns, from_rows, pivot  # noqa: E402
+
+ROWS = [
+    ("2024-01", "North", 10.5),
+    ("2024-01", "South", 3.0),
+    ("2024-02", "North", 12.0),
+    ("2024-03", "South", 4.0),
+    ("2024-03", "North", 1.0),
+    ("2024-03", "North", 2.0),
+]
+
+
+def _json(data):
+    return json.loads(data.model_dump_json(exclude_none=True))
+
+
+def test_from_rows():
+    data = from_rows(ROWS, data_class=LineData)
+    assert isinstance(data, LineData)
+    assert all(isinstance(ds, LineDataSet) for ds in data.datasets)
+    assert data.datasets[0].tension == 0.1
+    assert _json(from_rows(ROWS)) == {
+        "labels": ["2024-01", "2024-02", "2024-03"],
+        "datasets": [
+            {"label": "North", "data": [10.5, 12.0, 3.0]},
+            {"label": "South", "data": [3.0, None, 4.0]},
+        ],
+    }
+
+
+@pytest.mark.parametrize(
+    "aggregate, expected",
+    [
+        ("sum", 3.0),
+        ("mean", 1.5),
+        ("min", 1.0),
+        ("max", 2.0),
+        ("first", 1.0),
+        ("last", 2.0),
+    ],
+)
+def test_aggregates(aggregate, expected):
+    data = from_rows(ROWS, aggregate=aggregate)
+    assert data.datasets[0].data[2] == expected
+    assert np.isnan(data.datasets[1].data[1])
+
+
+def test_order():
+    data = from_rows(ROWS[::-1], sort=True)
+    assert data.labels == ["2024-01", "2024-02", "2024-03"]
+    assert [ds.label for ds in data.datasets] == ["North", "South"]
+
+    data = from_rows(ROWS, labels=["2024-03", "2024-01"], series_order=["South"])
+    assert _json(data) == {
+        "labels": ["2024-03", "2024-01"],
+        "datasets": [{"label": "South", "data": [4.0, 3.0]}],
+    }
+
+
+def test_from_columns_and_numpy():
+    columns = {
+        "month": np.array([202401, 202401, 202402, 202403]),
+        "region": np.array(["N", "S", "N", "S"]),
+        "sales": np.array([1, 2, 3, 4]),
+    }
+    data = from_columns(columns, category="month", series="region", value="sales")
+    assert _json(data) == {
+        "labels": ["202401", "202402", "202403"],
+        "datasets": [
+            {"label": "N", "data": [1.0, 3.0, None]},
+            {"label": "S", "data": [2.0, None, 4.0]},
+        ],
+    }
+
+
+def test_single_series_and_kwargs():
+    data = from_rows(
+        [("a", 1), ("b", 2), ("a", 3)],
+        data_class=PieData,
+        dataset_kwargs=dict(label="Total", backgroundColor=["red", "blue"]),
+    )
+    assert isinstance(data.datasets[0], PieDataSet)
+    assert _json(data)["datasets"] == [
+        {
+            "label": "Total",
+            "data": [4.0, 2.0],
+            "backgroundColor": ["red", "blue"],
+            "fill": False,
+        }
+    ]
+
+    data = from_rows(ROWS, series_kwargs={"South": dict(borderColor="green")})
+    assert data.datasets[0].borderColor is None
+    assert data.datasets[1].borderColor == "green"
+
+
+def test_sparse_integers():
+    categories = np.array([10**9, 5, 10**9, 7])
+    data = pivot(categories, None, [1, 2, 3, 4])
+    assert data.labels == ["1000000000", "5", "7"]
+    assert data.datasets[0].data.tolist() == [4.0, 2.0, 4.0]
+
+
+def test_empty_and_mismatched():
+    data = from_rows([])
+    assert _json(data) == {"labels": [], "datasets": []}
+    assert isinstance(pivot([], None, []), Data)
+    with pytest.raises(ValueError):
+        pivot(["a"], ["b", "c"], [1])
+    with pytest.raises(ValueError):
+        from_rows([(1, 2, 3, 4)])
+    with pytest.raises(ValueError):
+        from_rows(ROWS, aggregate="median")
+
+
+def test_matches_loop():
+    rng = np.random.default_rng(1)
+    categories = rng.integers(0, 40, 5000)
+    series = rng.integers(0, 7, 5000)
+    values = rng.random(5000)
+    data = pivot(categories, series, values, sort=True)
+
+    expected: dict = {}
+    for c, s, v in zip(
+        categories.tolist(), series.tolist(), values.tolist(), strict=True
+    ):
+        expected.setdefault(s, {}).setdefault(c, 0.0)
+        expected[s][c] += v
+    assert [ds.label for ds in data.datasets] == [str(s) for s in sorted(expected)]
+    for ds, s in zip(data.datasets, sorted(expected), strict=True):
+        for label, value in zip(data.labels, ds.data, strict=True):
+            assert value == pytest.approx(
+                expected[s].get(int(label), np.nan), nan_ok=True
+            )
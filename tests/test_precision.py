@@ -0,0 +1,157 @@
+import json
+
+import pytest
+
+from pydacharts.models import (
+    ChartType,
+    Config,
+    Data,
+    Dataset,
+    Options,
+    ScaleOptions,
+    Scales,
+)
+from pydacharts.precision import Precision
+from pydacharts.streaming import iter_json
+
+
+def _config(values, **dataset):
+    return Config(
+        type=ChartType.bar,
+        data=Data(
+            labels=[str(i) for i in range(len(values))],
+            datasets=[Dataset(label="values", data=values, **dataset)],
+        ),
+        options=Options(
+            aspectRatio=1.23456,
+            scales=Scales(y=ScaleOptions(min=-0.000123456, max=1596.973970000001)),
+        ),
+    )
+
+
+def test_precision_arguments():
+    with pytest.raises(ValueError):
+        Precision(significant=2, decimals=2)
+    with pytest.raises(ValueError):
+        Precision(significant=0)
+
+
+@pytest.mark.parametrize(
+    "precision, expected",
+    [
+        (Precision(significant=3), [1600, 2, None, 0.000123, 1230000, -0.5]),
+        (Precision(decimals=1), [1597, 2, None, 0, 1234567, -0.5]),
+        (
+            Precision(decimals=1, integers=False),
+            [1597.0, 2.0, None, 0.0, 1234567.0, -0.5],
+        ),
+    ],
+)
+def test_to_json(precision, expected):
+    values = [1596.973970000001, 2.0, None, 0.000123456, 1234567.0, -0.5]
+    assert (
+        json.loads(json.dumps(precision.to_json(values)).replace("NaN", "null"))
+        == expected
+    )
+
+
+def test_round_number():
+    precision = Precision(significant=4)
+    assert precision.round_number(1596.973970000001) == 1597
+    assert isinstance(precision.round_number(2.0), int)
+    assert precision.round_number(0.1 + 0.2) == 0.3
+    assert precision.round_number(7) == 7
+    assert precision.round_number("auto") == "auto"
+
+
+def test_config_context():
+    config = _config([1596.973970000001, 12.0, None, 0.1 + 0.2])
+    dumped = json.loads(
+        config.model_dump_json(
+            exclude_none=True, context=Precision(significant=4).context
+        )
+    )
+    assert dumped["data"]["datasets"][0]["data"] == [1597, 12, None, 0.3]
+    assert dumped["options"]["aspectRatio"] == 1.235
+    assert dumped["options"]["scales"]["y"]["min"] == -0.0001235
+    assert dumped["options"]["scales"]["y"]["max"] == 1597
+    # No context, no rounding
+    assert "1596.973970000001" in config.model_dump_json()
+
+
+def test_dataset_precision():
+    config = _config([1.23456, 2.5], precision=Precision(decimals=1))
+    context = Precision(significant=1).context
+    dumped = json.loads(config.model_dump_json(exclude_none=True, context=context))
+    assert dumped["data"]["datasets"][0]["data"] == [1.2, 2.5]
+    assert "precision" not in dumped["data"]["datasets"][0]
+    assert dumped["options"]["aspectRatio"] == 1
+    assert config.data.datasets[0].model_dump()["data"].tolist() == [1.2, 2.5]
+
+
+def test_numpy_data():
+    np = pytest.importorskip("numpy")
+    values = np.array([1596.973970000001, np.nan, 3.0, 2.25])
+    dumped = json.loads(
+        _config(values).model_dump_json(context=Precision(decimals=1).context)
+    )
+    assert dumped["data"]["datasets"][0]["data"] == [1597, None, 3, 2.2]
+    ints = np.arange(5)
+    dumped = json.loads(
+        _config(ints).model_dump_json(context=Precision(decimals=1).context)
+    )
+    assert dumped["data"]["datasets"][0]["data"] == [0, 1, 2, 3, 4]
+
+
+def test_points():
+    points = [{"x": 0.0, "y": 1596.973970000001}, {"x": 1.0, "y": None}]
+    precision = Precision(significant=3)
+    rounded = json.loads(json.dumps(precision.to_json(points)).replace("NaN", "null"))
+    assert rounded == [{"x": 0, "y": 1600}, {"x": 1, "y": None}]
+    # Points with other keys, one value at a time
+    mixed = [{"x": 0.5, "y": 1.23456}, {"x": 2.0, "y": 3.0, "r": 5}]
+    assert precision.to_json(mixed) == [{"x": 0.5, "y": 1.23}, {"x": 2, "y": 3, "r": 5}]
+    labels = [{"x": "a", "y": 1.23456}]
+    assert precision.to_json(labels) == [{"x": "a", "y": 1.23}]
+
+
+def test_large_data_points():
+    pytest.importorskip("numpy")
+    from pydacharts.large_data import large_data_mode
+
+    config = _config([i / 7 for i in range(100)]).model_copy(update={"type": "line"})
+    config = large_data_mode(config, threshold=1)
+    dumped = json.loads(
+        config.model_dump_json(
+            exclude_none=True, context=Precision(significant=3).context
+        )
+    )
+    assert dumped["data"]["datasets"][0]["data"][:2] == [
+        {"x": 0, "y": 0},
+        {"x": 1, "y": 0.143},
+    ]
+
+
+def test_streaming_matches():
+    config = _config(
+        [i / 7 for i in range(25_000)],
+    )
+    config.data.datasets = [
+        *config.data.datasets,
+        Dataset(data=[i / 3 for i in range(25_000)], precision=Precision(decimals=2)),
+    ]
+    context = Precision(significant=3).context
+    assert (
+        b"".join(iter_json(config, context=context))
+        == config.model_dump_json(exclude_none=True, context=context).encode()
+    )
+
+
+def test_payload_is_smaller():
+    values = [n / 1e6 for n in (3703888321, 1596973970, 1373918906, 1356078649)] * 250
+    config = _config(values)
+    full = config.model_dump_json(exclude_none=True)
+    rounded = config.model_dump_json(
+        exclude_none=True, context=Precision(significant=4).context
+    )
+    assert len(rounded) < len(full) * 0.7
@@ -0,0 +1,173 @@
+import json
+from collections import defaultdict
+
+import pytest
+
+from pydacharts.plugins.sankey import Sankey, SankeyData, SankeyDataSet
+
+np = pytest.importorskip("numpy")
+
+from pydacharts.pivot import factorize  # noqa: E402
+from pydacharts.plugins.sankey import from_edges, layout  # noqa: E402
+
+
+def _edges(dataset: SankeyDataSet) -> dict[tuple[str, str], float]:
+    return {(edge.from_, edge.to): edge.flow for edge in dataset.data}
+
+
+def test_from_edges_sums_duplicates():
+    dataset = from_edges(["a", "a", "b", "a"], ["b", "c", "c", "b"], [1, 2, 3, 4])
+    assert isinstance(dataset, SankeyDataSet)
+    assert _edges(dataset) == {("a", "b"): 5, ("a", "c"): 2, ("b", "c"): 3}
+    assert all(isinstance(edge.flow, int) for edge in dataset.data)
+    assert dataset.priority is None
+    chart = Sankey(data=SankeyData(datasets=[dataset]))
+    body = json.loads(chart.model_dump_json(exclude_none=True))
+    assert body["data"]["datasets"][0]["data"][0] == {"from": "a", "to": "b", "flow": 5}
+
+
+def test_from_edges_counts_rows():
+    dataset = from_edges(np.array(["a", "a", "b"]), np.array(["b", "b", "a"]))
+    assert _edges(dataset) == {("a", "b"): 2, ("b", "a"): 1}
+    assert all(isinstance(edge.flow, float) for edge in dataset.data)
+
+
+def test_from_edges_matches_a_dict():
+    rng = np.random.default_rng(1)
+    names = np.array([f"node {i}" for i in range(50)])
+    sources = names[rng.integers(0, 20, 5000)]
+    targets = names[rng.integers(20, 50, 5000)]
+    flows = rng.random(5000)
+    expected: dict[tuple[str, str], float] = defaultdict(float)
+    for source, target, flow in zip(sources, targets, flows, strict=True):
+        expected[str(source), str(target)] += flow
+    edges = _edges(from_edges(sources, targets, flows))
+    assert edges.keys() == expected.keys()
+    assert all(edges[key] == pytest.approx(expected[key]) for key in expected)
+
+
+def test_min_flow_and_top():
+    sources = ["a", "a", "a", "a", "b", "b"]
+    targets = ["w", "x", "y", "z", "w", "x"]
+    flows = [10, 8, 1, 2, 5, 6]
+    assert _edges(from_edges(sources, targets, flows, min_flow=3)) == {
+        ("a", "w"): 10,
+        ("a", "x"): 8,
+        ("a", "Other"): 3,
+        ("b", "w"): 5,
+        ("b", "x"): 6,
+    }
+    assert _edges(from_edges(sources, targets, flows, top=1, other="Rest")) == {
+        ("a", "w"): 10,
+        ("a", "Rest"): 11,
+        ("b", "x"): 6,
+        ("b", "Rest"): 5,
+    }
+    # Folding into a node already in the chart
+    edges = _edges(from_edges(sources + ["a"], targets + ["Other"], flows + [4], top=2))
+    assert edges == {
+        ("a", "w"): 10,
+        ("a", "x"): 8,
+        ("a", "Other"): 7,
+        ("b", "w"): 5,
+        ("b", "x"): 6,
+    }
+
+
+def test_labels_and_dataset_options():
+    dataset = from_edges(
+        ["a", "b"],
+        ["c", "c"],
+        [1, 9],
+        min_flow=2,
+        labels={"b": "Bee", "c": "Sea", "d": "Dee"},
+        colorMode="from",
+    )
+    assert dataset.labels == {"b": "Bee", "c": "Sea", "a": "a", "Other": "Other"}
+    assert dataset.colorMode == "from"
+
+
+def test_from_edges_empty():
+    assert from_edges([], []).data == []
+
+
+@pytest.mark.parametrize(
+    "args, kwargs",
+    [
+        ((["a"], ["b", "c"]), {}),
+        ((["a"], ["b"], [1, 2]), {}),
+        ((["a"], ["b"]), {"top": 0}),
+    ],
+)
+def test_from_edges_errors(args, kwargs):
+    with pytest.raises(ValueError):
+        from_edges(*args, **kwargs)
+
+
+def test_factorize_strings():
+    values = np.array(["b", "a", "", "b", "a longer value", "a"])
+    assert factorize(values)[0] == ["b", "a", "", "a longer value"]
+    assert factorize(values)[1].tolist() == [0, 1, 2, 0, 3, 1]
+    rng = np.random.default_rng(2)
+    values = np.array([f"item {i}" for i in range(1000)])[rng.integers(0, 1000, 10000)]
+    uniques, codes = factorize(values)
+    expected_uniques, expected_codes = factorize(values.tolist())
+    assert uniques == expected_uniques
+    assert codes.tolist() == expected_codes.tolist()
+
+
+def _dataset(edges) -> SankeyDataSet:
+    return SankeyDataSet.model_validate(
+        {
+            "data": [{"from": f, "to": t, "flow": w} for f, t, w in edges],
+            "labels": None,
+            "priority": None,
+        }
+    )
+
+
+def _crossings(edges, priority) -> int:
+    return sum(
+        (priority[a] - priority[c]) * (priority[b] - priority[d]) < 0
+        for i, (a, b, _) in enumerate(edges)
+        for c, d, _ in edges[i + 1 :]
+    )
+
+
+def test_layout_uncrosses():
+    edges = [("a", "y", 1), ("b", "x", 1), ("x", "q", 2), ("y", "p", 2)]
+    priority = layout(_dataset(edges)).priority
+    assert priority == {"a": 0, "b": 1, "y": 2, "x": 3, "p": 4, "q": 5}
+    assert _crossings(edges, priority) == 0
+
+
+def test_layout_reduces_crossings():
+    rng = np.random.default_rng(3)
+    edges = []
+    for layer in range(3):
+        for _ in range(60):
+            source, target = rng.integers(0, 12, 2)
+            edges.append((f"{layer}-{source}", f"{layer + 1}-{target}", 1))
+    # Every node of a layer appears in the same column
+    edges += [
+        (f"{layer}-{i}", f"{layer + 1}-{i}", 1) for layer in range(3) for i in range(12)
+    ]
+    before = _crossings(edges, layout(_dataset(edges), sweeps=0).priority)
+    after = _crossings(edges, layout(_dataset(edges)).priority)
+    assert after < before * 0.8
+
+
+def test_layout_cycles():
+    edges = [("a", "b", 5), ("b", "c", 5), ("c", "a", 1), ("c", "c", 1), ("c", "d", 4)]
+    priority = layout(_dataset(edges)).priority
+    # a -> b -> c -> d, with c -> a and c -> c left out of the layout
+    assert list(priority) == ["a", "b", "c", "d"]
+
+
+def test_layout_options():
+    dataset = _dataset([("a", "b", 1)])
+    assert layout(dataset).labels is None
+    assert dataset.priority is None
+    assert layout(_dataset([])).priority == {}
+    with pytest.raises(ValueError):
+        layout(dataset, sweeps=-1)
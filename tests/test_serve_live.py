@@ -0,0 +1,77 @@
+import json
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("fastapi")
+pytest.importorskip("jinja2")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from pydacharts.patch import apply_patch  # noqa: E402
+
+SERVE = Path(__file__).parent.parent / "serve"
+
+
+async def _no_ticks(feed):
+    pass
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # The app serves its static files and templates from the working directory
+    monkeypatch.chdir(SERVE)
+    from serve import app
+
+    monkeypatch.setattr(app, "feed", app.demo_feed())
+    # Points are published by the tests rather than by the demo ticker
+    monkeypatch.setattr(app, "tick", _no_ticks)
+    with TestClient(app.app) as client:
+        yield client, app.feed
+
+
+def _expected(feed):
+    return json.loads(feed.snapshot()[0])
+
+
+def test_live_page(client):
+    client, _ = client
+    assert "/static/live.js" in client.get("/live").text
+    assert client.get("/static/live.js").status_code == 200
+
+
+def test_live_updates(client):
+    client, feed = client
+    feed.publish("0", [1, 2])
+    with client.websocket_connect("/live/ws") as websocket:
+        message = websocket.receive_json()
+        assert message["type"] == "config"
+        document = message["config"]
+        assert document["data"]["labels"] == ["0"]
+
+        for i in range(1, 4):
+            client.portal.call(feed.publish, str(i), [i, -i])
+            message = websocket.receive_json()
+            assert message["type"] == "patch"
+            document = apply_patch(document, message["ops"])
+        assert document == _expected(feed)
+
+
+def test_slow_client_gets_merged_updates(client):
+    client, feed = client
+    with client.websocket_connect("/live/ws") as websocket:
+        document = websocket.receive_json()["config"]
+
+        def burst():
+            for i in range(500):
+                feed.publish(str(i), [i, i])
+
+        # Published in one go on the server's loop, so the connection only
+        # wakes up once they are all in
+        client.portal.call(burst)
+        message = websocket.receive_json()
+        assert len(message["ops"]) == 3
+        # The window is 120 points: 380 of them never had to be sent
+        assert len(message["ops"][0]["value"]) == 120
+        assert apply_patch(document, message["ops"]) == _expected(feed)
@@ -0,0 +1,82 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from pydacharts.models import Config, Data, Dataset  # noqa: E402
+from serve.offload import Offloader, points  # noqa: E402
+
+
+def _small():
+    return Config(type="bar", data=Data(labels=["a"], datasets=[Dataset(data=[1])]))
+
+
+def _large():
+    labels = [str(i) for i in range(100)]
+    return Config(
+        type="line", data=Data(labels=labels, datasets=[Dataset(data=range(100))])
+    )
+
+
+def test_points():
+    assert points(_large()) == 100
+    assert points(Config(type="bar")) == 0
+
+
+def test_offloaded_by_size():
+    offloader = Offloader(threshold=10, processes=False)
+
+    async def run():
+        for builder in (_small, _small, _large, _large):
+            await offloader.payload("chart", builder, exclude_none=True)
+
+    try:
+        asyncio.run(run())
+    finally:
+        offloader.shutdown()
+    # The first chart of each builder is offloaded, then only the large ones
+    assert (offloader.offloaded, offloader.inline) == (3, 1)
+
+
+def test_payload():
+    offloader = Offloader(threshold=10, processes=False)
+    try:
+        payload = asyncio.run(offloader.payload("chart", _large, exclude_none=True))
+    finally:
+        offloader.shutdown()
+    assert json.loads(payload.body) == json.loads(
+        _large().model_dump_json(exclude_none=True)
+    )
+
+
+def test_limit_per_endpoint():
+    offloader = Offloader(workers=3, limits={"large": 1, "chart": 2}, processes=False)
+    running = []
+    highest = {"large": 0, "chart": 0}
+
+    def builder(endpoint):
+        def build():
+            running.append(endpoint)
+            highest[endpoint] = max(highest[endpoint], running.count(endpoint))
+            # Long enough for the other requests to be waiting
+            asyncio.run(asyncio.sleep(0.05))
+            running.remove(endpoint)
+            return _small()
+
+        return build
+
+    async def run():
+        await asyncio.gather(
+            *(
+                offloader.payload(endpoint, builder(endpoint))
+                for endpoint in ("large", "large", "chart", "chart")
+            )
+        )
+
+    try:
+        asyncio.run(run())
+    finally:
+        offloader.shutdown()
+    assert highest == {"large": 1, "chart": 2}
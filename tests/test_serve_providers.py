@@ -0,0 +1,138 @@
+import asyncio
+
+import pytest
+
+from serve.providers import Providers
+
+
+def _counting(providers, delay=0.01):
+    calls = []
+
+    @providers.provider("chart")
+    async def chart(region="all"):
+        calls.append(region)
+        await asyncio.sleep(delay)
+        return {"region": region}
+
+    return calls
+
+
+def test_coalesced():
+    providers = Providers()
+    calls = _counting(providers)
+
+    async def run():
+        return await asyncio.gather(
+            *(providers.get("chart", region="emea") for _ in range(10)),
+            providers.get("chart", region="apac"),
+        )
+
+    results = asyncio.run(run())
+    assert calls == ["emea", "apac"]
+    assert results[0] is results[9]
+    assert results[10] == {"region": "apac"}
+    assert (providers.computed, providers.coalesced) == (2, 9)
+    assert providers.running() == 0
+
+
+def test_not_cached():
+    providers = Providers()
+    calls = _counting(providers)
+
+    async def run():
+        await providers.get("chart")
+        await providers.get("chart")
+
+    asyncio.run(run())
+    assert calls == ["all", "all"]
+
+
+def test_cancelled_waiter():
+    providers = Providers()
+    calls = _counting(providers, delay=0.05)
+
+    async def run():
+        gone = asyncio.create_task(providers.get("chart"))
+        staying = asyncio.create_task(providers.get("chart"))
+        await asyncio.sleep(0.01)
+        gone.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await gone
+        return await staying
+
+    assert asyncio.run(run()) == {"region": "all"}
+    assert calls == ["all"]
+
+
+def test_cancelled_with_last_waiter():
+    providers = Providers()
+    finished = []
+
+    @providers.provider("slow")
+    async def slow():
+        await asyncio.sleep(10)
+        finished.append(True)
+
+    async def run():
+        waiters = [asyncio.create_task(providers.get("slow")) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        assert providers.running() == 1
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        assert providers.running() == 0
+        # A new request starts a new computation
+        waiter = asyncio.create_task(providers.get("slow"))
+        await asyncio.sleep(0.01)
+        assert providers.running() == 1
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+
+    asyncio.run(run())
+    assert providers.computed == 2
+    assert not finished
+
+
+def test_timeout():
+    providers = Providers(timeout=10)
+
+    @providers.provider("slow", timeout=0.01)
+    async def slow():
+        await asyncio.sleep(1)
+
+    async def run():
+        return await asyncio.gather(
+            providers.get("slow"), providers.get("slow"), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, TimeoutError) for result in results)
+    assert providers.running() == 0
+
+
+def test_error():
+    providers = Providers()
+
+    @providers.provider("broken")
+    async def broken():
+        await asyncio.sleep(0.01)
+        raise ValueError("no data")
+
+    async def run():
+        return await asyncio.gather(
+            providers.get("broken"), providers.get("broken"), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert [str(result) for result in results] == ["no data", "no data"]
+    assert providers.running() == 0
+
+
+def test_registry():
+    providers = Providers()
+    _counting(providers)
+    assert "chart" in providers
+    with pytest.raises(ValueError):
+        _counting(providers)
+    with pytest.raises(KeyError):
+        asyncio.run(providers.get("missing"))
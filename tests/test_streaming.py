@@ -0,0 +1,103 @@
+import io
+
+import pytest
+
+from pydacharts.chart_utils import (
+    BarChartOptions,
+    DoughnutChartOptions,
+    PyramidChartOptions,
+)
+from pydacharts.models import (
+    ChartType,
+    Config,
+    Data,
+    Dataset,
+    LineData,
+    LineDataSet,
+    Options,
+)
+from pydacharts.plugins import sankey as s
+from pydacharts.streaming import iter_json, write_json
+
+
+def _configs():
+    labels = [f"label {i}" for i in range(250)]
+    yield Config()
+    yield Config(
+        type=ChartType.bar,
+        data=Data(
+            labels=labels,
+            datasets=[
+                Dataset(label="a", data=list(range(250)), backgroundColor="red"),
+                Dataset(label="b", data=[i / 7 for i in range(250)], stack="s"),
+            ],
+        ),
+        options=BarChartOptions(),
+    )
+    yield Config(
+        type=ChartType.line,
+        data=LineData(
+            labels=labels,
+            datasets=[LineDataSet(label="line", data=[None, *range(249)])],
+        ),
+        options=PyramidChartOptions(),
+    )
+    yield Config(type="doughnut", options=DoughnutChartOptions())
+    yield Config(data=Data(labels=[], datasets=[]), options=Options())
+
+
+@pytest.mark.parametrize("config", list(_configs()))
+@pytest.mark.parametrize("chunk_items", [1, 7, 10_000])
+def test_iter_json_matches_model_dump_json(config, chunk_items):
+    expected = config.model_dump_json(exclude_none=True).encode()
+    chunks = list(iter_json(config, chunk_items=chunk_items, chunk_bytes=16))
+    assert b"".join(chunks) == expected
+
+
+def test_iter_json_chunks():
+    config = Config(
+        data=Data(
+            labels=[str(i) for i in range(5000)],
+            datasets=[Dataset(data=list(range(5000)))],
+        )
+    )
+    chunks = list(iter_json(config, chunk_items=100, chunk_bytes=1024))
+    assert len(chunks) > 10
+    assert b"".join(chunks) == config.model_dump_json(exclude_none=True).encode()
+
+
+def test_iter_json_numpy():
+    np = pytest.importorskip("numpy")
+    config = Config(
+        data=Data(
+            labels=["a", "b", "c", "d"],
+            datasets=[Dataset(data=np.array([1.0, np.nan, 2.5, 3.0]))],
+        )
+    )
+    expected = config.model_dump_json(exclude_none=True).encode()
+    assert b"".join(iter_json(config, chunk_items=3)) == expected
+
+
+def test_iter_json_sankey_nested_models():
+    sankey = s.Sankey(
+        data=s.SankeyData(
+            datasets=[
+                s.SankeyDataSet(
+                    data=[s.SankeyDatasetData(from_="a", to="b", flow=10)],
+                    priority=None,
+                    labels={"a": "A"},
+                )
+            ]
+        )
+    )
+    expected = sankey.model_dump_json(exclude_none=True).encode()
+    assert b"".join(iter_json(sankey, chunk_items=1)) == expected
+    assert b'"from":"a"' in expected
+
+
+def test_write_json():
+    config = Config(data=Data(labels=["x"], datasets=[Dataset(data=[1])]))
+    fp = io.BytesIO()
+    written = write_json(config, fp)
+    assert fp.getvalue() == config.model_dump_json(exclude_none=True).encode()
+    assert written == len(fp.getvalue())
@@ -0,0 +1,168 @@
+import pytest
+from pydantic import ValidationError
+
+from pydacharts.chart_utils import PyramidChartOptions
+from pydacharts.chartjs_types import PaddingObject, PaddingXY
+from pydacharts.elements import BarsElements, Elements
+from pydacharts.models import (
+    CartesianTicks,
+    ChartType,
+    Config,
+    Data,
+    Dataset,
+    Layout,
+    LineData,
+    LineDataSet,
+    Options,
+    Plugins,
+    ScaleOptions,
+    Scales,
+    Ticks,
+    Title,
+)
+from pydacharts.plugins.datalabels import DataLabelsPlugin
+from pydacharts.plugins.sankey import Sankey, SankeyData, SankeyDataSet
+from pydacharts.trusted import construct, validation, validation_enabled
+
+
+def _build(build):
+    return build(
+        Config,
+        type=ChartType.bar,
+        data=build(
+            Data,
+            labels=["a", "b"],
+            datasets=[
+                build(Dataset, label="one", data=[1, 2], backgroundColor="red"),
+                build(LineDataSet, label="two", data=[3.5, None], type="line"),
+            ],
+        ),
+        options=build(
+            Options,
+            layout=build(Layout, padding=build(PaddingXY, x=4)),
+            elements=build(Elements, bars=build(BarsElements, borderRadius=5)),
+            plugins=build(
+                Plugins,
+                title=build(Title, text="Title"),
+                datalabels=[build(DataLabelsPlugin, align="end")],
+            ),
+            scales=build(
+                Scales,
+                y=build(ScaleOptions, ticks=build(CartesianTicks, mirror=True)),
+            ),
+        ),
+    )
+
+
+def _validated(cls, **values):
+    return cls(**values)
+
+
+def test_construct_matches_validated_output():
+    trusted = _build(construct)
+    validated = _build(_validated)
+    assert trusted.model_dump_json() == validated.model_dump_json()
+    assert trusted.model_dump_json(exclude_none=True) == validated.model_dump_json(
+        exclude_none=True
+    )
+
+
+def test_construct_applies_class_defaults():
+    dataset = construct(LineDataSet, data=[1, 2, 3])
+    assert dataset.tension == 0.1
+    assert dataset.showLine is True
+    assert dataset.fill is False
+    assert construct(PyramidChartOptions).model_dump_json() == (
+        PyramidChartOptions().model_dump_json()
+    )
+
+
+def test_construct_nested_dicts():
+    values = dict(
+        labels=["x"],
+        datasets=[dict(label="a", data=[1], tension=0.5)],
+    )
+    trusted = construct(LineData, **values)
+    assert isinstance(trusted.datasets[0], LineDataSet)
+    assert trusted.model_dump_json() == LineData(**values).model_dump_json()
+
+    scale = construct(ScaleOptions, ticks=dict(beginAtZero=True))
+    assert type(scale.ticks) is Ticks
+    scale = construct(ScaleOptions, ticks=dict(align="start"))
+    assert type(scale.ticks) is CartesianTicks
+    layout = construct(Layout, padding=dict(left=3))
+    assert isinstance(layout.padding, PaddingObject)
+
+
+@pytest.mark.parametrize("chart_type", [None, "line", ChartType.line, "bar"])
+def test_construct_data_for_chart_type(chart_type):
+    values = dict(
+        data=dict(labels=["x"], datasets=[dict(label="a", data=[1], tension=0.5)])
+    )
+    if chart_type is not None:
+        values["type"] = chart_type
+    trusted = construct(Config, **values)
+    validated = Config(**values)
+    assert type(trusted.data) is type(validated.data)
+    assert trusted.model_dump_json() == validated.model_dump_json()
+    assert trusted.model_dump_json(exclude_none=True) == validated.model_dump_json(
+        exclude_none=True
+    )
+
+
+def test_construct_dataset_types():
+    values = dict(
+        type="bar",
+        data=dict(
+            labels=["x"],
+            datasets=[dict(data=[1], type="line"), dict(data=[2], tension=0.5)],
+        ),
+    )
+    trusted = construct(Config, **values)
+    assert [type(dataset) for dataset in trusted.data.datasets] == [
+        LineDataSet,
+        Dataset,
+    ]
+    assert trusted.model_dump_json() == Config(**values).model_dump_json()
+
+
+def test_construct_sankey():
+    values = dict(
+        data=dict(
+            datasets=[
+                dict(
+                    data=[dict(from_="a", to="b", flow=1)],
+                    labels=None,
+                    priority=None,
+                )
+            ]
+        )
+    )
+    trusted = construct(Sankey, **values)
+    assert isinstance(trusted.data, SankeyData)
+    assert isinstance(trusted.data.datasets[0], SankeyDataSet)
+    assert trusted.model_dump_json() == Sankey(**values).model_dump_json()
+
+
+def test_construct_validation_aliases():
+    edges = [{"from": "a", "to": "b", "flow": 1}, {"from_": "b", "to": "c", "flow": 2}]
+    trusted = construct(SankeyDataSet, data=edges, labels=None, priority=None)
+    assert [edge.from_ for edge in trusted.data] == ["a", "b"]
+    validated = SankeyDataSet(data=edges, labels=None, priority=None)
+    assert trusted.model_dump_json() == validated.model_dump_json()
+
+
+def test_construct_does_not_validate():
+    assert construct(Dataset, data="not a list").data == "not a list"
+
+
+def test_validation_switch():
+    assert not validation_enabled()
+    with validation():
+        assert validation_enabled()
+        with pytest.raises(ValidationError):
+            construct(Dataset, data="not a list")
+        assert (
+            _build(construct).model_dump_json() == _build(_validated).model_dump_json()
+        )
+    assert not validation_enabled()
@@ -0,0 +1,207 @@
+import json
+import mmap
+
+import pytest
+from pydantic import ValidationError
+
+from pydacharts.chartjs_types import PaddingObject, PaddingXY
+from pydacharts.models import (
+    CartesianTicks,
+    ChartType,
+    Config,
+    Data,
+    Dataset,
+    Layout,
+    LineData,
+    LineDataSet,
+    PieData,
+    Plugins,
+    ScaleOptions,
+    Ticks,
+)
+from pydacharts.plugins.datalabels import DataLabelsPlugin
+from pydacharts.plugins.sankey import (
+    Sankey,
+    SankeyData,
+    SankeyDataSet,
+    SankeyDatasetData,
+)
+
+
+@pytest.mark.parametrize(
+    "padding, expected",
+    [
+        (4, int),
+        ({"x": 1, "y": 2}, PaddingXY),
+        ({"y": 2}, PaddingXY),
+        ({"top": 1, "bottom": 2}, PaddingObject),
+        ({"x": 1, "top": 2}, PaddingObject),
+        ({}, PaddingObject),
+    ],
+)
+def test_padding(padding, expected):
+    layout = Layout.model_validate({"padding": padding})
+    assert type(layout.padding) is expected
+    assert Layout.model_validate_json(layout.model_dump_json()) == layout
+
+
+def test_subclass_instances():
+    class MyPad(PaddingObject):
+        pass
+
+    class MyXY(PaddingXY):
+        pass
+
+    class MyTicks(CartesianTicks):
+        pass
+
+    class MyPlainTicks(Ticks):
+        pass
+
+    assert type(Layout(padding=MyPad(left=1)).padding) is MyPad
+    assert type(Layout(padding=MyXY(x=1)).padding) is MyXY
+    scale = ScaleOptions(ticks=MyTicks(autoSkip=False))
+    assert type(scale.ticks) is MyTicks
+    assert type(ScaleOptions(ticks=MyPlainTicks()).ticks) is MyPlainTicks
+
+
+def test_ticks():
+    assert type(ScaleOptions(ticks={"stepSize": 5}).ticks) is Ticks
+    scale = ScaleOptions.model_validate_json(
+        '{"ticks": {"stepSize": 5, "autoSkip": false}}'
+    )
+    assert type(scale.ticks) is CartesianTicks
+    assert scale.ticks.autoSkip is False
+    assert '"autoSkip":false' in scale.model_dump_json(exclude_none=True)
+    assert type(ScaleOptions(ticks=CartesianTicks()).ticks) is CartesianTicks
+
+
+def test_datalabels():
+    plugins = Plugins.model_validate_json(
+        '{"datalabels": [{"anchor": "end"}, {"anchor": "start"}]}'
+    )
+    assert [label.anchor for label in plugins.datalabels] == ["end", "start"]
+    plugins = Plugins.model_validate_json('{"datalabels": {"offset": 8}}')
+    assert isinstance(plugins.datalabels, DataLabelsPlugin)
+    with pytest.raises(ValidationError):
+        Plugins.model_validate({"datalabels": 3})
+
+
+def test_chart_type():
+    assert Config(type="line").type == "line"
+    assert type(Config(type="line").type) is str
+    assert Config(type=ChartType.bar).type is ChartType.bar
+    assert Config(type="funnel").type == "funnel"
+
+
+@pytest.mark.parametrize(
+    "chart_type, data_class, dataset_class",
+    [
+        ("line", LineData, LineDataSet),
+        (ChartType.line, LineData, LineDataSet),
+        ("doughnut", PieData, Dataset),
+        ("bar", Data, Dataset),
+    ],
+)
+def test_data_for_chart_type(chart_type, data_class, dataset_class):
+    raw = {"labels": ["a"], "datasets": [{"data": [1], "tension": 0.4}]}
+    config = Config.model_validate({"type": chart_type, "data": raw})
+    assert type(config.data) is data_class
+    assert isinstance(config.data.datasets[0], dataset_class)
+    if data_class is LineData:
+        assert config.data.datasets[0].tension == 0.4
+
+
+def test_data_models_are_kept():
+    data = Data(labels=["a"], datasets=[Dataset(data=[1])])
+    assert type(Config(type="line", data=data).data) is Data
+    with pytest.raises(ValidationError) as e:
+        Config.model_validate({"type": "line", "data": {"labels": ["a"]}})
+    assert e.value.errors()[0]["loc"] == ("data", "datasets")
+    # Subclasses declaring other data aren't dispatched
+    sankey = Sankey.model_validate({"type": "line", "data": {"datasets": []}})
+    assert type(sankey.data) is SankeyData
+
+
+def _sankey():
+    return Sankey(
+        data=SankeyData(
+            datasets=[
+                SankeyDataSet(
+                    data=[SankeyDatasetData(from_="a", to="b", flow=2)],
+                    labels={"a": "Start", "b": "End"},
+                    priority=None,
+                )
+            ]
+        )
+    )
+
+
+def test_load_json_most_specific_model():
+    sankey = _sankey()
+    loaded = Config.load_json(sankey.model_dump_json())
+    assert type(loaded) is Sankey
+    assert loaded == sankey
+    assert Sankey.load_json(sankey.model_dump_json()) == sankey
+    # Without the None fields
+    assert Config.load_json(sankey.model_dump_json(exclude_none=True)) == sankey
+    # "from" and "from_" are both read
+    assert (
+        SankeyDatasetData.model_validate({"from_": "a", "to": "b", "flow": 1}).from_
+        == "a"
+    )
+
+    line = Config(
+        type="line",
+        data=LineData(labels=["a"], datasets=[LineDataSet(data=[1], tension=0.4)]),
+    )
+    body = line.model_dump_json(exclude_none=True)
+    assert '"tension":0.4' in body
+    loaded = Config.load_json(body)
+    assert type(loaded) is Config
+    assert loaded.data.datasets[0].tension == 0.4
+    assert loaded.model_dump_json(exclude_none=True) == body
+
+
+def test_load_json_buffers(tmp_path):
+    body = _sankey().model_dump_json().encode()
+    path = tmp_path / "chart.json"
+    path.write_bytes(body)
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        assert type(Config.load_json(m)) is Sankey
+    assert type(Config.load_json(bytearray(body))) is Sankey
+    assert type(Config.load_json(memoryview(body))) is Sankey
+    with pytest.raises(ValidationError):
+        Config.load_json(b'{"type": "sankey", "data": {}}')
+
+
+def test_sankey_from_alias():
+    sankey = _sankey()
+    sankey.data.datasets[0].labels = {"a": 'Text with "from_": in it'}
+    body = sankey.model_dump_json()
+    assert '"data":[{"from":"a","to":"b","flow":2}]' in body
+    assert json.loads(body)["data"]["datasets"][0]["labels"]["a"] == (
+        'Text with "from_": in it'
+    )
+    assert sankey.model_dump()["data"]["datasets"][0]["data"] == [
+        {"from": "a", "to": "b", "flow": 2}
+    ]
+    assert SankeyDatasetData(from_="a", to="b", flow=1).model_dump(exclude={"to"}) == {
+        "from": "a",
+        "flow": 1,
+    }
+    assert Config.load_json(body) == sankey
+
+
+def test_sankey_response_model():
+    fastapi = pytest.importorskip("fastapi")
+    from fastapi.testclient import TestClient
+
+    app = fastapi.FastAPI()
+
+    @app.get("/chart", response_model=Sankey, response_model_exclude_none=True)
+    def chart():
+        return _sankey()
+
+    body = TestClient(app).get("/chart").json()
+    assert body["data"]["datasets"][0]["data"] == [{"from": "a", "to": "b", "flow": 2}]